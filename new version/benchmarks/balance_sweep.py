@@ -0,0 +1,100 @@
+# benchmarks/balance_sweep.py
+"""Varredura de balanceamento: muitas partidas headless em paralelo, uma por semente e combinação.
+
+Para cada combinação dos valores pedidos (trincheiras, espaçamento, cooldown
+dos inimigos, cooldown e fases do chefe) e cada semente, um bot joga a fase
+de trincheiras e a arena do chefe. As partidas rodam num multiprocessing.Pool
+com um processo por núcleo; a tabela final mostra a média por combinação de
+tempo de sobrevivência, dano sofrido e custo dos passos.
+
+Uso (a partir da pasta 'new version'):
+    python benchmarks/balance_sweep.py --seeds 16 --enemy-shot-cooldown 1500,2000,2500
+    python benchmarks/balance_sweep.py --boss-attack-cooldown 900,1200 --boss-phase2 0.5,0.6 --csv sweep.csv
+
+Listas são separadas por vírgula; parâmetros omitidos usam o valor atual do jogo.
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.balance import DEFAULT_PARAMS, sweep, summarize
+
+
+def _values(text, cast):
+    return [cast(value) for value in text.split(',') if value.strip()]
+
+
+def build_configs(args):
+    grids = {
+        'num_trenches': _values(args.num_trenches, int),
+        'trench_spacing': _values(args.trench_spacing, int),
+        'enemy_shot_cooldown': _values(args.enemy_shot_cooldown, int),
+        'boss_attack_cooldown': _values(args.boss_attack_cooldown, int),
+        'boss_phase2': _values(args.boss_phase2, float),
+        'boss_phase3': _values(args.boss_phase3, float),
+    }
+    levels = {'trincheiras': [False], 'chefe': [True], 'ambos': [False, True]}[args.level]
+    configs = []
+    names = list(grids)
+    for combination in itertools.product(*(grids[name] for name in names)):
+        for boss_fight in levels:
+            for seed in range(args.first_seed, args.first_seed + args.seeds):
+                config = dict(zip(names, combination))
+                config.update({'seed': seed, 'boss_fight': boss_fight, 'ticks': args.ticks})
+                configs.append(config)
+    return configs
+
+
+def print_table(rows):
+    print(f"{'nível':<12} {'trinch':>6} {'espaço':>6} {'cd inim':>7} {'cd chefe':>8} {'fases':>9} "
+          f"{'partidas':>8} {'mortes':>6} {'sobrev s':>8} {'dano':>6} {'médio ms':>8} {'p99 ms':>7}")
+    for row in rows:
+        level = 'chefe' if row['boss_fight'] else 'trincheiras'
+        phases = f"{row['boss_phase2']:.2f}/{row['boss_phase3']:.2f}"
+        print(f"{level:<12} {row['num_trenches']:>6} {row['trench_spacing']:>6} {row['enemy_shot_cooldown']:>7} "
+              f"{row['boss_attack_cooldown']:>8} {phases:>9} {row['runs']:>8} {row['deaths']:>6} "
+              f"{row['survival_s']:>8.1f} {row['damage_taken']:>6.1f} {row['mean_tick_ms']:>8.3f} "
+              f"{row['p99_tick_ms']:>7.3f}")
+
+
+def write_csv(path, results):
+    """Salva uma linha por partida (sem agregação), para análise externa."""
+    columns = list(results[0])
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for result in sorted(results, key=lambda r: [str(r[c]) for c in columns]):
+            writer.writerow(result)
+    print(f"Resultados por partida salvos em: {path}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Varredura de balanceamento com partidas headless em paralelo.")
+    parser.add_argument('--seeds', type=int, default=8, help="partidas por combinação")
+    parser.add_argument('--first-seed', type=int, default=1)
+    parser.add_argument('--ticks', type=int, default=20000, help="limite de passos (120 por segundo)")
+    parser.add_argument('--level', choices=['trincheiras', 'chefe', 'ambos'], default='ambos')
+    parser.add_argument('--processes', type=int, default=None, help="padrão: todos os núcleos")
+    for name, default in DEFAULT_PARAMS.items():
+        parser.add_argument('--' + name.replace('_', '-'), default=str(default))
+    parser.add_argument('--csv', default=None, help="arquivo para salvar o resultado de cada partida")
+    args = parser.parse_args()
+
+    configs = build_configs(args)
+    processes = args.processes or os.cpu_count()
+    print(f"{len(configs)} partidas em {processes} processos...")
+    start = time.perf_counter()
+    results = sweep(configs, processes)
+    elapsed = time.perf_counter() - start
+    print(f"Concluído em {elapsed:.1f} s ({len(configs) / elapsed:.1f} partidas/s)")
+    print()
+    print_table(summarize(results))
+    if args.csv:
+        write_csv(args.csv, results)
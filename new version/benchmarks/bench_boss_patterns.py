@@ -0,0 +1,129 @@
+# benchmarks/bench_boss_patterns.py
+"""Mede a emissão de lasers de cada padrão de ataque do chefe.
+
+Roda cada padrão de game_states/boss_patterns.py do início ao fim com o
+PatternScheduler, em várias taxas de passo da simulação, e mostra:
+- lasers por segundo simulado (devem ser iguais em todas as taxas: os tiros
+  seguem a linha do tempo, não o número de passos);
+- quantos lasers o disparo antigo por módulo (`tempo % intervalo == 0`)
+  soltaria na mesma taxa, para os padrões que já existiam;
+- o custo de CPU da emissão por segundo simulado.
+
+Antes, confere que nenhum laser das paredes com vão sai a menos de gap/2 do
+centro do jogador.
+
+Uso (a partir da pasta 'new version'):
+    python benchmarks/bench_boss_patterns.py
+"""
+import os
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_states.boss import Boss
+from game_states.boss_patterns import BOSS_PATTERNS, due_shots
+from utils.headless import init_headless, ManualClock
+from utils.pools import ProjectilePool
+
+ARENA_SIZE = (1280, 720)
+PLAYER_POS = (640, 600)
+PLAYER_SIZE = (100, 150)
+RATES = [60, 120, 144]  # Passos por segundo
+REPEATS = 20
+
+# Disparo antigo: (intervalo em ms, lasers por disparo) dos padrões que atiravam
+LEGACY_PATTERNS = {
+    'projectile_spray': (150, 1),
+    'bullet_hell': (120, 12),
+    'cross_beam': (500, 4),
+}
+
+
+def run_pattern(name, rate):
+    """Executa o padrão uma vez; retorna (lasers emitidos, segundos simulados, ms de CPU)."""
+    clock = ManualClock()
+    pool = ProjectilePool()
+    boss = Boss(400, 100, clock=clock, projectiles=pool, arena_size=ARENA_SIZE)
+    scheduler = boss.pattern_scheduler
+    duration = scheduler.start(name, clock.get_ticks())
+    elapsed = 0.0
+    while clock.get_ticks() <= duration:
+        clock.advance(1000 / rate)
+        start = time.perf_counter()
+        scheduler.update(clock.get_ticks(), PLAYER_POS, 0)
+        elapsed += time.perf_counter() - start
+        boss.is_dashing = False  # O chefe não se move aqui; cada investida pode começar
+        pool.clear()
+    return scheduler.emitted, duration / 1000, elapsed * 1000
+
+
+def check_wall_gaps(rate=120):
+    """Confere o vão das paredes: cada disparo vencido sai, e longe do centro do jogador."""
+    for name, pattern in BOSS_PATTERNS.items():
+        for emitter in pattern['emitters']:
+            if emitter['type'] != 'wall' or not emitter['gap']:
+                continue
+            for player_x in range(0, ARENA_SIZE[0], 97):
+                player_pos = (player_x, PLAYER_POS[1])
+                center_x = player_x + PLAYER_SIZE[0] / 2
+                clock = ManualClock()
+                pool = ProjectilePool()
+                boss = Boss(400, 100, clock=clock, projectiles=pool, arena_size=ARENA_SIZE)
+                scheduler = boss.pattern_scheduler
+                duration = scheduler.start(name, 0)
+                last = -1
+                walls = 0
+                while clock.get_ticks() < duration:
+                    clock.advance(1000 / rate)
+                    now = min(clock.get_ticks(), duration)
+                    walls += len(due_shots(emitter, last, now))
+                    last = now
+                    first = len(pool)
+                    scheduler.update(clock.get_ticks(), player_pos, 0, PLAYER_SIZE)
+                    # Na parede de cima os lasers só descem: o x não muda com o avanço dos atrasados
+                    xs = pool.positions[first:len(pool), 0]
+                    assert (abs(xs - center_x) > emitter['gap'] / 2).all(), \
+                        f"'{name}': laser dentro do vão do jogador em x={center_x}"
+                expected = len(due_shots(emitter, -1, duration))
+                assert walls == expected, f"'{name}': {walls} paredes, esperadas {expected}"
+    print("vãos das paredes OK (nenhum laser a menos de gap/2 do centro do jogador)")
+
+
+def legacy_count(name, rate):
+    """Lasers que o disparo por módulo soltaria (só passos que caem num múltiplo exato do intervalo)."""
+    if name not in LEGACY_PATTERNS:
+        return None
+    interval, per_shot = LEGACY_PATTERNS[name]
+    duration = BOSS_PATTERNS[name]['duration']
+    shots = 0
+    step = 1
+    while True:
+        # O antigo começava a contar no passo seguinte ao início do padrão
+        time_in_pattern = int(step * 1000 / rate)
+        if time_in_pattern > duration:
+            return shots * per_shot
+        if time_in_pattern % interval == 0:
+            shots += 1
+        step += 1
+
+
+if __name__ == '__main__':
+    init_headless()
+    check_wall_gaps()
+
+    print("Padrões do chefe: lasers por segundo simulado (linha do tempo / antigo por módulo)")
+    header = f"{'padrão':<18}" + ''.join(f"{str(rate) + ' Hz':>16}" for rate in RATES) + f"{'CPU (ms/s)':>12}"
+    print(header)
+    for name in BOSS_PATTERNS:
+        columns = []
+        cpu_ms = []
+        for rate in RATES:
+            emitted, seconds, _ = run_pattern(name, rate)
+            cpu_ms.append(min(run_pattern(name, rate)[2] for _ in range(REPEATS)) / seconds)
+            legacy = legacy_count(name, rate)
+            legacy_text = '-' if legacy is None else f"{legacy / seconds:.1f}"
+            columns.append(f"{emitted / seconds:.1f} / {legacy_text}")
+        print(f"{name:<18}" + ''.join(f"{column:>16}" for column in columns) + f"{max(cpu_ms):>12.3f}")
@@ -0,0 +1,100 @@
+# benchmarks/bench_collision.py
+"""Mede o custo das colisões à medida que o número de entidades cresce.
+
+Duas partes:
+- comparação direta entre o teste ingênuo (todos os projéteis contra todos os
+  inimigos) e a grade espacial (utils/spatial_hash.py);
+- tempo médio de GameplayState.update com mais trincheiras e mais projéteis.
+
+Uso (a partir da pasta 'new version'):
+    python benchmarks/bench_collision.py
+"""
+import os
+import sys
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pygame
+from utils.spatial_hash import SpatialHashGrid
+
+SCREEN_SIZE = (1280, 720)
+FRAMES = 120
+
+
+def _random_rects(count, world_width, size, rng):
+    return [pygame.Rect(rng.uniform(0, world_width), rng.uniform(0, SCREEN_SIZE[1]), size, size) for _ in range(count)]
+
+
+def bench_broadphase():
+    print("Broadphase: projéteis x inimigos (ms por frame)")
+    print(f"{'inimigos':>9} {'projéteis':>10} {'ingênuo':>10} {'grade':>10}")
+    rng = random.Random(1)
+    for enemies_count, bullets_count in [(20, 20), (100, 100), (400, 300), (1600, 1000)]:
+        world_width = enemies_count * 100
+        enemies = _random_rects(enemies_count, world_width, 100, rng)
+        bullets = _random_rects(bullets_count, world_width, 8, rng)
+
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            for bullet in bullets:
+                for enemy in enemies:
+                    if enemy.colliderect(bullet):
+                        break
+        naive_ms = (time.perf_counter() - start) * 1000 / FRAMES
+
+        grid = SpatialHashGrid(256)
+        for enemy in enemies:
+            grid.insert(enemy, enemy)
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            for bullet in bullets:
+                for enemy in grid.query(bullet):
+                    if enemy.colliderect(bullet):
+                        break
+        grid_ms = (time.perf_counter() - start) * 1000 / FRAMES
+
+        print(f"{enemies_count:>9} {bullets_count:>10} {naive_ms:>10.3f} {grid_ms:>10.3f}")
+
+
+def bench_gameplay_update():
+    from utils.game_manager import GameManager
+    from game_states.gameplay_state import GameplayState
+
+    print()
+    print("GameplayState.update (ms por frame)")
+    print(f"{'trincheiras':>11} {'inimigos':>9} {'projéteis':>10} {'update':>10}")
+    game_manager = GameManager()
+    for num_trenches, bullets_count in [(2, 10), (10, 50), (40, 200), (160, 800)]:
+        state = GameplayState(game_manager, *SCREEN_SIZE)
+        state.num_trenches = num_trenches
+        state.reset_player()
+        rng = random.Random(2)
+
+        total = 0.0
+        for _ in range(FRAMES):
+            # Mantém a quantidade de projéteis constante ao longo da medição
+            while len(state.bullets) < bullets_count:
+                state.bullets.spawn(state.camera_x + rng.uniform(0, SCREEN_SIZE[0]), rng.uniform(0, SCREEN_SIZE[1]),
+                                    rng.choice([-1, 1]), 0, state.bullet_speed,
+                                    kind='player_bullet', hitbox=state.bullet_size * 2)
+            start = time.perf_counter()
+            state.update(1.0 / GameplayState.REFERENCE_FPS)
+            total += time.perf_counter() - start
+            state.is_game_over = False
+
+        print(f"{num_trenches:>11} {len(state.enemies):>9} {bullets_count:>10} {total * 1000 / FRAMES:>10.3f}")
+
+
+if __name__ == '__main__':
+    pygame.init()
+    pygame.display.set_mode(SCREEN_SIZE)
+    bench_broadphase()
+    bench_gameplay_update()
+    pygame.quit()
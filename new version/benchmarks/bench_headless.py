@@ -0,0 +1,90 @@
+# benchmarks/bench_headless.py
+"""Roda a fase de trincheiras e a luta contra o chefe em modo headless.
+
+Mostra quantos passos de simulação por segundo a CPU aguenta e o custo médio
+e p99 de cada passo; útil como teste de carga e para comparar custo entre
+versões no CI. Antes, confere que o dano de um projétil no chefe não depende
+da taxa de passos da simulação e que a munição da arena basta para matá-lo.
+
+Uso (a partir da pasta 'new version'):
+    python benchmarks/bench_headless.py [passos]
+"""
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.headless import init_headless, ScriptedInput, run_headless
+
+init_headless()
+
+import pygame
+from utils.game_manager import GameManager
+from game_states.gameplay_state import GameplayState
+
+SCREEN_SIZE = (1280, 720)
+
+
+def run_level(is_boss_fight, ticks):
+    keys = ScriptedInput()
+    state = GameplayState(GameManager(), *SCREEN_SIZE, is_boss_fight=is_boss_fight,
+                          input_source=keys, seed=1)
+    state.reset_player()
+    # Anda para a direita atirando o tempo todo
+    keys.press(pygame.K_RIGHT, pygame.K_x)
+    state.current_ammo = 10 ** 6
+
+    def stop_when_over(state, tick):
+        return state.is_game_over or state.loading_screen_active or state.game_won
+
+    return run_headless(state, ticks, on_tick=stop_when_over)
+
+
+def boss_damage_per_bullet(rate):
+    """Dano que um único projétil do jogador causa ao atravessar o chefe a `rate` passos por segundo."""
+    state = GameplayState(GameManager(), *SCREEN_SIZE, is_boss_fight=True, seed=1)
+    state.reset_player()
+    boss = state.boss
+    health = boss.health
+    start_x = boss.pos[0] - 100
+    state.bullets.spawn(start_x, boss.pos[1] + boss.size[1] / 2, 1, 0, state.bullet_speed, kind='player_bullet')
+    step = 90 / rate
+    while len(state.bullets) and state.bullets.positions[0, 0] < boss.pos[0] + boss.size[0] + 100:
+        state._update_player_bullets(step)
+    return health - boss.health
+
+
+def check_boss_damage(rates=(60, 90, 120, 240)):
+    damages = {rate: boss_damage_per_bullet(rate) for rate in rates}
+    assert len(set(damages.values())) == 1, f"Dano por projétil depende da taxa de passos: {damages}"
+    print(f"dano por projétil no chefe OK ({damages[rates[0]]} em {', '.join(map(str, rates))} Hz)")
+
+
+def check_full_clip_kills_boss():
+    """Atira toda a munição da arena no chefe (parado) e confere que ele morre."""
+    state = GameplayState(GameManager(), *SCREEN_SIZE, is_boss_fight=True, seed=1)
+    state.reset_player()
+    boss = state.boss
+    shots = 0
+    while shots < state.max_ammo and boss.health > 0:
+        state.bullets.spawn(boss.pos[0] - 20, boss.pos[1] + boss.size[1] / 2, 1, 0, state.bullet_speed,
+                            kind='player_bullet')
+        shots += 1
+        while len(state.bullets) and boss.health > 0:
+            state._update_player_bullets(90 / 120)
+    assert boss.health <= 0, f"{state.max_ammo} tiros deixaram o chefe com {boss.health} de vida"
+    print(f"munição da arena mata o chefe OK ({shots} de {state.max_ammo} tiros)")
+
+
+if __name__ == '__main__':
+    check_boss_damage()
+    check_full_clip_kills_boss()
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(f"{'nível':<12} {'passos':>7} {'passos/s':>10} {'médio ms':>9} {'p99 ms':>8}")
+    for name, is_boss_fight in [('trincheiras', False), ('chefe', True)]:
+        stats = run_level(is_boss_fight, ticks)
+        print(f"{name:<12} {stats['ticks']:>7} {stats['ticks_per_second']:>10.0f} "
+              f"{stats['mean_tick_ms']:>9.3f} {stats['p99_tick_ms']:>8.3f}")
+    pygame.quit()
@@ -0,0 +1,83 @@
+# benchmarks/bench_projectiles.py
+"""Mede o custo de mover, descartar e testar colisão de muitos projéteis.
+
+Compara o laço escalar antigo (um objeto por projétil, Rect por passo) com o
+ProjectilePool vetorizado de utils/pools.py, em densidades crescentes de
+lasers, como num 'bullet_hell' cada vez mais denso.
+
+Uso (a partir da pasta 'new version'):
+    python benchmarks/bench_projectiles.py
+"""
+import os
+import sys
+import math
+import random
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import numpy as np
+import pygame
+from utils.pools import ProjectilePool
+
+SCREEN_SIZE = (1280, 720)
+STEPS = 200
+STEP = 90 / 120  # Passo de 120 Hz em frames de referência
+PLAYER_RECT = pygame.Rect(600, 500, 100, 150)
+
+
+def _ring(rng, count):
+    """Ângulos e origens aleatórios para `count` lasers."""
+    return [(rng.uniform(0, SCREEN_SIZE[0]), rng.uniform(0, SCREEN_SIZE[1]), rng.uniform(0, 2 * math.pi))
+            for _ in range(count)]
+
+
+def bench_scalar(shots):
+    bullets = [{'pos': [x, y], 'direction': [math.cos(a), math.sin(a)]} for x, y, a in shots]
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        for bullet in bullets[:]:
+            bullet['pos'][0] += 18 * bullet['direction'][0] * STEP
+            bullet['pos'][1] += 18 * bullet['direction'][1] * STEP
+            bullet_rect = pygame.Rect(bullet['pos'][0] - 5, bullet['pos'][1] - 5, 10, 10)
+            if not (-100 < bullet['pos'][0] < SCREEN_SIZE[0] + 100 and -100 < bullet['pos'][1] < SCREEN_SIZE[1] + 100):
+                bullets.remove(bullet)
+            elif bullet_rect.colliderect(PLAYER_RECT):
+                bullets.remove(bullet)
+        # Repõe os que saíram para manter a densidade
+        while len(bullets) < len(shots):
+            x, y, a = shots[len(bullets)]
+            bullets.append({'pos': [x, y], 'direction': [math.cos(a), math.sin(a)]})
+    return (time.perf_counter() - start) * 1000 / STEPS
+
+
+def bench_vectorized(shots):
+    pool = ProjectilePool()
+    xs = np.array([s[0] for s in shots])
+    ys = np.array([s[1] for s in shots])
+    angles = np.array([s[2] for s in shots])
+    pool.spawn_many(xs, ys, np.cos(angles), np.sin(angles), 18, kind='boss_laser')
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        pool.integrate(STEP)
+        removed = pool.outside(-100, -100, SCREEN_SIZE[0] + 100, SCREEN_SIZE[1] + 100)
+        removed |= pool.overlaps(PLAYER_RECT)
+        pool.remove(removed)
+        missing = len(shots) - len(pool)
+        if missing:
+            pool.spawn_many(xs[:missing], ys[:missing], np.cos(angles[:missing]), np.sin(angles[:missing]),
+                            18, kind='boss_laser')
+    return (time.perf_counter() - start) * 1000 / STEPS
+
+
+if __name__ == '__main__':
+    rng = random.Random(1)
+    print("Projéteis inimigos (ms por passo de simulação)")
+    print(f"{'lasers':>7} {'escalar':>9} {'vetorizado':>11} {'ganho':>7}")
+    for count in [10, 50, 200, 1000, 5000]:
+        shots = _ring(rng, count)
+        scalar_ms = bench_scalar(shots)
+        vector_ms = bench_vectorized(shots)
+        print(f"{count:>7} {scalar_ms:>9.3f} {vector_ms:>11.3f} {scalar_ms / vector_ms:>6.1f}x")
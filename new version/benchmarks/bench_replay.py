@@ -0,0 +1,100 @@
+# benchmarks/bench_replay.py
+"""Reproduz uma partida gravada e mede o custo de cada passo.
+
+Sem argumentos, grava uma partida de um bot com entrada pseudoaleatória,
+reproduz o replay e confere se o estado final é idêntico (determinismo).
+Com um arquivo .gxr (gravado com `python main.py --record replays`), reproduz
+a partida e lista os passos mais caros, para investigar picos de frame com a
+mesma entrada antes e depois de uma mudança.
+
+Uso (a partir da pasta 'new version'):
+    python benchmarks/bench_replay.py [replay.gxr]
+"""
+import os
+import random
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.headless import init_headless, DEFAULT_DT
+
+init_headless()
+
+import pygame
+from utils.game_manager import GameManager
+from utils.replay import InputRecorder, Replay, ReplayInput, simulation_fingerprint
+from game_states.gameplay_state import GameplayState
+
+SCREEN_SIZE = (1280, 720)
+BOT_TICKS = 6000
+
+
+def record_bot_session(is_boss_fight, seed):
+    """Joga com um bot de entrada aleatória (semeada) e devolve (replay, impressão digital)."""
+    from utils.headless import ScriptedInput
+
+    keys = ScriptedInput()
+    state = GameplayState(GameManager(), *SCREEN_SIZE, is_boss_fight=is_boss_fight,
+                          input_source=keys, seed=seed)
+    state.reset_player()
+    recorder = InputRecorder(state.run_seed, SCREEN_SIZE, is_boss_fight)
+    state.input_recorder = recorder
+
+    bot_rng = random.Random(seed)
+    for tick in range(BOT_TICKS):
+        if state.loading_screen_active or state.is_game_over:
+            break
+        if tick % 30 == 0:
+            keys.release_all()
+            keys.press(pygame.K_x, bot_rng.choice([pygame.K_RIGHT, pygame.K_RIGHT, pygame.K_LEFT]))
+            if bot_rng.random() < 0.3:
+                keys.press(pygame.K_UP)
+            if bot_rng.random() < 0.2:
+                state.request_jump()
+        state.update(DEFAULT_DT)
+
+    replay = Replay.from_bytes(recorder.to_bytes())
+    return replay, simulation_fingerprint(state)
+
+
+def profile_replay(replay):
+    """Reproduz o replay medindo cada passo; retorna (estado final, custos em ms)."""
+    replay_input = ReplayInput(replay)
+    state = GameplayState(GameManager(), *replay.screen_size, is_boss_fight=replay.is_boss_fight,
+                          input_source=replay_input, seed=replay.seed)
+    state.reset_player()
+    costs = []
+    while replay_input.advance(state):
+        start = time.perf_counter()
+        state.update(replay.dt)
+        costs.append((time.perf_counter() - start) * 1000)
+    return state, costs
+
+
+def print_costs(costs):
+    ordered = sorted(costs)
+    print(f"  passos: {len(costs)}  médio: {sum(costs) / len(costs):.3f} ms  "
+          f"p99: {ordered[int(len(ordered) * 0.99) - 1]:.3f} ms  máx: {ordered[-1]:.3f} ms")
+    worst = sorted(range(len(costs)), key=lambda i: costs[i], reverse=True)[:5]
+    print("  passos mais caros: " + ", ".join(f"#{i} ({costs[i]:.3f} ms)" for i in worst))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        replay = Replay.load(sys.argv[1])
+        state, costs = profile_replay(replay)
+        print(f"{sys.argv[1]} (semente {replay.seed})")
+        print_costs(costs)
+        print(f"  impressão digital final: {simulation_fingerprint(state)}")
+    else:
+        for name, is_boss_fight in [('trincheiras', False), ('chefe', True)]:
+            replay, expected = record_bot_session(is_boss_fight, seed=1234)
+            state, costs = profile_replay(replay)
+            result = simulation_fingerprint(state)
+            status = "OK" if result == expected else "DIVERGIU"
+            print(f"{name}: replay {status} ({len(replay)} passos, semente {replay.seed})")
+            print_costs(costs)
+    pygame.quit()
@@ -0,0 +1,66 @@
+# benchmarks/bench_sprites.py
+"""Mede o custo de desenhar muitos inimigos na tela.
+
+Compara o desenho antigo (pygame.transform.flip a cada frame, uma Surface nova
+por inimigo) com as variantes pré-espelhadas de utils/sprite_variants.py.
+
+Uso (a partir da pasta 'new version'):
+    python benchmarks/bench_sprites.py
+"""
+import os
+import sys
+import random
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pygame
+
+SCREEN_SIZE = (1280, 720)
+FRAMES = 300
+
+
+def draw_with_flip(enemies, screen):
+    """Desenho antigo de Enemy.draw: espelha a textura a cada chamada."""
+    for enemy in enemies:
+        image_to_draw = pygame.transform.flip(enemy.images[True], not enemy.facing_right, False)
+        screen.blit(image_to_draw, (int(enemy.pos[0]), int(enemy.pos[1])))
+
+
+def draw_with_variants(enemies, screen):
+    for enemy in enemies:
+        enemy.draw(screen, 0, 0)
+
+
+def bench(draw, enemies, screen):
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        # Metade dos inimigos troca de lado a cada frame, como quando o jogador passa por eles
+        for i, enemy in enumerate(enemies):
+            enemy.facing_right = (i + frame) % 2 == 0
+        draw(enemies, screen)
+    return (time.perf_counter() - start) * 1000 / FRAMES
+
+
+if __name__ == '__main__':
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+
+    from game_states.enemy import Enemy
+    Enemy.preload_assets()
+
+    rng = random.Random(1)
+    print("Desenho de inimigos (ms por frame)")
+    print(f"{'inimigos':>9} {'flip/frame':>11} {'variantes':>10} {'ganho':>7}")
+    for count in [50, 100, 200]:
+        enemies = [Enemy(rng.uniform(0, SCREEN_SIZE[0] - 100), rng.uniform(0, SCREEN_SIZE[1] - 100))
+                   for _ in range(count)]
+        flip_ms = bench(draw_with_flip, enemies, screen)
+        variants_ms = bench(draw_with_variants, enemies, screen)
+        print(f"{count:>9} {flip_ms:>11.3f} {variants_ms:>10.3f} {flip_ms / variants_ms:>6.1f}x")
+    pygame.quit()
@@ -9,39 +9,49 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from game_states.boss_patterns import PatternScheduler
 from game_states.particle_system import ParticleSystem
+from utils.asset_cache import asset_cache, image_path
+from utils.pools import ProjectilePool
+from utils.sprite_variants import sprite_variants
+from utils.tint_cache import tint_cache
 
 class Boss(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    SIZE = (350, 350)  # --- MODIFICADO: Aumentar o tamanho do chefe ---
+    LASER_SPEED = 18  # Velocidade dos lasers (pixels por frame de referência)
+    LASER_DAMAGE = 10
+    FLASH_COLOR = (255, 255, 255, 128)  # Branco com 128 de alpha ao levar dano
+
+    def __init__(self, x, y, clock=None, rng=None, projectiles=None, arena_size=(1280, 720)):
         super().__init__()
+        # Relógio com get_ticks() (padrão: pygame.time) e gerador aleatório da
+        # partida (padrão: módulo random); injetáveis para headless e replays
+        self.clock = clock if clock is not None else pygame.time
+        self.rng = rng if rng is not None else random
+        # Pool onde os lasers disparados são criados (o GameplayState passa o seu)
+        self.projectiles = projectiles if projectiles is not None else ProjectilePool()
+        # Limites da arena (a resolução lógica do GameplayState que criou o chefe)
+        self.arena_width, self.arena_height = arena_size
         # Atributos básicos
         self.pos = [x, y]
-        # --- MODIFICADO: Aumentar o tamanho do chefe ---
-        self.size = (350, 350)
+        self.previous_pos = [x, y]  # Posição no passo anterior (interpolação do desenho)
+        self.size = Boss.SIZE
         # --- MODIFICADO: Mais vida para o chefe ---
         self.health = 5000
         self.max_health = 5000
         self.facing_right = True
 
         # --- MODIFICADO: Carregar as imagens do chefe (idle e atirando) ---
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
+        # Cada pose tem as variantes (esquerda, direita), criadas uma única vez
         try:
-            # Carrega a imagem de idle (Boss.png)
-            idle_image_path = os.path.join(project_root, 'assets', 'images', 'Boss.png')
-            self.original_image_idle = pygame.image.load(idle_image_path).convert_alpha()
-            self.original_image_idle = pygame.transform.scale(self.original_image_idle, self.size)
-
-            # Carrega a imagem de tiro (Boss_shooting.png)
-            shooting_image_path = os.path.join(project_root, 'assets', 'images', 'Boss_shooting.png')
-            self.original_image_shooting = pygame.image.load(shooting_image_path).convert_alpha()
-            self.original_image_shooting = pygame.transform.scale(self.original_image_shooting, self.size)
-            
-            self.image = self.original_image_idle # Começa com a imagem idle
+            self.sprites = {
+                'idle': sprite_variants.get(image_path('Boss.png'), self.size),
+                'shooting': sprite_variants.get(image_path('Boss_shooting.png'), self.size),
+            }
+            self.image = self.sprites['idle'][self.facing_right] # Começa com a imagem idle
         except Exception as e:
             print(f"AVISO: Não foi possível carregar as imagens do chefe ('Boss.png', 'Boss_shooting.png'). Usando quadrado vermelho. Erro: {e}")
-            self.original_image_idle = None
-            self.original_image_shooting = None
+            self.sprites = None
             self.image = pygame.Surface(self.size)
             self.image.fill((255, 0, 0))
         
@@ -65,6 +75,7 @@ class Boss(pygame.sprite.Sprite):
         self.velocity = [0, 0]
         self.dash_speed = 20
         self.is_dashing = False
+        self.dash_duration = 500
         
         # Ataques
         # --- NOVO: Parâmetros de IA ---
@@ -79,19 +90,51 @@ class Boss(pygame.sprite.Sprite):
             3: ["bullet_hell", "rage_dash", "laser_grid"]
         }
         self.current_pattern = None
-        self._newly_fired_bullets = [] # Lista temporária para novos projéteis
+        # Executa os padrões (definidos em boss_patterns.py) pela linha do tempo
+        self.pattern_scheduler = PatternScheduler(self)
         
         # Efeitos visuais
         self.flash_duration = 200
+        self.glow_surfaces = {}  # Cor da barra de vida -> faixa de brilho
         self.flash_start = 0
         self.is_flashing = False
         self.particle_system = ParticleSystem()
 
         self.rect = self.image.get_rect(topleft=self.pos)
 
-    def update(self, player_pos, current_time, player_velocity_x=0):
+    @staticmethod
+    def asset_specs():
+        """Texturas do chefe, no formato (caminho, tamanho, alpha) do cache de assets."""
+        return [
+            (image_path('Boss.png'), Boss.SIZE, True),
+            (image_path('Boss_shooting.png'), Boss.SIZE, True),
+        ]
+
+    @staticmethod
+    def preload_assets():
+        """Decodifica as texturas do chefe (e as versões espelhadas) antes de a arena ser criada."""
+        sprite_variants.preload(Boss.asset_specs())
+        if asset_cache.headless:
+            return  # Sem tela, o flash nunca é desenhado
+        # Variantes do flash de dano de cada pose, para o primeiro acerto não travar
+        for path, size, alpha in Boss.asset_specs():
+            try:
+                tint_cache.preload(sprite_variants.get(path, size, alpha), Boss.FLASH_COLOR)
+            except (pygame.error, FileNotFoundError):
+                pass  # O aviso já foi mostrado por sprite_variants.preload
+
+    def update(self, player_pos, current_time, player_velocity_x=0, step=1.0, player_size=(0, 0)):
+        """Avança o chefe; step é o passo da simulação em frames de referência (90 FPS).
+
+        player_pos é o canto superior esquerdo do jogador e player_size o tamanho
+        da hitbox dele (os vãos das paredes de lasers ficam no centro do jogador).
+
+        Os lasers disparados neste passo são criados diretamente em self.projectiles.
+        """
+        self.previous_pos[0] = self.pos[0]
+        self.previous_pos[1] = self.pos[1]
+
         # Atualiza fase baseado na vida
-        self._newly_fired_bullets.clear() # Limpa a lista de novos tiros a cada frame
 
         health_percentage = self.health / self.max_health
         for phase, threshold in self.phase_thresholds.items():
@@ -101,41 +144,36 @@ class Boss(pygame.sprite.Sprite):
 
         # Atualiza estado e padrão de ataque
         if self.state == "idle":
-            self._update_movement(player_pos, current_time)
+            if self.is_dashing:
+                self._update_dash()  # Investida que começou no fim do último padrão
+            self._update_movement(player_pos, current_time, step)
             if current_time - self.last_attack_time > self.attack_cooldown:
                 self._start_attack_pattern(current_time, player_pos)
         elif self.state == "attacking":
-            self._update_attack_pattern(current_time, player_pos, player_velocity_x)
+            self._update_attack_pattern(current_time, player_pos, player_velocity_x, player_size)
         elif self.state == "dashing":
             self._update_dash()
 
         # Atualiza posição e projéteis
-        self._update_position()
+        self._update_position(step)
         
         # Atualiza efeitos visuais
         if hasattr(self, 'particle_system'):
-            self.particle_system.update()
-        
-        return self._newly_fired_bullets
-            
+            self.particle_system.update(step)
+
         # --- NOVO: Lógica para virar o chefe e trocar a imagem ---
         # Determina a direção que o chefe deve encarar
         if player_pos[0] > self.pos[0] + self.size[0] / 2:
             self.facing_right = True
         else:
             self.facing_right = False
-            
-        # Seleciona a imagem base (idle ou atirando)
-        if self.state == "attacking" and self.original_image_shooting:
-            base_image = self.original_image_shooting
-        else:
-            base_image = self.original_image_idle
-        
-        # Vira a imagem se necessário e atualiza a imagem principal
-        if base_image:
-            self.image = pygame.transform.flip(base_image, not self.facing_right, False)
 
-    def _update_movement(self, player_pos, current_time):
+        # Seleciona a variante pronta (pose idle ou atirando, virada para o jogador)
+        if self.sprites:
+            pose = 'shooting' if self.state == "attacking" else 'idle'
+            self.image = self.sprites[pose][self.facing_right]
+
+    def _update_movement(self, player_pos, current_time, step=1.0):
         """Movimento tático: mantém distância e se move lateralmente."""
         if not self.is_dashing:
             dx = player_pos[0] - self.pos[0]
@@ -147,28 +185,29 @@ class Boss(pygame.sprite.Sprite):
                 self.strafe_direction *= -1
                 self.last_strafe_change = current_time
 
+            # Movimento lateral (strafe)
+            strafe_velocity = self.strafe_direction * self.speed * 0.5
+
             # Movimento para manter a distância ótima
             if dist > self.optimal_distance + 50: # Se muito longe, aproxima
-                self.velocity[0] = (dx / dist) * self.speed * 0.5
+                self.velocity[0] = (dx / dist) * self.speed * 0.5 + strafe_velocity
             elif dist < self.optimal_distance - 50: # Se muito perto, afasta
-                self.velocity[0] = -(dx / dist) * self.speed * 0.5
+                self.velocity[0] = -(dx / dist) * self.speed * 0.5 + strafe_velocity
             else:
-                self.velocity[0] *= 0.9 # Desacelera se na distância certa
-
-            # Adiciona o movimento lateral (strafe)
-            self.velocity[0] += self.strafe_direction * self.speed * 0.5
+                # Desacelera se na distância certa; aqui o strafe se acumula a cada frame
+                self.velocity[0] = self.velocity[0] * 0.9 ** step + strafe_velocity * step
 
             # Movimento vertical para seguir o jogador
             self.velocity[1] = (dy / dist) * self.speed * 0.7 if dist > 0 else 0
 
-    def _update_position(self):
+    def _update_position(self, step=1.0):
         # Atualiza posição com base na velocidade
-        self.pos[0] += self.velocity[0]
-        self.pos[1] += self.velocity[1]
+        self.pos[0] += self.velocity[0] * step
+        self.pos[1] += self.velocity[1] * step
         
         # Limita à tela
-        self.pos[0] = max(0, min(self.pos[0], 1280 - self.size[0]))
-        self.pos[1] = max(0, min(self.pos[1], 720 - self.size[1]))
+        self.pos[0] = max(0, min(self.pos[0], self.arena_width - self.size[0]))
+        self.pos[1] = max(0, min(self.pos[1], self.arena_height - self.size[1]))
         
         self.rect.topleft = self.pos
 
@@ -186,40 +225,22 @@ class Boss(pygame.sprite.Sprite):
             self.current_pattern = "cross_beam"
         else:
             # Se não se encaixa em nenhuma condição especial, escolhe um aleatório
-            self.current_pattern = random.choice(available_attacks)
+            self.current_pattern = self.rng.choice(available_attacks)
 
         self.pattern_start_time = current_time
         self.state = "attacking"
-        
-        # Configura duração e comportamento do padrão
-        if self.current_pattern == "projectile_spray":
-            self.current_pattern_duration = 3000
-        elif self.current_pattern == "bullet_hell":
-            self.current_pattern_duration = 5000
-        elif self.current_pattern == "cross_beam":
-            self.current_pattern_duration = 2000
-        elif self.current_pattern == "dash_attack":
-            self.current_pattern_duration = 2000
-            self._start_dash(player_pos)
-
-    def _update_attack_pattern(self, current_time, player_pos, player_velocity_x):
+        # Duração e disparos vêm da definição do padrão
+        self.current_pattern_duration = self.pattern_scheduler.start(self.current_pattern, current_time)
+
+    def _update_attack_pattern(self, current_time, player_pos, player_velocity_x, player_size=(0, 0)):
+        # Dispara todos os tiros com horário vencido desde o último passo
+        self.pattern_scheduler.update(current_time, player_pos, player_velocity_x, player_size)
+        if self.is_dashing:
+            self._update_dash()
+
         time_in_pattern = current_time - self.pattern_start_time
-        
         if time_in_pattern > self.current_pattern_duration:
             self._end_attack_pattern()
-            return
-
-        # --- MODIFICADO: Executa o padrão de ataque atual com tiro preditivo ---
-        if self.current_pattern == "projectile_spray":
-            if time_in_pattern % 150 == 0:  # --- MODIFICADO: Atira a cada 150ms
-                self._fire_projectile(player_pos, player_velocity_x)
-        elif self.current_pattern == "bullet_hell":
-            if time_in_pattern % 120 == 0:  # --- MODIFICADO: Atira mais rápido
-                for angle in range(0, 360, 30):  # --- MODIFICADO: 12 direções em vez de 8
-                    self._fire_projectile_angle(angle)
-        elif self.current_pattern == "cross_beam":
-            if time_in_pattern % 500 == 0:
-                self._fire_cross_beam()
 
     def _fire_projectile(self, target_pos, player_velocity_x):
         """Atira um projétil que antecipa o movimento do jogador."""
@@ -236,47 +257,20 @@ class Boss(pygame.sprite.Sprite):
         dy = predicted_y - start_pos[1]
         dist = math.sqrt(dx * dx + dy * dy)
         if dist > 0:
-            direction = [(dx/dist), (dy/dist)]
-            bullet = {
-                'pos': start_pos,
-                'direction': direction,
-                'damage': 10,
-                'visual_type': 'boss_laser' # Identificador para o visual
-            }
-            self._newly_fired_bullets.append(bullet)
+            self.projectiles.spawn(start_pos[0], start_pos[1], dx/dist, dy/dist,
+                                   Boss.LASER_SPEED, damage=Boss.LASER_DAMAGE, kind='boss_laser')
             
             # Efeito de partículas no disparo
             self.particle_system.create_explosion(start_pos[0], start_pos[1], (255, 200, 0, 200), 10)
 
-    def _fire_projectile_angle(self, angle):
-        rad = math.radians(angle)
-        direction = [math.cos(rad), math.sin(rad)]
-        bullet = {
-            'pos': [self.pos[0] + self.size[0]/2, self.pos[1] + self.size[1]/2],
-            'direction': direction,
-            'damage': 10,
-            'visual_type': 'boss_laser'
-        }
-        self._newly_fired_bullets.append(bullet)
-
-    def _fire_cross_beam(self):
-        """Fires projectiles in four cardinal directions (cross shape)."""
-        self._fire_projectile_angle(0)    # Right
-        self._fire_projectile_angle(90)   # Down
-        self._fire_projectile_angle(180)  # Left
-        self._fire_projectile_angle(270)  # Up
-        
-        # Add some particle effects for the attack
-        center_x = self.pos[0] + self.size[0] / 2
-        center_y = self.pos[1] + self.size[1] / 2
-        self.particle_system.create_explosion(center_x, center_y, (200, 200, 255, 200), 25)
-
     def _end_attack_pattern(self):
+        self.pattern_scheduler.stop()
         self.current_pattern = None
         self.state = "idle"
-        self.last_attack_time = pygame.time.get_ticks()
+        self.last_attack_time = self.clock.get_ticks()
 
-    def _start_dash(self, target_pos):
+    def start_dash(self, target_pos, duration=500):
+        """Investe contra `target_pos` por `duration` ms (ignorado se já estiver investindo)."""
         if not self.is_dashing:
             dx = target_pos[0] - self.pos[0]
             dy = target_pos[1] - self.pos[1]
@@ -284,38 +278,42 @@ class Boss(pygame.sprite.Sprite):
             if dist > 0:
                 self.velocity = [(dx/dist) * self.dash_speed, (dy/dist) * self.dash_speed]
                 self.is_dashing = True
-                self.last_dash_time = pygame.time.get_ticks()
+                self.last_dash_time = self.clock.get_ticks()
+                self.dash_duration = duration
 
     def _update_dash(self):
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_dash_time > 500:  # Dash dura 500ms
+        current_time = self.clock.get_ticks()
+        if current_time - self.last_dash_time > self.dash_duration:
             self.is_dashing = False
             self.velocity = [0, 0]
-            self.state = "idle"
+            if self.state == "dashing":
+                self.state = "idle"
 
     def start_phase_transition(self):
         # Efeito visual para transição de fase
         self.is_flashing = True
-        self.flash_start = pygame.time.get_ticks()
+        self.flash_start = self.clock.get_ticks()
         # Aumenta a velocidade e reduz cooldowns em cada fase
         self.speed *= 1.2
         self.attack_cooldown *= 0.8
         self.dash_cooldown *= 0.8
 
-    def draw(self, screen, camera_offset_x, camera_offset_y):
-        # Atualiza e desenha o sistema de partículas primeiro (para ficar atrás do boss)
-        self.particle_system.update()
+    def draw(self, screen, camera_offset_x, camera_offset_y, alpha=1.0):
+        """Desenha o chefe entre a posição do passo anterior (alpha 0) e a atual (alpha 1)."""
+        # Desenha o sistema de partículas primeiro (para ficar atrás do boss);
+        # as partículas só avançam em update(), para não depender da taxa de desenho
         self.particle_system.draw(screen, camera_offset_x, camera_offset_y)
         
-        screen_pos = (int(self.pos[0] + camera_offset_x), int(self.pos[1] + camera_offset_y))
+        x = self.previous_pos[0] + (self.pos[0] - self.previous_pos[0]) * alpha
+        y = self.previous_pos[1] + (self.pos[1] - self.previous_pos[1]) * alpha
+        screen_pos = (int(x + camera_offset_x), int(y + camera_offset_y))
         
-        # Desenha o boss com efeito de flash se necessário
+        # Desenha o boss com efeito de flash se necessário (variante tingida, só na silhueta)
+        image = self.image
         if self.is_flashing:
-            current_time = pygame.time.get_ticks()
+            current_time = self.clock.get_ticks()
             if current_time - self.flash_start <= self.flash_duration:
-                flash_surface = pygame.Surface(self.size, pygame.SRCALPHA)
-                flash_surface.fill((255, 255, 255, 128))
-                screen.blit(flash_surface, screen_pos)
+                image = tint_cache.get(self.image, Boss.FLASH_COLOR)
                 # Adiciona partículas de dano
                 if random.random() < 0.3:  # 30% de chance por frame
                     self.particle_system.create_explosion(
@@ -327,7 +325,7 @@ class Boss(pygame.sprite.Sprite):
             else:
                 self.is_flashing = False
         
-        screen.blit(self.image, screen_pos)
+        screen.blit(image, screen_pos)
         
         # Barra de vida com cores dinâmicas baseadas na fase
         health_bar_width = 200
@@ -350,7 +348,10 @@ class Boss(pygame.sprite.Sprite):
         # Adiciona brilho na barra de vida
         glow_height = 2
         glow_width = max(1, int(health_bar_width * health_percentage))  # Garante largura mínima de 1 pixel
-        glow_color = (health_color[0], health_color[1], health_color[2], 128)
-        glow_surface = pygame.Surface((glow_width, glow_height), pygame.SRCALPHA)
-        glow_surface.fill(glow_color)
-        screen.blit(glow_surface, (screen_pos[0], screen_pos[1] - 30 - glow_height))
+        # Uma faixa de brilho por cor, do tamanho da barra cheia; só a parte da vida atual é copiada
+        glow_surface = self.glow_surfaces.get(health_color)
+        if glow_surface is None:
+            glow_surface = pygame.Surface((health_bar_width, glow_height), pygame.SRCALPHA)
+            glow_surface.fill((health_color[0], health_color[1], health_color[2], 128))
+            self.glow_surfaces[health_color] = glow_surface
+        screen.blit(glow_surface, (screen_pos[0], screen_pos[1] - 30 - glow_height), (0, 0, glow_width, glow_height))
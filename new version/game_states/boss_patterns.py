@@ -0,0 +1,230 @@
+# game_states/boss_patterns.py
+"""Padrões de ataque do chefe, descritos como dados e executados por uma linha do tempo.
+
+Cada padrão tem uma duração (ms) e uma lista de emissores. Um emissor dispara
+em `start` ms após o início do padrão e depois a cada `interval` ms (sem
+`interval`, dispara uma vez) até `until` (padrão: o fim do padrão). Tipos:
+
+- 'aimed': um laser na direção do jogador, antecipando o movimento dele;
+- 'ring':  `count` lasers igualmente espaçados, girando `spin` graus a cada disparo;
+- 'fan':   lasers nos ângulos de `angles` (graus; 0 = direita, 90 = baixo);
+- 'wall':  uma fileira de `count` lasers que entra pela borda `side` da arena
+           ('top', 'left' ou 'alternate'), com um vão de `gap` px no jogador;
+- 'dash':  o chefe investe contra o jogador por `dash_duration` ms.
+
+`origin` escolhe de onde saem ring/fan ('center' ou 'bottom' do chefe) e
+`particles` é ((r, g, b, a), quantidade) da explosão a cada disparo.
+
+O PatternScheduler dispara a cada passo todos os tiros com horário vencido
+desde o passo anterior (nenhum se perde, qualquer que seja a taxa de passos)
+e adianta cada laser pelo atraso entre o horário dele e o passo atual. Os
+ângulos e direções de ring/fan são calculados uma vez em load_patterns().
+"""
+from fractions import Fraction
+import numpy as np
+
+REFERENCE_FPS = 90  # Velocidades dos lasers são em pixels por frame a 90 FPS
+
+PATTERN_DEFINITIONS = {
+    'projectile_spray': {
+        'duration': 3000,
+        'emitters': [{'type': 'aimed', 'interval': 150, 'particles': ((255, 200, 0, 200), 10)}],
+    },
+    'ground_pound': {
+        'duration': 1500,
+        # Ondas rente ao chão para os dois lados, com lasers um pouco inclinados para cima
+        'emitters': [{'type': 'fan', 'start': 300, 'interval': 500, 'origin': 'bottom',
+                      'angles': [0, -12, 180, 192], 'particles': ((150, 120, 80, 200), 20)}],
+    },
+    'circle_burst': {
+        'duration': 2500,
+        'emitters': [{'type': 'ring', 'interval': 350, 'count': 16, 'spin': 11.25,
+                      'particles': ((255, 120, 255, 200), 15)}],
+    },
+    'projectile_wall': {
+        'duration': 2700,
+        'emitters': [{'type': 'wall', 'interval': 900, 'side': 'top', 'count': 14, 'gap': 220}],
+    },
+    'dash_attack': {
+        'duration': 2000,
+        'emitters': [{'type': 'dash', 'dash_duration': 500}],
+    },
+    'cross_beam': {
+        'duration': 2000,
+        'emitters': [{'type': 'ring', 'interval': 500, 'count': 4,
+                      'particles': ((200, 200, 255, 200), 25)}],
+    },
+    'bullet_hell': {
+        'duration': 5000,
+        'emitters': [{'type': 'ring', 'interval': 120, 'count': 12}],
+    },
+    'rage_dash': {
+        'duration': 2200,
+        'emitters': [
+            {'type': 'dash', 'interval': 700, 'until': 1400, 'dash_duration': 500},
+            # Anel no fim de cada investida
+            {'type': 'ring', 'start': 500, 'interval': 700, 'until': 1900, 'count': 10,
+             'particles': ((255, 80, 0, 200), 20)},
+        ],
+    },
+    'laser_grid': {
+        'duration': 3000,
+        'emitters': [{'type': 'wall', 'interval': 600, 'side': 'alternate', 'count': 10}],
+    },
+}
+
+
+def _unit_vectors(degrees):
+    rad = np.radians(np.asarray(degrees, dtype=np.float64))
+    return np.column_stack((np.cos(rad), np.sin(rad)))
+
+
+def load_patterns(definitions):
+    """Valida as definições e pré-calcula as tabelas de direções; retorna {nome: padrão}."""
+    patterns = {}
+    for name, definition in definitions.items():
+        duration = definition['duration']
+        emitters = []
+        for spec in definition['emitters']:
+            emitter = {
+                'type': spec['type'],
+                'start': spec.get('start', 0),
+                'interval': spec.get('interval'),
+                'until': min(spec.get('until', duration), duration),
+                'origin': spec.get('origin', 'center'),
+                'particles': spec.get('particles'),
+            }
+            if emitter['type'] == 'ring':
+                count = spec['count']
+                spin = spec.get('spin', 0)
+                # Um anel por rotação distinta (o giro se repete a cada `period` disparos)
+                period = Fraction(spin / 360).limit_denominator(1000).denominator if spin else 1
+                emitter['tables'] = [_unit_vectors(np.arange(count) * (360 / count) + k * spin)
+                                     for k in range(period)]
+            elif emitter['type'] == 'fan':
+                emitter['tables'] = [_unit_vectors(spec['angles'])]
+            elif emitter['type'] == 'wall':
+                emitter['side'] = spec.get('side', 'top')
+                emitter['count'] = spec['count']
+                emitter['gap'] = spec.get('gap', 0)
+            elif emitter['type'] == 'dash':
+                emitter['dash_duration'] = spec.get('dash_duration', 500)
+            elif emitter['type'] != 'aimed':
+                raise ValueError(f"Padrão '{name}': emissor desconhecido '{emitter['type']}'")
+            emitters.append(emitter)
+        patterns[name] = {'name': name, 'duration': duration, 'emitters': emitters}
+    return patterns
+
+
+# Padrões prontos, compartilhados por todos os chefes
+BOSS_PATTERNS = load_patterns(PATTERN_DEFINITIONS)
+
+
+def due_shots(emitter, last, now):
+    """Índices k dos disparos com horário em (last, now] (horário = start + k * interval)."""
+    start, interval, until = emitter['start'], emitter['interval'], emitter['until']
+    end = min(now, until)
+    if end < start:
+        return range(0)
+    if not interval:
+        return range(1) if last < start else range(0)
+    first = 0 if last < start else (last - start) // interval + 1
+    return range(int(first), int((end - start) // interval) + 1)
+
+
+class PatternScheduler:
+    """Executa o padrão de ataque atual de um chefe pela linha do tempo."""
+
+    def __init__(self, boss, patterns=BOSS_PATTERNS):
+        self.boss = boss
+        self.patterns = patterns
+        self.pattern = None
+        self.start_time = 0
+        self.last_time = -1  # Tempo (ms no padrão) até onde os disparos já saíram
+        self.wall_tables = {}  # (lado, quantidade) -> (posições, direção)
+        self.emitted = 0  # Lasers disparados (para os benchmarks)
+
+    def start(self, name, current_time):
+        self.pattern = self.patterns[name]
+        self.start_time = current_time
+        self.last_time = -1
+        return self.pattern['duration']
+
+    def stop(self):
+        self.pattern = None
+
+    def update(self, current_time, player_pos, player_velocity_x, player_size=(0, 0)):
+        """Dispara tudo que venceu desde o último passo, até o fim do padrão.
+
+        player_pos é o canto superior esquerdo do jogador; com player_size os vãos
+        das paredes ficam centrados no meio dele.
+        """
+        if self.pattern is None:
+            return
+        now = min(current_time - self.start_time, self.pattern['duration'])
+        if now <= self.last_time:
+            return
+        player_center = (player_pos[0] + player_size[0] / 2, player_pos[1] + player_size[1] / 2)
+        for emitter in self.pattern['emitters']:
+            for k in due_shots(emitter, self.last_time, now):
+                shot_time = emitter['start'] + k * (emitter['interval'] or 0)
+                self._fire(emitter, k, (now - shot_time) * REFERENCE_FPS / 1000.0,
+                           player_pos, player_velocity_x, player_center)
+        self.last_time = now
+
+    def _fire(self, emitter, k, late_frames, player_pos, player_velocity_x, player_center):
+        boss = self.boss
+        kind = emitter['type']
+        if kind == 'dash':
+            boss.start_dash(player_pos, emitter['dash_duration'])
+            return
+
+        pool = boss.projectiles
+        first = len(pool)
+        center_x = boss.pos[0] + boss.size[0] / 2
+        origin_y = boss.pos[1] + (boss.size[1] if emitter['origin'] == 'bottom' else boss.size[1] / 2)
+        if kind == 'aimed':
+            boss._fire_projectile(player_pos, player_velocity_x)
+        elif kind in ('ring', 'fan'):
+            tables = emitter['tables']
+            directions = tables[k % len(tables)]
+            pool.spawn_many(center_x, origin_y, directions[:, 0], directions[:, 1],
+                            boss.LASER_SPEED, damage=boss.LASER_DAMAGE, kind='boss_laser')
+        elif kind == 'wall':
+            side = emitter['side']
+            if side == 'alternate':
+                side = 'top' if k % 2 == 0 else 'left'
+            positions, direction = self._wall(side, emitter['count'])
+            if emitter['gap']:
+                # Vão centrado no jogador, para a parede poder ser atravessada
+                axis = 0 if side == 'top' else 1
+                keep = np.abs(positions[:, axis] - player_center[axis]) > emitter['gap'] / 2
+                positions = positions[keep]
+            count = len(positions)
+            pool.spawn_many(positions[:, 0], positions[:, 1], np.full(count, direction[0]), np.full(count, direction[1]),
+                            boss.LASER_SPEED, damage=boss.LASER_DAMAGE, kind='boss_laser')
+
+        # Disparo atrasado (passo longo ou vários tiros vencidos): adianta os lasers
+        # como se tivessem saído no horário certo
+        if late_frames > 0:
+            pool.integrate(late_frames, first)
+        self.emitted += len(pool) - first
+
+        particles = emitter['particles']
+        if particles and kind != 'aimed':  # O tiro mirado já cria a própria explosão
+            boss.particle_system.create_explosion(center_x, origin_y, particles[0], particles[1])
+
+    def _wall(self, side, count):
+        """Posições de entrada e direção de uma parede de lasers (pré-calculadas por arena)."""
+        key = (side, count)
+        table = self.wall_tables.get(key)
+        if table is None:
+            boss = self.boss
+            if side == 'top':
+                xs = np.linspace(0, boss.arena_width, count + 2)[1:-1]
+                table = (np.column_stack((xs, np.zeros(count))), (0.0, 1.0))
+            else:
+                ys = np.linspace(0, boss.arena_height, count + 2)[1:-1]
+                table = (np.column_stack((np.zeros(count), ys)), (1.0, 0.0))
+            self.wall_tables[key] = table
+        return table
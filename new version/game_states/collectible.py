@@ -1,33 +1,53 @@
 import pygame
-import os
+from utils.asset_cache import asset_cache, image_path
+from utils.render_queue import solid_surface
 
 class Collectible:
+    SIZE = (30, 30)
+    IMAGES = {
+        "heart": 'heart_drop.png',
+        "ammo": 'caixa_de_balas.png',
+    }
+
     def __init__(self, x, y, type_="heart"):
+        self.size = Collectible.SIZE
         self.pos = [x, y]
-        self.type = type_  # "heart" ou "ammo"
-        self.size = (30, 30)
         self.rect = pygame.Rect(x, y, self.size[0], self.size[1])
-        self.velocity_y = -8  # Velocidade inicial para cima (efeito de pop)
         self.gravity = 0.5
+        self.reset(x, y, type_)
+
+    def reset(self, x, y, type_="heart"):
+        """(Re)inicia o coletável em (x, y); permite reaproveitar instâncias já recolhidas."""
+        self.pos[0] = x
+        self.pos[1] = y
+        self.previous_y = y  # Altura no passo anterior (interpolação do desenho)
+        self.type = type_  # "heart" ou "ammo"
+        self.rect.topleft = (x, y)
+        self.velocity_y = -8  # Velocidade inicial para cima (efeito de pop)
         
-        # Carregar texturas
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
-        
+        # Carregar texturas (compartilhadas via cache)
         try:
-            if type_ == "heart":
-                self.image = pygame.image.load(os.path.join(project_root, 'assets', 'images', 'heart_drop.png')).convert_alpha()
-            else:  # ammo
-                self.image = pygame.image.load(os.path.join(project_root, 'assets', 'images', 'caixa_de_balas.png')).convert_alpha()
-            self.image = pygame.transform.scale(self.image, self.size)
+            image_name = Collectible.IMAGES["heart"] if type_ == "heart" else Collectible.IMAGES["ammo"]
+            self.image = asset_cache.get_image(image_path(image_name), self.size)
         except Exception as e:
             print(f"Erro ao carregar imagem do coletável: {e}")
             self.image = None
 
-    def update(self, platforms, ground_y):
-        # Aplicar gravidade
-        self.velocity_y += self.gravity
-        self.pos[1] += self.velocity_y
+    @staticmethod
+    def asset_specs():
+        """Texturas dos coletáveis, no formato (caminho, tamanho, alpha) do cache de assets."""
+        return [(image_path(name), Collectible.SIZE, True) for name in Collectible.IMAGES.values()]
+
+    @staticmethod
+    def preload_assets():
+        """Decodifica as texturas dos coletáveis antes do primeiro drop."""
+        asset_cache.preload(Collectible.asset_specs())
+
+    def update(self, platforms, ground_y, step=1.0):
+        self.previous_y = self.pos[1]
+        # Aplicar gravidade (step = passo da simulação em frames de referência)
+        self.velocity_y += self.gravity * step
+        self.pos[1] += self.velocity_y * step
         self.rect.y = self.pos[1]
 
         # Checar colisão com o chão
@@ -44,6 +64,18 @@ class Collectible:
                     self.pos[1] = self.rect.y
                     self.velocity_y = 0
 
+    def submit(self, render_queue, alpha=1.0):
+        """Envia o sprite para a fila de desenho (o corte pela câmera é feito lá).
+
+        `alpha` interpola a altura entre o passo anterior e o atual.
+        """
+        image = self.image
+        if not image:
+            # Fallback: um retângulo colorido
+            image = solid_surface(self.size, (255, 0, 0) if self.type == "heart" else (255, 255, 0))
+        y = self.previous_y + (self.pos[1] - self.previous_y) * alpha
+        render_queue.submit('collectibles', image, self.pos[0], y)
+
     def draw(self, screen, camera_offset_x, camera_offset_y):
         if self.image:
             screen_pos = (int(self.pos[0] + camera_offset_x), int(self.pos[1] + camera_offset_y))
@@ -1,7 +1,12 @@
 # game_states/cutscene_state.py
 
 import os
+import threading
 import pygame
+from utils.asset_cache import asset_cache
+from utils.profiler import profiler
+from utils.text_cache import text_cache
+from utils.video_decoder import VideoDecoder
 
 
 class CutsceneState:
@@ -33,57 +38,81 @@ class CutsceneState:
         self.video_start_ticks = None
         self.video_duration = None
         self.video_reader = None
-        self.video_frame_iter = None
+        self.video_decoder = None  # Thread que decodifica à frente (veja utils/video_decoder.py)
         self.current_video_surface = None
         self.playing_video = False
 
         # paths
         script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
-        video_path = os.path.join(project_root, 'assets', 'videos', 'cutscene.mp4')
+        self.project_root = os.path.dirname(script_dir)
+        self.video_path = os.path.join(self.project_root, 'assets', 'videos', 'cutscene.mp4')
+
+        # Abrir o vídeo (e contar os frames) é lento: roda numa thread enquanto o
+        # menu já aparece, e o modo final é decidido em enter()
+        self.setup_done = False
+        self.video_probe_thread = None
+        self.frame_specs = []
+        if os.path.exists(self.video_path):
+            self.video_probe_thread = threading.Thread(target=self._probe_video, name='cutscene-probe', daemon=True)
+            self.video_probe_thread.start()
+        else:
+            self._queue_frames()
 
-        # 1) tenta vídeo embutido com imageio (usa imageio-ffmpeg para decodificar)
-        if os.path.exists(video_path):
+    def _probe_video(self):
+        """1) tenta vídeo embutido com imageio (usa imageio-ffmpeg para decodificar)."""
+        video_path = self.video_path
+        try:
+            import imageio
             try:
-                import imageio
+                # O próprio ffmpeg já entrega os frames no tamanho da tela (sem scale por frame)
+                reader = imageio.get_reader(video_path, 'ffmpeg', size=(self.screen_width, self.screen_height))
+            except Exception:
                 reader = imageio.get_reader(video_path, 'ffmpeg')
-                meta = reader.get_meta_data()
-                self.video_reader = reader
-                self.video_fps = meta.get('fps', 24)
-                # tenta obter nframes; se não disponível, usar duration
-                try:
-                    self.video_nframes = reader.count_frames()
-                except Exception:
-                    self.video_nframes = int(meta.get('duration', 0) * self.video_fps)
-                self.video_duration = meta.get('duration', None)
-                # frame duration in ms
-                try:
-                    self.video_frame_duration = int(1000.0 / float(self.video_fps))
-                except Exception:
-                    self.video_frame_duration = 33
-                self.mode = 'video'
-                print(f"Cutscene: usando imageio para reproduzir {video_path} (fps={self.video_fps}, nframes={self.video_nframes})")
-            except Exception as e:
-                print(f"Aviso: não foi possível usar imageio para reproduzir '{video_path}': {e}. Tentando frames/fallback.")
-
-        # 2) se não for 'video' nem 'external', tenta frames em assets/images
+            meta = reader.get_meta_data()
+            self.video_reader = reader
+            self.video_fps = meta.get('fps', 24)
+            # tenta obter nframes; se não disponível, usar duration
+            try:
+                self.video_nframes = reader.count_frames()
+            except Exception:
+                self.video_nframes = int(meta.get('duration', 0) * self.video_fps)
+            self.video_duration = meta.get('duration', None)
+            # frame duration in ms
+            try:
+                self.video_frame_duration = int(1000.0 / float(self.video_fps))
+            except Exception:
+                self.video_frame_duration = 33
+            self.mode = 'video'
+            print(f"Cutscene: usando imageio para reproduzir {video_path} (fps={self.video_fps}, nframes={self.video_nframes})")
+        except Exception as e:
+            print(f"Aviso: não foi possível usar imageio para reproduzir '{video_path}': {e}. Tentando frames/fallback.")
+
+    def _queue_frames(self):
+        """2) agenda a decodificação dos frames em assets/images (cutscene_frame_1.png, ...)."""
+        size = (self.screen_width, self.screen_height)
+        idx = 1
+        while True:
+            path = os.path.join(self.project_root, 'assets', 'images', f'cutscene_frame_{idx}.png')
+            if not os.path.exists(path):
+                break
+            self.frame_specs.append((path, size, True))
+            idx += 1
+        asset_cache.preload_async(self.frame_specs)
+
+    def _finish_setup(self):
+        """Decide o modo da cutscene quando o vídeo (ou os frames) terminou de carregar."""
+        if self.video_probe_thread is not None:
+            self.video_probe_thread.join()
+            self.video_probe_thread = None
+            if self.mode != 'video':
+                self._queue_frames()
+
+        # 2) se não for 'video' nem 'external', usa os frames em assets/images
         if self.mode not in ('video', 'external'):
             try:
-                idx = 1
-                loaded = False
-                while True:
-                    path = os.path.join(project_root, 'assets', 'images', f'cutscene_frame_{idx}.png')
-                    if not os.path.exists(path):
-                        break
-                    frame = pygame.image.load(path).convert_alpha()
-                    frame = pygame.transform.scale(frame, (self.screen_width, self.screen_height))
-                    self.frames.append(frame)
-                    loaded = True
-                    idx += 1
-                if loaded:
-                    self.mode = 'frames'
-                else:
-                    self.mode = 'placeholder'
+                for path, size, alpha in self.frame_specs:
+                    self.frames.append(asset_cache.get_image(path, size, alpha))
+                self.mode = 'frames' if self.frames else 'placeholder'
             except Exception as e:
                 print(f"Erro ao carregar frames: {e}")
                 self.mode = 'placeholder'
@@ -91,12 +120,12 @@ class CutsceneState:
         # se ainda placeholder, crie um frame simples
         if self.mode == 'placeholder' and not self.frames:
             self.frames = [self._create_placeholder_frame("Cutscene vazia. Pressione qualquer tecla para continuar.", (255, 255, 255))]
+        self.setup_done = True
 
     def _create_placeholder_frame(self, text, color):
         surface = pygame.Surface((self.screen_width, self.screen_height))
         surface.fill((0, 0, 0))
-        font = pygame.font.SysFont(None, 40)
-        text_surface = font.render(text, True, color)
+        text_surface = text_cache.render(text, 40, color)
         text_rect = text_surface.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
         surface.blit(text_surface, text_rect)
         return surface
@@ -104,40 +133,50 @@ class CutsceneState:
     def enter(self):
         # Para a música do menu ao entrar na cutscene
         pygame.mixer.music.stop()
+        if not self.setup_done:
+            self._finish_setup()
 
         self.current_frame_index = 0
         self.last_frame_time = pygame.time.get_ticks()
         # Se o modo for 'video' (imageio reader), inicia o temporizador
         if self.mode == 'video' and hasattr(self, 'video_reader') and self.video_reader is not None:
+            # Os frames são decodificados numa thread, alguns à frente, e copiados
+            # para uma única Surface do tamanho da tela (sem alocação por frame)
+            self.video_decoder = VideoDecoder(self.video_reader, (self.screen_width, self.screen_height),
+                                              self.video_fps, zero_copy=True)
+            self.video_decoder.start()
             self.video_start_ticks = pygame.time.get_ticks()
-            # iterator over frames to avoid seeking and ffmpeg re-spawn issues
-            try:
-                self.video_frame_iter = self.video_reader.iter_data()
-            except Exception:
-                self.video_frame_iter = None
             self.current_video_surface = None
             self.playing_video = True
 
+    def _stop_video(self):
+        """Para a decodificação e libera o leitor do vídeo."""
+        if self.video_decoder is not None:
+            self.video_decoder.stop()  # Também fecha o leitor
+            print(f"Cutscene: {self.video_decoder.stats()}")
+        elif getattr(self, 'video_reader', None):
+            try:
+                self.video_reader.close()
+            except Exception:
+                pass
+        self.video_decoder = None
+        self.video_reader = None
+        self.current_video_surface = None
+        self.playing_video = False
+
     def handle_event(self, event):
         # Permite pular a cutscene com qualquer tecla ou clique
         if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
             # se um clip interno estiver rodando, libera recursos
             try:
                 if self.mode == 'video' and getattr(self, 'video_reader', None):
-                    try:
-                        self.video_reader.close()
-                    except Exception:
-                        pass
-                    self.video_frame_iter = None
-                    self.video_reader = None
-                    self.current_video_surface = None
-                    self.playing_video = False
+                    self._stop_video()
             finally:
                 # evita transições duplicadas
                 if self.game_manager.current_state is not None:
                     self.game_manager.set_state('gameplay')
 
-    def update(self):
+    def update(self, dt):
         if self.mode == 'frames':
             now = pygame.time.get_ticks()
             if now - self.last_frame_time > self.frame_duration:
@@ -146,45 +185,16 @@ class CutsceneState:
                 if self.current_frame_index >= len(self.frames):
                     self.game_manager.set_state('gameplay')
 
-        elif self.mode == 'video' and getattr(self, 'video_reader', None) is not None:
-            now = pygame.time.get_ticks()
-            # advance frames based on frame duration
-            if hasattr(self, 'video_frame_iter') and self.video_frame_iter is not None:
-                if now - self.last_frame_time >= getattr(self, 'video_frame_duration', 33):
-                    try:
-                        frame = next(self.video_frame_iter)
-                        import numpy as np
-                        arr = np.asarray(frame)
-                        if arr.dtype != np.uint8:
-                            arr = arr.astype(np.uint8)
-                        surf = pygame.surfarray.make_surface(arr.swapaxes(0, 1))
-                        if surf.get_size() != (self.screen_width, self.screen_height):
-                            surf = pygame.transform.scale(surf, (self.screen_width, self.screen_height))
-                        self.current_video_surface = surf
-                        self.last_frame_time = now
-                    except StopIteration:
-                        try:
-                            if getattr(self, 'video_reader', None):
-                                self.video_reader.close()
-                        except Exception:
-                            pass
-                        self.video_frame_iter = None
-                        self.video_reader = None
-                        self.playing_video = False
-                        if self.game_manager.current_state is not None:
-                            self.game_manager.set_state('gameplay')
-                    except Exception as e:
-                        print(f"Aviso: erro ao iterar frames do vídeo: {e}")
-                        try:
-                            if getattr(self, 'video_reader', None):
-                                self.video_reader.close()
-                        except Exception:
-                            pass
-                        self.video_frame_iter = None
-                        self.video_reader = None
-                        self.playing_video = False
-                        if self.game_manager.current_state is not None:
-                            self.game_manager.set_state('gameplay')
+        elif self.mode == 'video' and self.video_decoder is not None:
+            # O relógio de apresentação decide o frame; frames atrasados são pulados
+            elapsed = pygame.time.get_ticks() - self.video_start_ticks
+            self.current_video_surface = self.video_decoder.frame_for_time(elapsed)
+            if profiler.enabled:
+                profiler.set_counter('latência do vídeo (ms)', round(self.video_decoder.latency_ms()[0], 1))
+            if self.video_decoder.finished:
+                self._stop_video()
+                if self.game_manager.current_state is not None:
+                    self.game_manager.set_state('gameplay')
 
     def draw(self, screen):
         if self.mode == 'frames':
@@ -206,9 +216,8 @@ class CutsceneState:
         elif self.mode == 'external':
             # mostra um placeholder enquanto o player externo roda; usuário deve fechar/pressionar tecla para continuar
             screen.fill((0, 0, 0))
-            font = pygame.font.SysFont(None, 36)
             text = "Cutscene aberta no player externo. Pressione qualquer tecla para prosseguir."
-            surf = font.render(text, True, (255, 255, 255))
+            surf = text_cache.render(text, 36, (255, 255, 255))
             screen.blit(surf, surf.get_rect(center=(self.screen_width // 2, self.screen_height // 2)))
 
         else:
@@ -1,32 +1,53 @@
 import pygame
 import math
-import os
 import random
+from utils.asset_cache import image_path
+from utils.sprite_variants import sprite_variants
+from utils.render_queue import solid_surface
 
 class Enemy:
-    def __init__(self, x, y, is_flying=False):
+    SIZE = (100, 100)  # Tamanho do inimigo
+    LASER_SPEED = 15  # Velocidade do laser (pixels por frame de referência)
+    SHOT_COOLDOWN = 2000  # Tempo padrão entre tiros em ms (o balanceamento muda por partida)
+
+    def __init__(self, x, y, is_flying=False, shot_cooldown=None):
         self.pos = [x, y]
         self.is_flying = is_flying
-        self.size = (100, 100)  # Tamanho do inimigo
+        self.size = Enemy.SIZE
+        self.rect = pygame.Rect(x, y, self.size[0], self.size[1])  # Hitbox (inimigos não se movem)
         self.shots_remaining = 5  # Número de tiros antes de precisar esfriar
         self.overheat_timer = 0  # Timer para controlar o resfriamento
         self.cooldown_time = 3000  # 3 segundos em milissegundos
-        self.shot_cooldown = 2000  # Tempo entre tiros (800ms)
+        self.shot_cooldown = shot_cooldown if shot_cooldown is not None else Enemy.SHOT_COOLDOWN  # Tempo entre tiros
         self.last_shot_time = 0
         self.is_overheated = False
         self.facing_right = False # Inimigo começa virado para a esquerda
         
-        # Carregar imagem do inimigo
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
+        # Carregar imagem do inimigo (esquerda, direita), compartilhada entre todos via cache
         try:
-            self.image = pygame.image.load(os.path.join(project_root, 'assets', 'images', 'enemie.png')).convert_alpha()
-            self.image = pygame.transform.scale(self.image, self.size)
+            self.images = sprite_variants.get(image_path('enemie.png'), self.size)
         except Exception as e:
             print(f"Erro ao carregar enemie.png: {e}")
-            self.image = None
+            self.images = None
+
+    @staticmethod
+    def asset_specs():
+        """Texturas do inimigo, no formato (caminho, tamanho, alpha) do cache de assets."""
+        return [(image_path('enemie.png'), Enemy.SIZE, True)]
+
+    @staticmethod
+    def preload_assets():
+        """Decodifica a textura do inimigo (e a versão espelhada) antes da criação das trincheiras."""
+        sprite_variants.preload(Enemy.asset_specs())
 
-    def update(self, player_pos):
+    def update(self, player_pos, step=1.0):
+        """Vira o inimigo para o jogador.
+
+        step é o tempo desde a última atualização, em frames de referência (os
+        inimigos perto da borda da tela recebem o dos passos pulados). Hoje nada
+        aqui depende de tempo; o parâmetro existe para uma IA futura que dependa,
+        como movimento. Os tiros usam o relógio do jogo em can_shoot().
+        """
         # Vira o inimigo para o jogador
         if player_pos[0] > self.pos[0]:
             self.facing_right = True
@@ -48,7 +69,8 @@ class Enemy:
             
         return True
 
-    def shoot(self, target_pos, current_time):
+    def shoot(self, target_pos, current_time, projectiles):
+        """Atira no alvo se possível; o laser é criado no pool `projectiles` e retornado."""
         if not self.can_shoot(current_time):
             return None
 
@@ -60,10 +82,9 @@ class Enemy:
         if distance == 0:
             return None
             
-        direction = [dx/distance, dy/distance]
-        
         # Posição inicial do tiro (centro do inimigo)
-        start_pos = [self.pos[0] + self.size[0]/2, self.pos[1] + self.size[1]/2]
+        start_x = self.pos[0] + self.size[0]/2
+        start_y = self.pos[1] + self.size[1]/2
         
         # Atualiza os contadores
         self.last_shot_time = current_time
@@ -73,17 +94,19 @@ class Enemy:
             self.is_overheated = True
             self.overheat_timer = current_time
             
-        return {
-            'pos': start_pos,
-            'direction': direction,
-            'enemy_laser': True  # Marca que é um laser inimigo
-        }
+        return projectiles.spawn(start_x, start_y, dx/distance, dy/distance,
+                                 Enemy.LASER_SPEED, damage=1, kind='enemy_laser')
+
+    def submit(self, render_queue):
+        """Envia o sprite para a fila de desenho (o corte pela câmera é feito lá)."""
+        # Fallback para um retângulo vermelho se a imagem não carregar
+        image = self.images[self.facing_right] if self.images else solid_surface(self.size, (255, 0, 0))
+        render_queue.submit('enemies', image, self.pos[0], self.pos[1])
 
     def draw(self, screen, camera_offset_x, camera_offset_y):
-        if self.image:
-            image_to_draw = pygame.transform.flip(self.image, not self.facing_right, False)
+        if self.images:
             screen_pos = (int(self.pos[0] + camera_offset_x), int(self.pos[1] + camera_offset_y))
-            screen.blit(image_to_draw, screen_pos)
+            screen.blit(self.images[self.facing_right], screen_pos)
         else:
             # Fallback para um retângulo vermelho se a imagem não carregar
             pygame.draw.rect(screen, (255, 0, 0), 
@@ -3,6 +3,8 @@ import pygame
 import random
 import math
 import sys
+import time
+import numpy as np
 
 # Adiciona o diretório raiz do projeto ao sys.path para resolver importações
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -13,17 +15,61 @@ from game_states.map_manager import MapManager
 from game_states.enemy import Enemy
 from game_states.collectible import Collectible
 from game_states.boss import Boss
+from utils.asset_cache import asset_cache, asset_path, image_path
+from utils.spatial_hash import SpatialHashGrid
+from utils.pools import ProjectilePool, swap_remove
+from utils.sprite_variants import sprite_variants
+from utils.headless import ManualClock
+from utils.replay import RandomStreams, InputRecorder, SEED_MODULUS
+from utils.profiler import profiler
+from utils.text_cache import text_cache
+from utils.background import BackgroundLayers
+from utils.tint_cache import tint_cache
+from utils.render_queue import RenderQueue
 
 class GameplayState:
-    def __init__(self, game_manager, screen_width, screen_height, is_boss_fight=False):
+    # As velocidades, a gravidade e o atrito foram ajustados por frame a 90 FPS;
+    # cada passo da simulação é convertido nessa unidade (step = dt * REFERENCE_FPS)
+    REFERENCE_FPS = 90
+    GROUND_MARGIN = 60  # Distância do chão até a base da tela
+    PLAYER_VISUAL_SIZE = (225, 240)  # Tamanho visual do sprite (ex: 3x o tamanho original)
+    DAMAGE_FLASH_COLOR = (255, 0, 0, 100)  # Vermelho com 100 de alpha, só na silhueta do jogador
+    # Visual de cada tipo de projétil (ver utils/render_queue.ProjectileSprites)
+    PROJECTILE_STYLES = {
+        # Laser do robô normal: Vermelho
+        'enemy_laser': ('laser', (255, 100, 100), (255, 255, 255), 4, 2, 20),
+        # Laser do chefe: Roxo e mais grosso
+        'boss_laser': ('laser', (255, 0, 255), (255, 200, 255), 6, 3, 20),
+    }
+
+    def __init__(self, game_manager, screen_width, screen_height, is_boss_fight=False,
+                 input_source=None, clock=None, seed=None):
         self.game_manager = game_manager
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.is_boss_fight = is_boss_fight
+
+        # --- Modo headless (sem tela) para simular o jogo o mais rápido possível ---
+        # Ligado por init_headless() (asset_cache.headless, veja a propriedade abaixo);
+        # input_source precisa de get_pressed() (padrão: pygame.key) e
+        # clock de get_ticks(); veja utils/headless.py
+        self.input_source = input_source if input_source is not None else pygame.key
+
+        # --- Determinismo: relógio virtual e sementes por partida (veja utils/replay.py) ---
+        # Sem relógio injetado, o tempo do jogo é o tempo simulado, avançado em update()
+        self.owns_clock = clock is None
+        self.clock = clock if clock is not None else ManualClock()
+        # Semente fixa; None = uma semente nova a cada partida. Reduzida ao intervalo
+        # do formato de replay, para a partida e a gravação usarem o mesmo valor
+        self.seed = seed % SEED_MODULUS if seed is not None else None
+        self.run_seed = None
+        self.random_streams = RandomStreams(0)
+        self.jump_requested = False  # Pulo pedido por evento, aplicado no próximo passo
+        self.input_recorder = None
         
         # Configurações do jogador
         self.player_rect_size = (120, 220)  # Hitbox do jogador, um pouco menor para colisões mais permissivas
-        self.player_visual_size = (225, 240)  # Tamanho visual do sprite (ex: 3x o tamanho original)
+        self.player_visual_size = self.PLAYER_VISUAL_SIZE
         self.player_speed = 0.8  # Aceleração do movimento
         self.max_speed = 12  # Velocidade máxima horizontal
         self.friction = 0.85  # Atrito para desaceleração suave
@@ -34,8 +80,12 @@ class GameplayState:
         self.player_velocity_x = 0  # Velocidade horizontal do jogador
         self.is_wall_sliding = False  # Estado de deslizamento na parede
         
-        # --- Plataformas (usado para barricadas) ---
+        # --- Plataformas (usado para barricadas dos chunks carregados) ---
         self.platforms = []
+        # Grades espaciais para a fase ampla das colisões (reconstruídas em reset_player)
+        self.collision_cell_size = 256
+        self.platform_grid = SpatialHashGrid(self.collision_cell_size)
+        self.enemy_grid = SpatialHashGrid(self.collision_cell_size)
         # # Parâmetros de geração de plataformas flutuantes (desativado)
         # self.min_platform_width = 150
         # self.max_platform_width = 300
@@ -47,7 +97,7 @@ class GameplayState:
         # self.last_platform_end_x = 0
         
         # --- NOVO: Chão Fixo ---
-        self.ground_y = self.screen_height - 60
+        self.ground_y = self.screen_height - self.GROUND_MARGIN
         self.ground_color = (139, 69, 19) # Cor de terra
         self.last_floating_platform_y = self.ground_y - 150 # Altura inicial para a primeira plataforma flutuante
         
@@ -82,16 +132,28 @@ class GameplayState:
         
         self.shot_cooldown = 300  # Aumentado para 300ms (era 80ms)
         self.collectibles = []  # Lista de coletáveis
+        self._free_collectibles = []  # Coletáveis já recolhidos, reaproveitados no próximo drop
 
         # Sistema de inimigos e trincheiras
-        self.enemies = []
+        self.enemies = []  # Inimigos dos chunks carregados
         self.enemy_hp = {}
-        self.trenches = []  # Lista de trincheiras (cada uma é um grupo de inimigos)
-        self.trench_positions = [] # Posições X das trincheiras
-        self.enemy_bullets = []  # Lista de tiros dos inimigos
-        self.num_trenches = 2  # Número de trincheiras antes do boss
+        self.enemy_bullets = ProjectilePool(capacity=64)  # Tiros dos inimigos e do chefe
+        self.num_trenches = 2  # Número de trincheiras antes do boss (None = fase infinita, sem chefe)
         self.trench_width = 400  # Largura de cada trincheira
         self.trench_spacing = 3000  # Espaçamento entre trincheiras (valor reduzido)
+        self.trench_offset = 1000  # Posição da trincheira dentro do seu chunk
+        self.enemy_shot_cooldown = Enemy.SHOT_COOLDOWN  # Tempo entre tiros dos inimigos criados por esta partida
+
+        # Ativação dos inimigos pela distância até a tela: na tela atualizam todo passo,
+        # perto da borda a cada `enemy_near_interval` passos e, mais longe, ficam dormentes
+        self.enemy_near_margin = 400  # Pixels além da borda da tela
+        self.enemy_near_interval = 4
+        self.enemy_activity = {'active': 0, 'near': 0, 'dormant': 0}  # Contagem do último passo
+        self.simulation_tick = 0
+
+        # O nível é gerado em chunks (um por trincheira) conforme a câmera avança;
+        # veja MapManager.stream
+        self.map_manager = MapManager(screen_width, screen_height, chunk_width=self.trench_spacing)
         self.game_won = False  # Estado de vitória do jogo
 
         # Boss
@@ -107,149 +169,234 @@ class GameplayState:
         self.loading_timer_start = 0
         self.loading_duration = 3000  # 3 segundos de tela de carregamento
 
-        # Carregando texturas
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
+        self.boss_ship_image = None # Imagem da nave no final da fase
+        self.background = None  # Camadas de fundo (só quando há tela)
+
+        # Texturas e sons: sem tela, carrega já o pouco que a simulação usa; com tela,
+        # as imagens são decodificadas em segundo plano e a partida só começa quando
+        # estiverem prontas (com uma tela de progresso se ainda faltar alguma)
+        self.assets_loaded = False
+        self.waiting_for_assets = False
+        if self.headless:
+            self._init_headless_assets()
+        else:
+            asset_cache.preload_async(self.asset_specs())
+
+        # Sistema de tiro
+        self.bullets = ProjectilePool(capacity=32)
+        self.bullet_speed = 20  # Aumentado para tiros mais rápidos
+        # Dano de um projétil no chefe. Antes ele tirava 10 por frame enquanto atravessava
+        # o chefe (~18 frames a 90 FPS); agora acerta uma vez com o mesmo total
+        self.boss_bullet_damage = 180
+        self.last_shot_time = 0
+        self.shot_cooldown = 80  # Tempo entre tiros ainda menor
+        
+        # --- PONTO DE MODIFICAÇÃO: Posição da ponta da arma ---
+        # Ajuste estes valores para alinhar o tiro perfeitamente com a sua arma.
+        # As coordenadas (x, y) são relativas ao canto superior esquerdo do JOGADOR (player_pos).
+        self.gun_barrel_offset_right = (150,128) # (x, y) quando virado para a direita
+        self.gun_barrel_offset_left = (-10,128)  # (x, y) quando virado para a esquerda
+        
+        # Configurações visuais dos projéteis
+        self.bullet_size = 4  # Tamanho base do projétil
+        self.bullet_trail_length = 3  # Quantidade de partículas de trail
+        self.bullet_image = None
+        try:
+        # Você pode adicionar uma imagem para os tiros aqui
+            # self.bullet_image = pygame.image.load('assets/images/bullet.png').convert_alpha()
+            # self.bullet_image = pygame.transform.scale(self.bullet_image, (16, 16))
+            pass
+        except Exception:
+            print("Usando visual padrão para os projéteis")
+        self.projectile_styles = dict(self.PROJECTILE_STYLES)
+        self.projectile_styles['player_bullet'] = ('bullet', self.bullet_size, self.bullet_trail_length,
+                                                   self.bullet_image is None)
+        # Coletáveis, inimigos e projéteis: cortados pela câmera e desenhados com screen.blits
+        self.render_queue = RenderQueue(('collectibles', 'enemies', 'lasers', 'bullets'))
+        self.aim_direction = [1, 0]  # [x, y] direção padrão (para frente)
         
+        # Inicialização do estado atual do jogador
+        self.player_pos = [100, screen_height - 100]  # Posição inicial temporária
+        self.previous_player_pos = list(self.player_pos)  # Posição no passo anterior (interpolação do desenho)
+        self.previous_camera_x = 0
+        self.player_velocity_y = 0
+        self.is_jumping = False
+        self.facing_right = True
+
+        if self.headless:
+            self._finish_loading()
+
+    @property
+    def headless(self):
+        """Modo sem tela; a única fonte é asset_cache.headless (ligado por init_headless())."""
+        return asset_cache.headless
+
+    def asset_specs(self):
+        """Imagens que este estado usa, no formato (caminho, tamanho, alpha) do cache de assets."""
+        return self.asset_specs_for(self.screen_width, self.screen_height, self.is_boss_fight)
+
+    @classmethod
+    def asset_specs_for(cls, screen_width, screen_height, is_boss_fight=False):
+        """Mesmas imagens de asset_specs(), sem precisar criar o estado (para pré-carregá-las antes)."""
+        specs = [
+            (image_path('nave.png'), (None, screen_height - cls.GROUND_MARGIN), True),
+            (image_path('nave.png'), (screen_width, screen_height), False),
+            (image_path('suit_hearts.png'), (30, 30), True),
+            (image_path('suit_hearts_broken.png'), (30, 30), True),
+            (image_path('municao_simbolo.png'), (40, 40), True),
+            (image_path('fundo_nave.png'), None, False),
+            (image_path('player.png'), cls.PLAYER_VISUAL_SIZE, True),
+        ]
+        if is_boss_fight:
+            specs.append((image_path('fundo_nave.png'), (screen_width, screen_height), False))
+            specs += Boss.asset_specs()
+        else:
+            specs.append((image_path('game_background.png'), (None, screen_height), False))
+        return specs + Enemy.asset_specs() + Collectible.asset_specs()
+
+    def unload(self):
+        """Chamado pelo GameManager antes de descartar o estado (ver GameManager.unload_state)."""
+        self.finish_recording()
+
+    def _finish_loading(self):
+        """Pega as texturas do cache (já decodificadas) e prepara as variantes dos objetos."""
+        # --- NOVO: Carrega a textura da nave-objeto (também define a área de transição) ---
+        try:
+            # Carrega a imagem da nave que o jogador deve alcançar
+            # --- MODIFICADO: A nave agora preenche a altura da tela acima do chão (mantendo a proporção) ---
+            self.boss_ship_image = asset_cache.get_image(image_path('nave.png'), (None, self.ground_y))
+        except Exception as e:
+            print(f"AVISO: Não foi possível carregar a imagem da nave 'nave.png'. A transição ainda funcionará. Erro: {e}")
+
+        if not self.headless:
+            self._load_presentation_assets()
+
+        # Pré-carrega as texturas dos objetos criados durante a partida,
+        # para que gerar trincheiras e drops não precise ler o disco
+        Enemy.preload_assets()
+        Collectible.preload_assets()
+        if self.is_boss_fight:
+            Boss.preload_assets()
+        self.assets_loaded = True
+
+    def _load_presentation_assets(self):
+        """Carrega texturas e sons usados apenas para desenhar e tocar efeitos."""
+        # Carregando texturas (via cache compartilhado entre os estados)
         # --- NOVO: Carregar imagem da tela de carregamento ---
         self.loading_screen_image = None
         try:
             # O usuário pediu para usar 'nave.png' para a tela de carregamento
-            loading_image_path = os.path.join(project_root, 'assets', 'images', 'nave.png')
-            self.loading_screen_image = pygame.image.load(loading_image_path).convert()
-            self.loading_screen_image = pygame.transform.scale(self.loading_screen_image, (self.screen_width, self.screen_height))
+            self.loading_screen_image = asset_cache.get_image(image_path('nave.png'), (self.screen_width, self.screen_height), alpha=False)
         except Exception as e:
             print(f"AVISO: Não foi possível carregar a imagem da tela de carregamento 'nave.png'. Usando tela preta. Erro: {e}")
 
         # Carregar texturas dos corações e munição
         try:
             # Carregar corações
-            self.full_heart_img = pygame.image.load(os.path.join(project_root, 'assets', 'images', 'suit_hearts.png')).convert_alpha()
-            self.empty_heart_img = pygame.image.load(os.path.join(project_root, 'assets', 'images', 'suit_hearts_broken.png')).convert_alpha()
             heart_size = (30, 30)  # Tamanho dos corações na UI
-            self.full_heart_img = pygame.transform.scale(self.full_heart_img, heart_size)
-            self.empty_heart_img = pygame.transform.scale(self.empty_heart_img, heart_size)
+            self.full_heart_img = asset_cache.get_image(image_path('suit_hearts.png'), heart_size)
+            self.empty_heart_img = asset_cache.get_image(image_path('suit_hearts_broken.png'), heart_size)
             
             # Carregar símbolo de munição
-            self.ammo_symbol_img = pygame.image.load(os.path.join(project_root, 'assets', 'images', 'municao_simbolo.png')).convert_alpha()
-            self.ammo_symbol_img = pygame.transform.scale(self.ammo_symbol_img, (40, 40))  # Tamanho do símbolo de munição
+            self.ammo_symbol_img = asset_cache.get_image(image_path('municao_simbolo.png'), (40, 40))  # Tamanho do símbolo de munição
         except Exception as e:
             print(f"Erro ao carregar imagens: {e}")
             self.full_heart_img = None
             self.empty_heart_img = None
             self.ammo_symbol_img = None
-            
-        # Estado inicial do jogador
-        # self.reset_player() # MOVENDO: Esta chamada será movida para o final do __init__
-        
+
         # --- NOVO: Carrega o fundo com base no modo de jogo ---
         if self.is_boss_fight:
             try:
                 # Carrega o fundo da nave para a arena do chefe
-                self.background_image = pygame.image.load(os.path.join(project_root, 'assets', 'images', 'fundo_nave.png')).convert()
-                self.background_image = pygame.transform.scale(self.background_image, (self.screen_width, self.screen_height))
+                self.background_image = asset_cache.get_image(image_path('fundo_nave.png'), (self.screen_width, self.screen_height), alpha=False)
             except Exception as e:
                 print(f"Erro ao carregar fundo_nave.png: {e}")
-                self.background_image = pygame.Surface((screen_width, screen_height))
+                self.background_image = pygame.Surface((self.screen_width, self.screen_height))
                 self.background_image.fill((20, 0, 30)) # Fallback para um roxo escuro
         else:
             # Carrega o fundo normal para a fase de rolagem
             try:
-                self.background_image = pygame.image.load(os.path.join(project_root, 'assets', 'images', 'game_background.png')).convert()
-                
-                original_aspect = self.background_image.get_width() / self.background_image.get_height()
-                new_height = screen_height
-                new_width = int(new_height * original_aspect)
-                
-                self.background_image = pygame.transform.scale(self.background_image, (new_width, new_height))
-                
-                self.background_width = new_width
-                self.background_height = new_height
+                # Mantém a proporção original, com a altura da tela
+                self.background_image = asset_cache.get_image(image_path('game_background.png'), (None, self.screen_height), alpha=False)
+                self.background_width, self.background_height = self.background_image.get_size()
             except Exception as e:
                 print(f"Erro ao carregar game_background.png: {e}")
-                self.background_image = pygame.Surface((screen_width, screen_height))
+                self.background_image = pygame.Surface((self.screen_width, self.screen_height))
                 self.background_image.fill((135, 206, 235))
-                self.background_width = screen_width
-                self.background_height = screen_height
+                self.background_width = self.screen_width
+                self.background_height = self.screen_height
 
-        # --- NOVO: Carrega a textura da nave (fundo da área do chefe e a nave-objeto) ---
-        self.boss_ship_image = None # Imagem da nave no final da fase
+        # --- NOVO: Fundo da nave desenhado por cima durante a transição ---
         try:
-            # Carrega a imagem da nave que o jogador deve alcançar
-            ship_image_path = os.path.join(project_root, 'assets', 'images', 'nave.png')
-            self.boss_ship_image = pygame.image.load(ship_image_path).convert_alpha()
-            # Redimensiona a nave para um tamanho apropriado no jogo (ex: 400px de altura)
-            original_w, original_h = self.boss_ship_image.get_size()
-            aspect_ratio = original_w / original_h if original_h > 0 else 1
-            # --- MODIFICADO: A nave agora preenche a altura da tela acima do chão ---
-            new_h = self.ground_y
-            new_w = int(new_h * aspect_ratio)
-            self.boss_ship_image = pygame.transform.scale(self.boss_ship_image, (new_w, new_h))
-            
-            self.boss_background_image = pygame.image.load(os.path.join(project_root, 'assets', 'images', 'fundo_nave.png')).convert()
+            self.boss_background_image = asset_cache.get_image(image_path('fundo_nave.png'), alpha=False)
         except Exception as e:
-            print(f"AVISO: Não foi possível carregar a imagem da nave 'nave.png' ou 'fundo_nave.png'. A transição ainda funcionará. Erro: {e}")
-            self.boss_background_image = pygame.Surface((screen_width, screen_height))
+            print(f"AVISO: Não foi possível carregar a imagem 'fundo_nave.png'. Erro: {e}")
+            self.boss_background_image = pygame.Surface((self.screen_width, self.screen_height))
             self.boss_background_image.fill((20, 0, 30)) # Fallback para um roxo escuro
+
+        # Fundo com parallax na fase normal, estático na arena do chefe
+        self.background = BackgroundLayers(self.screen_width, self.screen_height)
+        self.background.add_layer(self.background_image, 0 if self.is_boss_fight else 0.5)
             
         # Carrega a textura do player
         try:
-            self.player_image = pygame.image.load(os.path.join(project_root, 'assets', 'images', 'player.png')).convert_alpha()
-            self.player_image = pygame.transform.scale(self.player_image, self.player_visual_size)
+            # Variantes (esquerda, direita) prontas; o desenho só escolhe uma
+            self.player_images = sprite_variants.get(image_path('player.png'), self.player_visual_size)
+            self.player_image = self.player_images[True]
+            tint_cache.preload(self.player_images, self.DAMAGE_FLASH_COLOR)
         except Exception as e:
             print(f"Erro ao carregar player.png: {e}")
+            self.player_images = None
             self.player_image = None
 
-        # Fonte para a tela de carregamento
-        self.loading_font = pygame.font.Font(None, 60)
-        
+        # Superfície do fade da vitória, criada uma vez (o alpha muda a cada frame)
+        self.fade_surface = pygame.Surface((self.screen_width, self.screen_height))
+        self.fade_surface.fill((0, 0, 0))
+
         # --- PONTO DE MODIFICAÇÃO: Carregar som de tiro ---
         # Coloque seu arquivo de som em assets/sounds/laser_shot.wav
         self.shot_sound = None
         try:
             # Para efeitos sonoros, o formato .wav é mais recomendado por ser mais rápido de carregar.
             # Renomeie ou converta seu arquivo 'gun.mp3' para 'laser_shot.wav'.
-            self.shot_sound = pygame.mixer.Sound(os.path.join(project_root, 'assets', 'sounds', 'laser_shot.wav'))
+            self.shot_sound = asset_cache.get_sound(asset_path('sounds', 'laser_shot.wav'))
         except pygame.error as e:
             print(f"AVISO: Não foi possível carregar o som de tiro 'laser_shot.wav'. Verifique se o arquivo existe e está no formato correto. Erro: {e}")
-        
-        # Sistema de tiro
-        self.bullets = []
-        self.bullet_speed = 20  # Aumentado para tiros mais rápidos
-        self.last_shot_time = 0
-        self.shot_cooldown = 80  # Tempo entre tiros ainda menor
-        
-        # --- PONTO DE MODIFICAÇÃO: Posição da ponta da arma ---
-        # Ajuste estes valores para alinhar o tiro perfeitamente com a sua arma.
-        # As coordenadas (x, y) são relativas ao canto superior esquerdo do JOGADOR (player_pos).
-        self.gun_barrel_offset_right = (150,128) # (x, y) quando virado para a direita
-        self.gun_barrel_offset_left = (-10,128)  # (x, y) quando virado para a esquerda
-        
-        # Configurações visuais dos projéteis
-        self.bullet_size = 4  # Tamanho base do projétil
-        self.bullet_trail_length = 3  # Quantidade de partículas de trail
-        self.bullet_image = None
-        try:
-        # Você pode adicionar uma imagem para os tiros aqui
-            # self.bullet_image = pygame.image.load('assets/images/bullet.png').convert_alpha()
-            # self.bullet_image = pygame.transform.scale(self.bullet_image, (16, 16))
-            pass
-        except Exception:
-            print("Usando visual padrão para os projéteis")
-        self.aim_direction = [1, 0]  # [x, y] direção padrão (para frente)
-        
-        # Inicialização do estado atual do jogador
-        self.player_pos = [100, screen_height - 100]  # Posição inicial temporária
-        self.player_velocity_y = 0
-        self.is_jumping = False
-        self.facing_right = True
-        
 
-        
+    def _init_headless_assets(self):
+        """Modo headless: nada é desenhado, então não carrega nem converte texturas."""
+        self.loading_screen_image = None
+        self.full_heart_img = None
+        self.empty_heart_img = None
+        self.ammo_symbol_img = None
+        self.background_image = None
+        self.background_width = self.screen_width
+        self.background_height = self.screen_height
+        self.boss_background_image = None
+        self.background = None
+        self.player_images = None
+        self.player_image = None
+        self.fade_surface = None
+        self.shot_sound = None
+
     def reset_player(self):
         """Reinicia a posição e estado do jogador e gera o mapa inicial."""
+        # --- Nova partida: semente, relógio e gravação da entrada ---
+        self.finish_recording()
+        self.run_seed = self.seed if self.seed is not None else random.randrange(SEED_MODULUS)
+        self.random_streams = RandomStreams(self.run_seed)
+        if self.owns_clock:
+            self.clock.now_ms = 0
+        self.last_shot_time = 0
+        self.jump_requested = False
+        self.simulation_tick = 0
+        if self.game_manager.replay_dir:
+            self.input_recorder = InputRecorder(self.run_seed, (self.screen_width, self.screen_height), self.is_boss_fight)
+
         self.platforms.clear()
-        self.trench_positions.clear()
+        self.platform_grid.clear()
+        self.enemy_grid.clear()
         # self._generate_initial_platforms() # Geração de plataformas flutuantes desativada
         
         # Posiciona o jogador no chão inicial
@@ -264,6 +411,8 @@ class GameplayState:
         self.game_won = False
         self.camera_x = 0
         self.camera_y = 0
+        self.previous_player_pos = list(self.player_pos)
+        self.previous_camera_x = self.camera_x
 
         self.is_fading_to_black = False
         self.fade_alpha = 0
@@ -276,23 +425,32 @@ class GameplayState:
         
         # Limpar e recriar trincheiras e coletáveis
         self.enemies.clear()
-        self.trenches.clear()
+        self.enemy_hp.clear()
         self.enemy_bullets.clear()
+        self.bullets.clear()
+        self._free_collectibles.extend(self.collectibles)
         self.collectibles.clear()
         
         # --- NOVO: Só cria o mapa procedural se não for a arena do chefe ---
         if not self.is_boss_fight:
-            # Criar trincheiras normais
-            for i in range(self.num_trenches):
-                trench_x = 1000 + (i * self.trench_spacing)
-                self.trench_positions.append(trench_x)
-                self._create_trench(trench_x)
-
-            self.boss_area_start_x = 1000 + (self.num_trenches * self.trench_spacing)
-            self._create_boss_area()
+            # As trincheiras são criadas chunk a chunk, pouco antes de aparecerem na tela
+            self.map_manager.start_stream(self.run_seed, self._generate_chunk, self.num_trenches,
+                                          chunk_width=self.trench_spacing)
+            self._stream_chunks()
+
+            if self.num_trenches is not None:
+                self.boss_area_start_x = self.trench_offset + (self.num_trenches * self.trench_spacing)
+                self._create_boss_area()
+            else:
+                self.door_rect = None
+            self._build_background_strip()
         else:
+            self.map_manager.start_stream(self.run_seed, None)
             # Se for a luta contra o chefe, cria o chefe
-            self.boss = Boss(self.screen_width // 2 - 100, self.ground_y - 200) # Posição inicial do chefe
+            self.boss = Boss(self.screen_width // 2 - 100, self.ground_y - 200, clock=self.clock,
+                             rng=self.random_streams.get('boss'),
+                             projectiles=self.enemy_bullets,
+                             arena_size=(self.screen_width, self.screen_height)) # Posição inicial do chefe
             self.boss_group.add(self.boss)
 
     def _create_boss_area(self):
@@ -309,10 +467,71 @@ class GameplayState:
             # Fallback: se a imagem não carregou, usa o gatilho invisível original
             self.door_rect = pygame.Rect(self.boss_area_start_x, 0, 1, self.screen_height)
     
-    def _create_trench(self, x_pos):
-        """Cria uma trincheira com inimigos em posições aleatórias."""
-        num_enemies = random.randint(3, 6)  # Número aleatório de inimigos
-        trench = []
+    def _build_background_strip(self):
+        """Compõe o fundo da nave e a nave do final da fase numa faixa estática do fundo."""
+        if self.background is None:
+            return
+        pieces = []
+        if self.door_rect:
+            if self.boss_background_image:
+                pieces.append((self.boss_background_image, (self.boss_area_start_x, 0)))
+            if self.boss_ship_image:
+                pieces.append((self.boss_ship_image, self.door_rect.topleft))
+        # A transição começa ao encostar na nave: a faixa cobre a nave e mais uma tela
+        strip_width = self.door_rect.width + self.screen_width if self.door_rect else 0
+        self.background.set_static(pieces, strip_width)
+
+    def _generate_chunk(self, index, x, rng, memory):
+        """Conteúdo de um chunk do nível: uma trincheira perto do seu início."""
+        platforms, enemies = self._create_trench(x + self.trench_offset, rng, index, memory['dead'])
+        return {'platforms': platforms, 'enemies': enemies}
+
+    def _stream_chunks(self):
+        """Carrega os chunks que vão aparecer e libera os que ficaram para trás."""
+        view_left = self.camera_x
+        view_right = self.camera_x + self.screen_width
+        loaded, released = self.map_manager.stream(view_left, view_right)
+        for chunk in loaded:
+            for platform in chunk['platforms']:
+                self.platforms.append(platform)
+                self.platform_grid.insert(platform, platform['rect'])
+            for enemy in chunk['enemies']:
+                self.enemies.append(enemy)
+                self.enemy_grid.insert(enemy, enemy.rect)
+                self.enemy_hp[enemy] = 5  # Cada inimigo começa com 5 de vida
+
+        if released:
+            released_platforms = set()
+            released_enemies = set()
+            for chunk in released:
+                for platform in chunk['platforms']:
+                    self.platform_grid.remove(platform)
+                    released_platforms.add(id(platform))
+                for enemy in chunk['enemies']:
+                    self.enemy_grid.remove(enemy)
+                    del self.enemy_hp[enemy]
+                    released_enemies.add(enemy)
+            self.platforms = [p for p in self.platforms if id(p) not in released_platforms]
+            self.enemies = [e for e in self.enemies if e not in released_enemies]
+
+            # Coletáveis esquecidos longe da tela também são liberados
+            unload_left = view_left - self.map_manager.unload_margin
+            unload_right = view_right + self.map_manager.unload_margin
+            i = 0
+            while i < len(self.collectibles):
+                if not unload_left < self.collectibles[i].pos[0] < unload_right:
+                    self._free_collectibles.append(swap_remove(self.collectibles, i))
+                else:
+                    i += 1
+
+    def _create_trench(self, x_pos, rng, chunk_index, dead):
+        """Cria uma trincheira com inimigos em posições aleatórias.
+
+        Retorna (plataformas, inimigos). Os inimigos em `dead` (mortos numa visita
+        anterior ao chunk) são sorteados do mesmo jeito, mas não são criados.
+        """
+        num_enemies = rng.randint(3, 6)  # Número aleatório de inimigos
+        enemies = []
         
         # Criar barricada
         barricade_height = self.player_rect_size[1] * 0.7
@@ -321,35 +540,55 @@ class GameplayState:
             'rect': pygame.Rect(x_pos, self.ground_y - barricade_height, barricade_width, barricade_height),
             'color': (100, 100, 100)  # Cor cinza para barricada
         }
-        self.platforms.append(platform)
         
         # Posicionar inimigos
-        for _ in range(num_enemies):
-            is_flying = random.choice([True, False])
+        for slot in range(num_enemies):
+            is_flying = rng.choice([True, False])
             
             if is_flying:
                 # Posição aleatória no ar
-                enemy_y = random.randint(100, int(self.screen_height * 0.6))
+                enemy_y = rng.randint(100, int(self.screen_height * 0.6))
             else:
                 # Posição no chão atrás da barricada
                 enemy_y = self.ground_y - 140
                 
-            enemy_x = x_pos + random.randint(barricade_width, self.trench_width - 100)
-            enemy = Enemy(enemy_x, enemy_y, is_flying)
-            self.enemies.append(enemy)
-            trench.append(enemy)
-            self.enemy_hp[enemy] = 5  # Cada inimigo começa com 5 de vida
-            
-        self.trenches.append(trench)
+            enemy_x = x_pos + rng.randint(barricade_width, self.trench_width - 100)
+            if slot in dead:
+                continue
+            enemy = Enemy(enemy_x, enemy_y, is_flying, self.enemy_shot_cooldown)
+            enemy.chunk_index = chunk_index
+            enemy.chunk_slot = slot
+            enemies.append(enemy)
+
+        return [platform], enemies
         
     def _spawn_collectible(self, x, y):
         """Cria um coletável com 70% de chance de ser munição e 30% de ser coração."""
-        if random.random() < 0.3:  # 30% de chance para coração
-            collectible = Collectible(x, y, "heart")
+        type_ = "heart" if self.random_streams.get('drops').random() < 0.3 else "ammo"  # 30% de chance para coração
+        if self._free_collectibles:
+            collectible = self._free_collectibles.pop()
+            collectible.reset(x, y, type_)
         else:
-            collectible = Collectible(x, y, "ammo")
+            collectible = Collectible(x, y, type_)
         self.collectibles.append(collectible)
 
+    def request_jump(self):
+        """Pede um pulo; ele é aplicado (e gravado) no próximo passo da simulação."""
+        self.jump_requested = True
+
+    def finish_recording(self):
+        """Salva a gravação da partida atual (se houver) em game_manager.replay_dir."""
+        recorder = self.input_recorder
+        self.input_recorder = None
+        if recorder is None or len(recorder) == 0 or not self.game_manager.replay_dir:
+            return
+        os.makedirs(self.game_manager.replay_dir, exist_ok=True)
+        level = 'chefe' if self.is_boss_fight else 'trincheiras'
+        file_name = f"{time.strftime('%Y%m%d-%H%M%S')}_{level}_{recorder.seed}.gxr"
+        path = os.path.join(self.game_manager.replay_dir, file_name)
+        recorder.save(path)
+        print(f"Replay salvo em {path} ({len(recorder)} passos)")
+
     def game_over(self):
         """Ativa o estado de game over"""
         self.is_game_over = True
@@ -357,37 +596,63 @@ class GameplayState:
     def enter(self):
         """Chamado quando o estado é ativado"""
         print("Entrando no estado de Gameplay!")
+        if not self.assets_loaded and not asset_cache.ready(self.asset_specs()):
+            # As imagens ainda estão sendo decodificadas: mostra o progresso até ficarem prontas
+            self.waiting_for_assets = True
+            return
+        self._start_match()
+
+    def _start_match(self):
+        if not self.assets_loaded:
+            self._finish_loading()
+        self.waiting_for_assets = False
         self.reset_player()
 
     def handle_event(self, event):
+        if self.waiting_for_assets:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.game_manager.set_state('menu')
+            return
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 self.reset_player()  # Reseta o player antes de voltar ao menu
                 self.game_manager.set_state('menu')
             elif event.key == pygame.K_r and self.is_game_over:
                 self.reset_player()  # Reinicia o jogo quando R é pressionado no game over
-            elif (event.key == pygame.K_SPACE or event.key == pygame.K_w or event.key == pygame.K_UP) and (not self.is_jumping or self.is_wall_sliding) and not self.is_game_over:
-                self.player_velocity_y = self.jump_force
-                self.is_jumping = True
-                if self.is_wall_sliding:  # Pulo na parede
-                    # Dar um pequeno impulso horizontal na direção oposta à parede
-                    if self.facing_right:
-                        self.player_velocity_x = -self.max_speed * 0.8
-                    else:
-                        self.player_velocity_x = self.max_speed * 0.8
-                    self.is_wall_sliding = False
+            elif event.key == pygame.K_SPACE or event.key == pygame.K_w or event.key == pygame.K_UP:
+                self.request_jump()
             elif event.key == pygame.K_F11:
-                # Alternar entre fullscreen e windowed
-                if pygame.display.get_surface().get_flags() & pygame.FULLSCREEN:
-                    pygame.display.set_mode((1280, 720))
-                else:
-                    info = pygame.display.Info()
-                    pygame.display.set_mode((info.current_w, info.current_h), pygame.FULLSCREEN)
+                # Alternar entre fullscreen e windowed (na mesma resolução lógica)
+                self.game_manager.toggle_fullscreen()
+
+    def update(self, dt):
+        if self.waiting_for_assets:
+            if asset_cache.ready(self.asset_specs()):
+                self._start_match()
+            return
+
+        # Converte o passo de simulação (segundos) em frames de referência
+        step = dt * self.REFERENCE_FPS
+        if self.owns_clock:
+            self.clock.advance(dt * 1000)
+
+        # Entrada deste passo (gravada em todos os passos, inclusive os pausados)
+        keys = self.input_source.get_pressed()
+        jump_requested = self.jump_requested
+        self.jump_requested = False
+        if self.input_recorder is not None:
+            self.input_recorder.record(keys, jump_requested, dt)
+
+        self.simulation_tick += 1
+
+        # Guarda o estado anterior para interpolar o desenho entre passos
+        self.previous_player_pos[0] = self.player_pos[0]
+        self.previous_player_pos[1] = self.player_pos[1]
+        self.previous_camera_x = self.camera_x
 
-    def update(self):
         # --- NOVO: Lógica de transição e tela de carregamento ---
         if self.loading_screen_active:
-            current_time = pygame.time.get_ticks()
+            current_time = self.clock.get_ticks()
             # Após o tempo definido, muda para o próximo nível (ou menu, por enquanto)
             if current_time - self.loading_timer_start > self.loading_duration:
                 print("Transição concluída! Indo para a arena do chefe.")
@@ -396,15 +661,55 @@ class GameplayState:
 
         if self.is_game_over: # Jogo normal pausado em game over
             return  # Não atualiza a gameplay se estiver em game over
-            
-        keys = pygame.key.get_pressed()
+
+        with profiler.section('input'):
+            self._update_player_input(keys, jump_requested, step)
+        with profiler.section('physics'):
+            player_rect = self._update_player_physics(step)
+        with profiler.section('player_bullets'):
+            self._update_player_bullets(step)
+        with profiler.section('enemies'):
+            self._update_enemies(step)
+        with profiler.section('enemy_bullets'):
+            self._update_enemy_bullets(step, player_rect)
+        with profiler.section('collectibles'):
+            self._update_collectibles(step, player_rect)
+
+        # --- NOVO: Verificar colisão com a porta da nave ---
+        if self.door_rect and not self.loading_screen_active:
+            if player_rect.colliderect(self.door_rect):
+                print("Jogador alcançou a porta! Iniciando transição...")
+                # --- MODIFICADO: Pula o fade e vai direto para a tela de carregamento ---
+                self.loading_screen_active = True
+                self.loading_timer_start = self.clock.get_ticks()
+
+        with profiler.section('camera'):
+            self._update_camera(step)
+            self._stream_chunks()
+
+        if self.player_pos[1] > self.screen_height * 1.5:
+            self.game_over()
+
+    def _update_player_input(self, keys, jump_requested, step):
+        """Pulo, movimento horizontal, mira e tiro a partir das teclas deste passo."""
+        # Pulo (normal ou na parede)
+        if jump_requested and (not self.is_jumping or self.is_wall_sliding):
+            self.player_velocity_y = self.jump_force
+            self.is_jumping = True
+            if self.is_wall_sliding:  # Pulo na parede
+                # Dar um pequeno impulso horizontal na direção oposta à parede
+                if self.facing_right:
+                    self.player_velocity_x = -self.max_speed * 0.8
+                else:
+                    self.player_velocity_x = self.max_speed * 0.8
+                self.is_wall_sliding = False
         
         # Movimento horizontal com WASD e setas com aceleração
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self.player_velocity_x -= self.player_speed
+            self.player_velocity_x -= self.player_speed * step
             self.facing_right = False
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self.player_velocity_x += self.player_speed
+            self.player_velocity_x += self.player_speed * step
             self.facing_right = True
             
         # Limitar velocidade máxima
@@ -412,10 +717,10 @@ class GameplayState:
         
         # Aplicar atrito
         if not (keys[pygame.K_LEFT] or keys[pygame.K_a] or keys[pygame.K_RIGHT] or keys[pygame.K_d]):
-            self.player_velocity_x *= self.friction
+            self.player_velocity_x *= self.friction ** step
             
         # Atualizar posição horizontal
-        self.player_pos[0] += self.player_velocity_x
+        self.player_pos[0] += self.player_velocity_x * step
 
         # --- NOVO: Limitar jogador à tela na arena do chefe ---
         if self.is_boss_fight:
@@ -444,7 +749,7 @@ class GameplayState:
             
         # Sistema de tiro automático
         if keys[pygame.K_x] and self.current_ammo > 0:  # Verifica se X está sendo segurado e tem munição
-            current_time = pygame.time.get_ticks()
+            current_time = self.clock.get_ticks()
             if current_time - self.last_shot_time > self.shot_cooldown:
                 # --- PONTO DE MODIFICAÇÃO: Tocar som de tiro ---
                 # Toca o som do tiro e ajusta o volume de acordo com as configurações
@@ -464,30 +769,28 @@ class GameplayState:
                 # Normalizar a direção do tiro
                 magnitude = (self.aim_direction[0]**2 + self.aim_direction[1]**2)**0.5
                 if magnitude == 0:
-                    normalized_dir = [1 if self.facing_right else -1, 0]
+                    direction_x, direction_y = (1 if self.facing_right else -1), 0
                 else:
-                    normalized_dir = [
-                        self.aim_direction[0] / magnitude,
-                        self.aim_direction[1] / magnitude
-                    ]
-                
-                self.bullets.append({
-                    'pos': [bullet_x, bullet_y],
-                    'direction_x': normalized_dir[0],
-                    'direction_y': normalized_dir[1]
-                })
+                    direction_x = self.aim_direction[0] / magnitude
+                    direction_y = self.aim_direction[1] / magnitude
+
+                self.bullets.spawn(bullet_x, bullet_y, direction_x, direction_y, self.bullet_speed,
+                                   kind='player_bullet', hitbox=self.bullet_size * 2)
                 self.current_ammo -= 1  # Diminui a munição
                 self.last_shot_time = current_time
-            
+
+    def _update_player_physics(self, step):
+        """Aplica a gravidade e resolve as colisões do jogador; retorna a hitbox final."""
         # Aplicar gravidade
-        self.player_velocity_y += self.gravity
-        self.player_pos[1] += self.player_velocity_y
+        self.player_velocity_y += self.gravity * step
+        self.player_pos[1] += self.player_velocity_y * step
         
         player_rect = pygame.Rect(self.player_pos[0], self.player_pos[1], self.player_rect_size[0], self.player_rect_size[1])
         
         # 1. Verificar colisão com as plataformas flutuantes
+        # A margem cobre o deslocamento do jogador ao ser empurrado para fora de uma plataforma
         self.is_wall_sliding = False
-        for platform in self.platforms:
+        for platform in self.platform_grid.query(player_rect.inflate(64, 64)):
             collidable_rect = platform['rect']
             if player_rect.colliderect(collidable_rect):
                 overlap_left = player_rect.right - collidable_rect.left
@@ -529,127 +832,157 @@ class GameplayState:
             self.player_pos[1] = player_rect.y
             self.player_velocity_y = 0
             self.is_jumping = False
-        
-        # Atualizar projéteis do jogador e verificar colisões com inimigos
-        for bullet in self.bullets[:]:
-            bullet['pos'][0] += self.bullet_speed * bullet['direction_x']
-            bullet['pos'][1] += self.bullet_speed * bullet['direction_y']
-
-            bullet_collided = False
-            for enemy in self.enemies[:]:
-                enemy_rect = pygame.Rect(enemy.pos[0], enemy.pos[1], enemy.size[0], enemy.size[1])
-                bullet_rect = pygame.Rect(bullet['pos'][0] - self.bullet_size, bullet['pos'][1] - self.bullet_size, self.bullet_size * 2, self.bullet_size * 2)
-                if enemy_rect.colliderect(bullet_rect):
-                    bullet_collided = True
+
+        return player_rect
+
+    def _update_player_bullets(self, step):
+        # Atualizar projéteis do jogador e verificar colisões com inimigos (vetorizado)
+        bullets = self.bullets
+        if not len(bullets):
+            return
+        bullets.integrate(step)
+        removed = np.zeros(len(bullets), dtype=bool)
+
+        # Só testa os inimigos das células ocupadas pelos projéteis
+        nearby_enemies = self.enemy_grid.query(bullets.area())
+        if nearby_enemies:
+            hits = bullets.overlaps_rects([enemy.rect for enemy in nearby_enemies])
+            # Resolve na ordem de disparo: um inimigo morto não absorve os tiros seguintes
+            for b in np.flatnonzero(hits.any(axis=0)).tolist():
+                for e in np.flatnonzero(hits[:, b]).tolist():
+                    enemy = nearby_enemies[e]
+                    if enemy not in self.enemy_hp:
+                        continue
+                    removed[b] = True
                     self.enemy_hp[enemy] -= 1
                     if self.enemy_hp[enemy] <= 0:
                         self._spawn_collectible(enemy.pos[0], enemy.pos[1])
-                        self.enemies.remove(enemy)
-                        del self.enemy_hp[enemy]
+                        self._remove_dead_enemy(enemy)
                     break
-            
-            if bullet_collided:
-                self.bullets.remove(bullet)
-                continue
 
-            # Check collision with boss
-            if self.is_boss_fight and self.boss:
-                boss_rect = self.boss.rect
-                bullet_rect = pygame.Rect(bullet['pos'][0] - self.bullet_size, bullet['pos'][1] - self.bullet_size, self.bullet_size * 2, self.bullet_size * 2)
-                if boss_rect.colliderect(bullet_rect):
-                    bullet_collided = True
-                    self.boss.health -= 10 # Adjust damage as needed
-                    if self.boss.health <= 0:
-                        print("Boss defeated!")
-                        self.start_victory_sequence()  # Inicia a sequência de vitória
-                    
-            margin = 200
-            camera_view_left = self.camera_x - margin
-            camera_view_right = self.camera_x + self.screen_width + margin
-
-            if not (camera_view_left < bullet['pos'][0] < camera_view_right):
-                self.bullets.remove(bullet)
-            elif bullet['pos'][1] < -margin or bullet['pos'][1] > self.screen_height + margin:
-                self.bullets.remove(bullet)
-
-        # Atualizar inimigos e chefe
-        current_time = pygame.time.get_ticks()
-        for enemy in self.enemies:
-            enemy.update(self.player_pos)
-            bullet = enemy.shoot(self.player_pos, current_time)
-            if bullet:
-                self.enemy_bullets.append(bullet)
+        # Check collision with boss
+        if self.is_boss_fight and self.boss:
+            boss_mask = bullets.overlaps(self.boss.rect) & ~removed
+            boss_hits = int(np.count_nonzero(boss_mask))
+            if boss_hits:
+                # Cada projétil acerta uma vez só (senão o dano dependeria da taxa de passos)
+                removed |= boss_mask
+                self.boss.health -= self.boss_bullet_damage * boss_hits
+                if self.boss.health <= 0:
+                    print("Boss defeated!")
+                    self.start_victory_sequence()  # Inicia a sequência de vitória
+
+        margin = 200
+        removed |= bullets.outside(self.camera_x - margin, -margin,
+                                   self.camera_x + self.screen_width + margin, self.screen_height + margin)
+        bullets.remove(removed)
+
+    def _remove_dead_enemy(self, enemy):
+        """Tira o inimigo do jogo e lembra no chunk que ele morreu."""
+        self.enemies.remove(enemy)
+        self.enemy_grid.remove(enemy)
+        del self.enemy_hp[enemy]
+        self.map_manager.chunk_memory[enemy.chunk_index]['dead'].add(enemy.chunk_slot)
+        self.map_manager.chunks[enemy.chunk_index]['enemies'].remove(enemy)
+
+    def _update_enemies(self, step):
+        # Atualizar inimigos e chefe; os tiros vão direto para o pool de projéteis inimigos
+        # Inimigos de chunks longe da tela ficam suspensos (não se movem nem atiram)
+        current_time = self.clock.get_ticks()
+        view_left = self.camera_x
+        view_right = self.camera_x + self.screen_width
+        near_left = view_left - self.enemy_near_margin
+        near_right = view_right + self.enemy_near_margin
+        active = near = 0
+        near_step = step * self.enemy_near_interval  # Tempo desde a última atualização escalonada
+        for chunk in self.map_manager.active_chunks():
+            for enemy in chunk['enemies']:
+                rect = enemy.rect
+                if rect.right > view_left and rect.left < view_right:
+                    active += 1
+                    enemy_step = step
+                elif rect.right > near_left and rect.left < near_right:
+                    near += 1
+                    # Perto da borda: atualização escalonada entre os inimigos do chunk
+                    # (Enemy.update recebe o tempo dos passos pulados)
+                    if (self.simulation_tick + enemy.chunk_slot) % self.enemy_near_interval:
+                        continue
+                    enemy_step = near_step
+                else:
+                    continue
+                enemy.update(self.player_pos, enemy_step)
+                enemy.shoot(self.player_pos, current_time, self.enemy_bullets)
+
+        activity = self.enemy_activity
+        activity['active'] = active
+        activity['near'] = near
+        activity['dormant'] = len(self.enemies) - active - near
+        profiler.set_counter('inimigos ativos', active)
+        profiler.set_counter('inimigos perto', near)
+        profiler.set_counter('inimigos dormentes', activity['dormant'])
         
         if self.is_boss_fight and self.boss:
-            # O update do chefe agora retorna uma lista de novos projéteis
-            new_boss_bullets = self.boss.update(self.player_pos, current_time, self.player_velocity_x)
-            if new_boss_bullets:
-                self.enemy_bullets.extend(new_boss_bullets)
-
-        # Atualizar projéteis inimigos
-        for bullet in self.enemy_bullets[:]:
-            # --- MODIFICADO: Usa velocidade diferente para chefe e inimigos normais ---
-            speed = 18 if bullet.get('visual_type') == 'boss_laser' else 15
-            bullet['pos'][0] += speed * bullet['direction'][0]
-            bullet['pos'][1] += speed * bullet['direction'][1]
-            
-            bullet_rect = pygame.Rect(bullet['pos'][0] - 5, bullet['pos'][1] - 5, 10, 10)
-
-            # Checar colisão com plataformas
-            bullet_collided = False
-            for platform in self.platforms:
-                if platform['rect'].colliderect(bullet_rect):
-                    self.enemy_bullets.remove(bullet)
-                    bullet_collided = True
-                    break
-            if bullet_collided:
-                continue
+            self.boss.update(self.player_pos, current_time, self.player_velocity_x, step, self.player_rect_size)
 
-            if (bullet['pos'][0] < self.camera_x - 100 or 
-                bullet['pos'][0] > self.camera_x + self.screen_width + 100 or
-                bullet['pos'][1] < -100 or bullet['pos'][1] > self.screen_height + 100):
-                self.enemy_bullets.remove(bullet)
-                continue
-            
-            if bullet_rect.colliderect(player_rect):
-                # --- MODIFICADO: Usa o dano definido no projétil ---
-                damage = bullet.get('damage', 1) # Dano padrão de 1 para robôs normais
-                self.player_hit_points -= damage
-                self.current_health = math.ceil(self.player_hit_points / self.hits_per_heart)
-                self.enemy_bullets.remove(bullet)
-                self.take_damage()  # Ativa o efeito de flash vermelho
-                if self.player_hit_points <= 0:
-                    self.game_over()
-
-        # Atualizar coletáveis
-        for collectible in self.collectibles[:]:
-            collectible.update(self.platforms, self.ground_y)
+    def _update_enemy_bullets(self, step, player_rect):
+        # Atualizar projéteis inimigos (chefe e robôs têm velocidades diferentes; vetorizado)
+        bullets = self.enemy_bullets
+        if not len(bullets):
+            return
+        bullets.integrate(step)
+
+        # Checar colisão com plataformas e descartar os que saíram da tela
+        nearby_platforms = self.platform_grid.query(bullets.area())
+        if nearby_platforms:
+            removed = bullets.overlaps_rects([platform['rect'] for platform in nearby_platforms]).any(axis=0)
+        else:
+            removed = np.zeros(len(bullets), dtype=bool)
+        removed |= bullets.outside(self.camera_x - 100, -100,
+                                   self.camera_x + self.screen_width + 100, self.screen_height + 100)
+
+        hits = bullets.overlaps(player_rect) & ~removed
+        if hits.any():
+            # --- MODIFICADO: Usa o dano definido em cada projétil ---
+            self.player_hit_points -= int(bullets.damages[:len(bullets)][hits].sum())
+            self.current_health = math.ceil(self.player_hit_points / self.hits_per_heart)
+            self.take_damage()  # Ativa o efeito de flash vermelho
+            if self.player_hit_points <= 0:
+                self.game_over()
+            removed |= hits
+        bullets.remove(removed)
+
+    def _update_collectibles(self, step, player_rect):
+        # Atualizar coletáveis (os recolhidos voltam para a lista livre)
+        collectibles = self.collectibles
+        i = 0
+        while i < len(collectibles):
+            collectible = collectibles[i]
+            # Consulta as plataformas ao longo do trecho que o coletável pode percorrer neste frame
+            sweep_height = 2 * (abs(collectible.velocity_y) + collectible.gravity) * step + 2
+            nearby_platforms = self.platform_grid.query(collectible.rect.inflate(0, sweep_height))
+            collectible.update(nearby_platforms, self.ground_y, step)
+            collected = False
             if collectible.rect.colliderect(player_rect):
                 if collectible.type == "heart" and self.player_hit_points < self.max_health * self.hits_per_heart:
                     self.player_hit_points = min(self.player_hit_points + self.hits_per_heart, self.max_health * self.hits_per_heart)
                     self.current_health = math.ceil(self.player_hit_points / self.hits_per_heart)
-                    self.collectibles.remove(collectible)
+                    collected = True
                 elif collectible.type == "ammo":
                     self.current_ammo += 40
-                    self.collectibles.remove(collectible)
-            if collectible.pos[1] > self.screen_height * 2:
-                self.collectibles.remove(collectible)
-
-        # --- NOVO: Verificar colisão com a porta da nave ---
-        if self.door_rect and not self.loading_screen_active:
-            if player_rect.colliderect(self.door_rect):
-                print("Jogador alcançou a porta! Iniciando transição...")
-                # --- MODIFICADO: Pula o fade e vai direto para a tela de carregamento ---
-                self.loading_screen_active = True
-                self.loading_timer_start = pygame.time.get_ticks()
+                    collected = True
+            if collected or collectible.pos[1] > self.screen_height * 2:
+                self._free_collectibles.append(swap_remove(collectibles, i))
+            else:
+                i += 1
 
+    def _update_camera(self, step):
         # --- NOVO: Lógica de câmera e limites do mundo ---
         if not self.is_boss_fight:
             # Lógica da câmera para a fase de rolagem
             player_center_x = self.player_pos[0] + self.player_rect_size[0] / 2
             target_x = player_center_x - self.screen_width / 2
             camera_smoothness_x = 0.1
-            self.camera_x += (target_x - self.camera_x) * camera_smoothness_x
+            self.camera_x += (target_x - self.camera_x) * (1 - (1 - camera_smoothness_x) ** step)
             self.camera_y = 0
             
             # Impede o jogador de voltar para o início do mapa
@@ -657,144 +990,104 @@ class GameplayState:
                 self.player_pos[0] = 200
                 self.player_velocity_x = max(0, self.player_velocity_x)
 
-            if self.camera_x > (len(self.trenches) + 1) * self.trench_spacing:
+            if self.num_trenches is not None and self.camera_x > (self.num_trenches + 1) * self.trench_spacing:
                 self.game_won = True
         else:
             # Na arena do chefe, a câmera é fixa
             self.camera_x = 0
             self.camera_y = 0
-        
-        if self.player_pos[1] > self.screen_height * 1.5:
-            self.game_over()
-
 
     def draw(self, screen):
-        # Limpar a tela para evitar rastros
-        screen.fill((0, 0, 0))
+        if self.waiting_for_assets:
+            screen.fill((0, 0, 0))
+            self._draw_asset_progress(screen)
+            return
+        # O fundo cobre a tela inteira (ou limpa o que não cobre): não precisa de fill antes
         
+        # Interpola câmera e jogador entre os dois últimos passos da simulação
+        # (chefe, coletáveis e projéteis são interpolados em _draw_entities)
+        alpha = self.game_manager.interpolation_alpha
+        camera_x = self.previous_camera_x + (self.camera_x - self.previous_camera_x) * alpha
+        player_x = self.previous_player_pos[0] + (self.player_pos[0] - self.previous_player_pos[0]) * alpha
+        player_y = self.previous_player_pos[1] + (self.player_pos[1] - self.previous_player_pos[1]) * alpha
+
         # Calcular os offsets da câmera
-        camera_offset_x = int(-self.camera_x)
+        camera_offset_x = int(-camera_x)
         camera_offset_y = int(-self.camera_y)
-        
-        # --- NOVO: Lógica de desenho do fundo ---
-        if self.is_boss_fight:
-            # Na arena, desenha um fundo estático
-            screen.blit(self.background_image, (0, 0))
-        else:
-            # Na fase normal, desenha com parallax e transição
-            bg_offset_x = (camera_offset_x * 0.5) % self.background_width
-            bg_x = bg_offset_x
-            if bg_x > 0:
-                screen.blit(self.background_image, (bg_x - self.background_width, 0))
-            screen.blit(self.background_image, (bg_x, 0))
-
-            # Desenha o fundo da nave por cima durante a transição
-            if self.boss_background_image:
-                if self.camera_x + self.screen_width > self.boss_area_start_x:
-                    boss_bg_x = self.boss_area_start_x + camera_offset_x
-                    screen.blit(self.boss_background_image, (boss_bg_x, 0))
 
-        # --- NOVO: Desenha a nave no final da fase ---
-        if self.door_rect and self.boss_ship_image:
-            screen.blit(self.boss_ship_image, (self.door_rect.x + camera_offset_x, self.door_rect.y + camera_offset_y))
+        with profiler.section('background'):
+            self._draw_background(screen, camera_x, camera_offset_x, camera_offset_y)
+        with profiler.section('entities'):
+            self._draw_entities(screen, player_x, player_y, camera_offset_x, camera_offset_y, alpha)
+        with profiler.section('hud'):
+            self._draw_hud(screen)
+
+    def _draw_asset_progress(self, screen):
+        """Tela de progresso enquanto as texturas do estado terminam de ser decodificadas."""
+        progress = asset_cache.progress(self.asset_specs())
+        bar_width, bar_height = self.screen_width // 3, 20
+        bar_rect = pygame.Rect(0, 0, bar_width, bar_height)
+        bar_rect.center = (self.screen_width // 2, self.screen_height // 2 + 40)
+        pygame.draw.rect(screen, (80, 80, 80), bar_rect, 2)
+        fill_rect = bar_rect.inflate(-6, -6)
+        fill_rect.width = int(fill_rect.width * progress)
+        pygame.draw.rect(screen, (255, 255, 255), fill_rect)
+        label = text_cache.render(f"Carregando... {int(progress * 100)}%", 40, (255, 255, 255))
+        screen.blit(label, label.get_rect(center=(self.screen_width // 2, self.screen_height // 2 - 10)))
+
+    def _draw_background(self, screen, camera_x, camera_offset_x, camera_offset_y):
+        """Fundo, nave do final da fase, chão e plataformas."""
+        # Parallax, fundo da nave e a nave do final da fase (só as partes visíveis);
+        # na fase normal, o que fica atrás do chão nem é desenhado
+        ground_draw_y = self.ground_y + camera_offset_y
+        self.background.draw(screen, camera_offset_x, bottom=None if self.is_boss_fight else ground_draw_y)
+        profiler.set_counter('blits do fundo', self.background.blit_count)
 
-        
         # --- NOVO: Desenhar o chão fixo ---
         # Desenha um retângulo para o chão que cobre toda a largura da tela.
         # Como a câmera não se move verticalmente, a posição Y é fixa em relação à tela.
         if not self.is_boss_fight:
-            ground_draw_y = self.ground_y + camera_offset_y
             pygame.draw.rect(screen, self.ground_color, (0, ground_draw_y, screen.get_width(), screen.get_height() - ground_draw_y))
         
         # --- Desenhar plataformas flutuantes ---
         screen_rect = screen.get_rect()
-        for platform in self.platforms:
+        visible_area = screen_rect.move(-camera_offset_x, -camera_offset_y)
+        for platform in self.platform_grid.query(visible_area):
             platform_rect_on_screen = platform['rect'].move(camera_offset_x, camera_offset_y)
             if platform_rect_on_screen.colliderect(screen_rect): # Otimização para desenhar só o visível
                 pygame.draw.rect(screen, platform['color'], platform_rect_on_screen)
-                
-        # Desenhar coletáveis
+
+    def _draw_entities(self, screen, player_x, player_y, camera_offset_x, camera_offset_y, alpha=1.0):
+        """Coletáveis, inimigos, projéteis, jogador e chefe.
+
+        O que se move é desenhado entre o passo anterior e o atual (`alpha`);
+        os inimigos são fixos e não precisam de interpolação.
+        """
+        # Coletáveis, inimigos, lasers inimigos e projéteis vão pela fila de desenho:
+        # só o que aparece na câmera é desenhado, uma chamada blits por camada
+        queue = self.render_queue
+        queue.begin(screen.get_rect().move(-camera_offset_x, -camera_offset_y))
         for collectible in self.collectibles:
-            collectible.draw(screen, camera_offset_x, camera_offset_y)
-            
-        # Desenhar UI - Corações de vida
-        heart_spacing = 35  # Espaçamento entre os corações
-        for i in range(self.max_health):
-            heart_x = 10 + (i * heart_spacing)
-            heart_y = 10
-            if i < self.current_health:
-                screen.blit(self.full_heart_img, (heart_x, heart_y))
-            else:
-                screen.blit(self.empty_heart_img, (heart_x, heart_y))
-                
-        # Desenhar contador de munição no canto superior direito
-        if self.ammo_symbol_img:
-            # Posicionar o símbolo de munição no canto superior direito
-            ammo_symbol_x = self.screen_width - 120
-            ammo_symbol_y = 10
-            screen.blit(self.ammo_symbol_img, (ammo_symbol_x, ammo_symbol_y))
-            
-            # Desenhar o número de balas ao lado do símbolo
-            font = pygame.font.Font(None, 36)
-            ammo_text = str(self.current_ammo)
-            ammo_surface = font.render(ammo_text, True, (255, 255, 255))
-            screen.blit(ammo_surface, (ammo_symbol_x + 50, ammo_symbol_y + 10))
-                
-        # Desenhar inimigos
+            collectible.submit(queue, alpha)
         for enemy in self.enemies:
-            enemy.draw(screen, camera_offset_x, camera_offset_y)
-            
-        # Desenhar lasers inimigos
-        for bullet in self.enemy_bullets:
-            start_pos = (int(bullet['pos'][0] + camera_offset_x), 
-                        int(bullet['pos'][1] + camera_offset_y))
-            end_pos = (int(bullet['pos'][0] - bullet['direction'][0] * 20 + camera_offset_x),
-                      int(bullet['pos'][1] - bullet['direction'][1] * 20 + camera_offset_y))
-            
-            # --- MODIFICADO: Desenha o laser com base no seu tipo ---
-            if bullet.get('visual_type') == 'boss_laser':
-                # Laser do chefe: Roxo e mais grosso
-                glow_color = (255, 0, 255) # Roxo/Magenta
-                core_color = (255, 200, 255)
-                glow_width = 6
-                core_width = 3
-            else:
-                # Laser do robô normal: Vermelho
-                glow_color = (255, 100, 100)
-                core_color = (255, 255, 255)
-                glow_width = 4
-                core_width = 2
-            pygame.draw.line(screen, glow_color, start_pos, end_pos, glow_width)
-            pygame.draw.line(screen, core_color, start_pos, end_pos, core_width)
-        
-        # Desenhar projéteis
-        for bullet in self.bullets:
-            current_x = int(bullet['pos'][0] + camera_offset_x)
-            current_y = int(bullet['pos'][1] + camera_offset_y)
-            
-            # Desenhar trilha do projétil
-            for i in range(self.bullet_trail_length):
-                trail_x = int(current_x - (bullet['direction_x'] * (i * 4)))
-                trail_y = int(current_y - (bullet['direction_y'] * (i * 4)))
-                trail_size = self.bullet_size - (i * 2)
-                if trail_size > 0:
-                    trail_color = (255, 255 - (i * 60), 0)
-                    pygame.draw.circle(screen, trail_color, (trail_x, trail_y), trail_size)
-            
-            # Desenhar o projétil principal
-            if self.bullet_image:
-                screen.blit(self.bullet_image, (current_x - 8, current_y - 8))
-            else:
-                pygame.draw.circle(screen, (255, 255, 200), (current_x, current_y), self.bullet_size + 2)
-                pygame.draw.circle(screen, (255, 255, 0), (current_x, current_y), self.bullet_size)
-        
+            enemy.submit(queue)
+        # Lasers e projéteis com sprites pré-renderizados por ângulo (ver PROJECTILE_STYLES)
+        queue.submit_projectiles('lasers', self.enemy_bullets, self.projectile_styles, alpha=alpha)
+        queue.submit_projectiles('bullets', self.bullets, self.projectile_styles, alpha=alpha)
+        if self.bullet_image:
+            for x, y in self.bullets.interpolated_positions(alpha).tolist():
+                queue.submit('bullets', self.bullet_image, x - 8, y - 8)
+        queue.flush(screen)
+        profiler.set_counter('sprites desenhados', queue.submitted)
+        profiler.set_counter('sprites fora da câmera', queue.culled)
+
         # Desenhar o player
-        player_screen_x = int(self.player_pos[0] + camera_offset_x)
-        player_screen_y = int(self.player_pos[1] + camera_offset_y)
+        player_screen_x = int(player_x + camera_offset_x)
+        player_screen_y = int(player_y + camera_offset_y)
         
         if self.player_image:
             # Virar a imagem horizontalmente se necessário
-            image_to_draw = pygame.transform.flip(self.player_image, not self.facing_right, False)
+            image_to_draw = self.player_images[self.facing_right]
             
             # --- CORREÇÃO: Centraliza a textura visual em relação à hitbox ---
             # O offset X centraliza a imagem horizontalmente.
@@ -802,19 +1095,16 @@ class GameplayState:
             # O offset Y alinha a parte de baixo da imagem com a parte de baixo da hitbox, evitando que o personagem "afunde" no chão.
             visual_offset_y = self.player_visual_size[1] - self.player_rect_size[1]
             
-            # Desenha o jogador
-            screen.blit(image_to_draw, (player_screen_x - visual_offset_x, player_screen_y - visual_offset_y))
-            
-            # Aplica o efeito de flash vermelho se estiver ativo
+            # Efeito de flash vermelho: desenha a variante tingida no lugar do sprite
             if self.is_flashing:
-                current_time = pygame.time.get_ticks()
+                current_time = self.clock.get_ticks()
                 if current_time - self.damage_flash_start <= self.damage_flash_duration:
-                    # Criar uma superfície vermelha do mesmo tamanho da imagem
-                    flash_surface = pygame.Surface(image_to_draw.get_size(), pygame.SRCALPHA)
-                    flash_surface.fill((255, 0, 0, 100))  # Vermelho com 100 de alpha
-                    screen.blit(flash_surface, (player_screen_x - visual_offset_x, player_screen_y - visual_offset_y))
+                    image_to_draw = tint_cache.get(image_to_draw, self.DAMAGE_FLASH_COLOR)
                 else:
                     self.is_flashing = False
+
+            # Desenha o jogador
+            screen.blit(image_to_draw, (player_screen_x - visual_offset_x, player_screen_y - visual_offset_y))
             
             # Desenhar hitbox para debug (comentar em produção)
             # pygame.draw.rect(screen, (255, 0, 0), pygame.Rect(
@@ -835,31 +1125,47 @@ class GameplayState:
 
         # Desenhar o chefe
         if self.is_boss_fight and self.boss:
-            self.boss.draw(screen, camera_offset_x, camera_offset_y)
+            self.boss.draw(screen, camera_offset_x, camera_offset_y, alpha)
+
+    def _draw_hud(self, screen):
+        """Vida, munição e as telas de vitória, game over e carregamento."""
+        # Desenhar UI - Corações de vida
+        heart_spacing = 35  # Espaçamento entre os corações
+        for i in range(self.max_health):
+            heart_x = 10 + (i * heart_spacing)
+            heart_y = 10
+            if i < self.current_health:
+                screen.blit(self.full_heart_img, (heart_x, heart_y))
+            else:
+                screen.blit(self.empty_heart_img, (heart_x, heart_y))
+                
+        # Desenhar contador de munição no canto superior direito
+        if self.ammo_symbol_img:
+            # Posicionar o símbolo de munição no canto superior direito
+            ammo_symbol_x = self.screen_width - 120
+            ammo_symbol_y = 10
+            screen.blit(self.ammo_symbol_img, (ammo_symbol_x, ammo_symbol_y))
+            
+            # Desenhar o número de balas ao lado do símbolo
+            ammo_surface = text_cache.render(str(self.current_ammo), 36, (255, 255, 255))
+            screen.blit(ammo_surface, (ammo_symbol_x + 50, ammo_symbol_y + 10))
 
         # Desenhar HUD
-        font = pygame.font.SysFont(None, 30)
         if self.show_victory_screen:
             # Calcula o progresso do fade (0 a 1)
-            current_time = pygame.time.get_ticks()
+            current_time = self.clock.get_ticks()
             fade_progress = min(1.0, (current_time - self.victory_start_time) / self.victory_fade_duration)
             fade_alpha = int(255 * fade_progress)
             
-            # Criar superfície de fade
-            fade_surface = pygame.Surface((self.screen_width, self.screen_height))
-            fade_surface.fill((0, 0, 0))
-            fade_surface.set_alpha(fade_alpha)
-            screen.blit(fade_surface, (0, 0))
+            # Superfície de fade (preta, criada ao carregar)
+            self.fade_surface.set_alpha(fade_alpha)
+            screen.blit(self.fade_surface, (0, 0))
             
             if fade_progress >= 1.0:  # Fade completo
-                # Fonte para o texto de vitória
-                victory_font = pygame.font.SysFont(None, 100)
-                subtitle_font = pygame.font.SysFont(None, 40)
-                
                 # Textos
-                text_victory = victory_font.render("VITÓRIA!", True, self.victory_text_color)
-                text_congratulations = subtitle_font.render("Parabéns! Você derrotou o Boss!", True, self.victory_text_color)
-                text_press_key = subtitle_font.render("Pressione ENTER para continuar", True, (255, 255, 255))
+                text_victory = text_cache.render("VITÓRIA!", 100, self.victory_text_color)
+                text_congratulations = text_cache.render("Parabéns! Você derrotou o Boss!", 40, self.victory_text_color)
+                text_press_key = text_cache.render("Pressione ENTER para continuar", 40, (255, 255, 255))
                 
                 # Posicionar textos
                 text_victory_rect = text_victory.get_rect(center=(self.screen_width//2, self.screen_height//2 - 50))
@@ -875,16 +1181,15 @@ class GameplayState:
                     int(victory_color[2] * (0.8 + 0.2 * pulse))
                 )
                 
-                text_victory = victory_font.render("VITÓRIA!", True, pulse_color)
+                text_victory = text_cache.render("VITÓRIA!", 100, pulse_color)
                 screen.blit(text_victory, text_victory_rect)
                 screen.blit(text_congratulations, text_congrats_rect)
                 screen.blit(text_press_key, text_press_key_rect)
                 
         elif self.is_game_over:
             # Texto de Game Over
-            game_over_font = pygame.font.SysFont(None, 72)
-            text_game_over = game_over_font.render("GAME OVER", True, (255, 0, 0))
-            text_restart = font.render("Pressione R para reiniciar", True, (255, 255, 255))
+            text_game_over = text_cache.render("GAME OVER", 72, (255, 0, 0))
+            text_restart = text_cache.render("Pressione R para reiniciar", 30, (255, 255, 255))
             
             # Centralizar textos
             text_game_over_rect = text_game_over.get_rect(center=(self.screen_width//2, self.screen_height//2 - 40))
@@ -900,20 +1205,21 @@ class GameplayState:
                 # Fallback para tela preta se a imagem 'nave.png' não for encontrada
                 screen.fill((0, 0, 0))
             # Adiciona um texto "Carregando..." sobre a imagem
-            loading_text = self.loading_font.render("Carregando...", True, (255, 255, 255))
+            loading_text = text_cache.render("Carregando...", 60, (255, 255, 255))
             text_rect = loading_text.get_rect(center=(self.screen_width / 2, self.screen_height - 100))
             screen.blit(loading_text, text_rect)
-            
+
     def take_damage(self):
         """Aplica o efeito visual de dano ao jogador"""
         if not self.is_flashing:  # Só aplica o efeito se não estiver já piscando
             self.is_flashing = True
-            self.damage_flash_start = pygame.time.get_ticks()
+            self.damage_flash_start = self.clock.get_ticks()
             
     def start_victory_sequence(self):
         """Inicia a sequência de vitória"""
         self.game_won = True
         self.show_victory_screen = True
-        self.victory_start_time = pygame.time.get_ticks()
+        self.victory_start_time = self.clock.get_ticks()
         # Para a música atual (se houver)
-        pygame.mixer.music.fadeout(1000)  # Fade out em 1 segundo
\ No newline at end of file
+        if not self.headless:
+            pygame.mixer.music.fadeout(1000)  # Fade out em 1 segundo
\ No newline at end of file
@@ -1,13 +1,28 @@
+import random
 import pygame
 
 class MapManager:
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, chunk_width=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.platforms = []
         self.decorations = []
         self.spawn_points = []
         self.collectibles = []
+
+        # --- Mundo em chunks (faixas verticais de largura fixa) carregados sob demanda ---
+        # chunk_generator(index, x, rng, memory) retorna um dict com 'platforms' e 'enemies'
+        self.chunk_width = chunk_width or screen_width
+        self.chunk_generator = None
+        self.seed = 0
+        self.chunk_count = None  # Número de chunks do nível; None = nível infinito
+        self.chunks = {}  # índice -> chunk carregado
+        self.chunk_memory = {}  # índice -> estado que sobrevive à descarga (ex: inimigos mortos)
+        # Margens além da tela: carrega um pouco antes de o chunk aparecer e só descarrega
+        # bem depois de sair, para não gerar/descartar o mesmo chunk ao ir e voltar
+        self.load_margin = screen_width // 2
+        self.unload_margin = screen_width * 3 // 2
+        self.active_margin = screen_width // 2
         
     def load_map(self, map_id):
         """Carrega um mapa predefinido baseado no ID"""
@@ -40,6 +55,63 @@ class MapManager:
             y = self.screen_height - 90 - (i * 70)  # Reduzido de 100 para 80 de altura entre plataformas
             self.add_platform(x, y, 150, 20)
             
+    def start_stream(self, seed, chunk_generator, chunk_count=None, chunk_width=None):
+        """Prepara o nível em chunks; nada é gerado até a primeira chamada de stream()."""
+        self.seed = seed
+        if chunk_width:
+            self.chunk_width = chunk_width
+        self.chunk_generator = chunk_generator
+        self.chunk_count = chunk_count
+        self.chunks.clear()
+        self.chunk_memory.clear()
+
+    def chunk_index(self, x):
+        return int(x // self.chunk_width)
+
+    def chunk_rng(self, index):
+        """Gerador próprio de cada chunk: o conteúdo não depende da ordem de carregamento."""
+        return random.Random(f"{self.seed}:chunk:{index}")
+
+    def stream(self, view_left, view_right):
+        """Carrega os chunks perto da área visível e descarrega os distantes.
+
+        Retorna (carregados, descarregados) para que o estado atualize as suas
+        grades de colisão. Também marca como 'active' os chunks perto da tela.
+        """
+        loaded, released = [], []
+        if self.chunk_generator is None:
+            return loaded, released
+
+        # Descarrega os chunks que ficaram longe (atrás ou, ao voltar, à frente)
+        for index in list(self.chunks):
+            chunk = self.chunks[index]
+            if chunk['x'] + self.chunk_width < view_left - self.unload_margin or chunk['x'] > view_right + self.unload_margin:
+                released.append(self.chunks.pop(index))
+
+        first = max(0, self.chunk_index(view_left - self.load_margin))
+        last = self.chunk_index(view_right + self.load_margin)
+        if self.chunk_count is not None:
+            last = min(last, self.chunk_count - 1)
+        for index in range(first, last + 1):
+            if index not in self.chunks:
+                x = index * self.chunk_width
+                memory = self.chunk_memory.setdefault(index, {'dead': set()})
+                chunk = self.chunk_generator(index, x, self.chunk_rng(index), memory)
+                chunk['index'] = index
+                chunk['x'] = x
+                self.chunks[index] = chunk
+                loaded.append(chunk)
+
+        # Só os chunks perto da tela atualizam os seus inimigos; os outros ficam suspensos
+        for chunk in self.chunks.values():
+            chunk['active'] = (chunk['x'] < view_right + self.active_margin and
+                               chunk['x'] + self.chunk_width > view_left - self.active_margin)
+        return loaded, released
+
+    def active_chunks(self):
+        """Chunks carregados perto da tela, em ordem de posição."""
+        return [self.chunks[index] for index in sorted(self.chunks) if self.chunks[index]['active']]
+
     def add_platform(self, x, y, width, height, platform_type="normal"):
         """Adiciona uma nova plataforma ao mapa"""
         platform = {
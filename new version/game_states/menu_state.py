@@ -1,12 +1,15 @@
 # game_states/menu_state.py
 
 import pygame
-import sys
 import os
 from utils.button import Button
 from utils.game_manager import TEXTS # Importa o dicionário de textos
+from utils.asset_cache import asset_cache, image_path
+from utils.text_cache import text_cache
 
 class MenuState:
+    NEEDS_UPDATE = False  # update() não faz nada: parado, o loop principal só espera eventos
+
     def __init__(self, game_manager, screen_width, screen_height):
         self.game_manager = game_manager
         self.screen_width = screen_width
@@ -22,31 +25,26 @@ class MenuState:
             # Para música de fundo, o formato .ogg é o mais recomendado para Pygame.
             # Converta seu arquivo 'background_music.mp3' para 'background_music.ogg'.
             self.music_file = os.path.join(project_root, 'assets', 'sounds', 'background_music.ogg')
-            image_path = os.path.join(project_root, 'assets', 'images', 'background_menu.png')
-            self.background_image = pygame.image.load(image_path).convert()
-            self.background_image = pygame.transform.scale(self.background_image, (screen_width, screen_height))
+            background_path = image_path('background_menu.png')
+            self.background_image = asset_cache.get_image(background_path, (screen_width, screen_height), alpha=False)
         except pygame.error as e:
-            print(f"AVISO: Erro ao carregar imagem de fundo '{image_path}': {e}")
+            print(f"AVISO: Erro ao carregar imagem de fundo '{background_path}': {e}")
 
         # --- PONTO DE MODIFICAÇÃO: FONTE E TAMANHO ---
         # Carregue sua fonte personalizada aqui.
         # Coloque sua fonte em assets/fonts/sua_fonte.ttf
-        try:
-            font_path = os.path.join(project_root, 'assets', 'fonts', 'sua_fonte.ttf')
-            self.title_font = pygame.font.Font(font_path, 80)
-            self.button_font = pygame.font.Font(font_path, 40)
-            # verifica se as fontes foram realmente criadas
-            if not hasattr(self.title_font, 'render') or not hasattr(self.button_font, 'render'):
-                raise Exception("Fonte inválida")
-        except Exception as e:
-            # Captura FileNotFoundError, pygame.error e quaisquer outros problemas
-            print(f"AVISO: Fonte personalizada não encontrada ou inválida em '{font_path}'. Usando fonte padrão. Erro: {e}")
-            self.title_font = pygame.font.Font(None, 80)
-            self.button_font = pygame.font.Font(None, 40)
+        # O registro de fontes usa a fonte padrão (com um aviso) se o arquivo não existir.
+        self.font_path = os.path.join(project_root, 'assets', 'fonts', 'sua_fonte.ttf')
+        self.title_font = text_cache.get_font(80, self.font_path)
+        self.button_font = text_cache.get_font(40, self.font_path)
 
         self.buttons = []
         self._create_buttons()
 
+        # Redesenho parcial: a tela inteira só é redesenhada ao entrar no estado
+        # (ou quando a janela pede); depois, apenas os botões que mudaram
+        self.needs_full_redraw = True
+
     def _create_buttons(self):
         # Cores dos botões
         button_base_color = (0,0,0)
@@ -101,10 +99,12 @@ class MenuState:
         self.buttons.append(exit_button)
 
     def _exit_game(self):
-        pygame.quit()
-        sys.exit()
+        # Sai pelo loop principal, que salva o perfil e as gravações antes de fechar
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
 
     def enter(self):
+        self.needs_full_redraw = True
+
         # Inicia a música do menu quando este estado é ativado
         try:
             if self.music_file and os.path.exists(self.music_file):
@@ -115,41 +115,47 @@ class MenuState:
             print(f"Erro ao carregar ou tocar a música do menu: {e}")
 
         # Atualiza o texto dos botões caso o idioma tenha mudado
-        # Tenta renderizar com a fonte configurada; se falhar, usa SysFont como fallback.
         for i, key in enumerate(['start_game', 'settings', 'exit_game']):
-            try:
-                self.buttons[i].text = TEXTS[self.game_manager.language][key]
-                self.buttons[i].text_surface = self.button_font.render(self.buttons[i].text, True, (255, 255, 255))
-                self.buttons[i].text_rect = self.buttons[i].text_surface.get_rect(center=self.buttons[i].rect.center)
-            except Exception:
-                # fallback seguro
-                fallback_font = pygame.font.SysFont(None, 40)
-                self.buttons[i].text = TEXTS[self.game_manager.language][key]
-                self.buttons[i].text_surface = fallback_font.render(self.buttons[i].text, True, (255, 255, 255))
-                self.buttons[i].text_rect = self.buttons[i].text_surface.get_rect(center=self.buttons[i].rect.center)
+            self.buttons[i].text = TEXTS[self.game_manager.language][key]
+            self.buttons[i].text_surface = text_cache.render(self.buttons[i].text, 40, (255, 255, 255), self.font_path)
+            self.buttons[i].text_rect = self.buttons[i].text_surface.get_rect(center=self.buttons[i].rect.center)
 
 
     def handle_event(self, event):
         for button in self.buttons:
             button.handle_event(event)
 
-    def update(self):
+    def update(self, dt):
         pass # Nenhuma lógica de atualização contínua para o menu
 
-    def draw(self, screen):
+    def _draw_background(self, screen, area=None):
+        """Desenha o fundo inteiro ou só o trecho `area` (para apagar um widget)."""
         if self.background_image:
-            screen.blit(self.background_image, (0, 0))
+            if area is None:
+                screen.blit(self.background_image, (0, 0))
+            else:
+                screen.blit(self.background_image, area, area)
         else:
-            screen.fill((0, 0, 0)) # Fundo preto se a imagem não carregar
+            screen.fill((0, 0, 0), area) # Fundo preto se a imagem não carregar
+
+    def draw(self, screen):
+        """Desenha o menu e retorna as áreas alteradas (None = tela inteira)."""
+        if not self.needs_full_redraw:
+            dirty_rects = []
+            for button in self.buttons:
+                if button.needs_redraw():
+                    self._draw_background(screen, button.rect)
+                    dirty_rects.append(button.draw(screen))
+            return dirty_rects
+
+        self.needs_full_redraw = False
+        self._draw_background(screen)
 
         # Desenha o título do jogo
-        try:
-            title_text_surface = self.title_font.render(TEXTS[self.game_manager.language]['game_title'], True, (255, 255, 255))
-        except Exception:
-            title_font_fallback = pygame.font.SysFont(None, 80)
-            title_text_surface = title_font_fallback.render(TEXTS[self.game_manager.language]['game_title'], True, (255, 255, 255))
+        title_text_surface = text_cache.render(TEXTS[self.game_manager.language]['game_title'], 80, (255, 255, 255), self.font_path)
         title_text_rect = title_text_surface.get_rect(center=(self.screen_width // 2, self.screen_height // 4))
         screen.blit(title_text_surface, title_text_rect)
 
         for button in self.buttons:
             button.draw(screen)
+        return None
@@ -1,92 +1,182 @@
 import pygame
-import random
 import math
+import numpy as np
+
+class ParticleGlyphCache:
+    """Sprites de partícula pré-renderizados (círculos com alpha).
+
+    As chaves são (tamanho, cor, alpha) quantizados, então partículas parecidas
+    reaproveitam a mesma Surface e desenhar um lote de partículas vira um único
+    `screen.blits(...)`, sem alocar Surfaces a cada frame.
+    """
+
+    SIZE_STEP = 0.5  # Precisão do raio em pixels
+    ALPHA_STEP = 16  # Níveis de alpha agrupados
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.glyphs = {}
+
+    def get(self, size_step, r, g, b, alpha_step):
+        """Retorna (surface, deslocamento até o centro) para a chave quantizada."""
+        key = (size_step, r, g, b, alpha_step)
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            if len(self.glyphs) >= self.max_entries:
+                self.glyphs.clear()
+            radius = size_step * self.SIZE_STEP
+            alpha = min(255, alpha_step * self.ALPHA_STEP)
+            diameter = max(1, int(math.ceil(radius * 2)))
+            surf = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (r, g, b, alpha), (radius, radius), radius)
+            glyph = (surf, int(radius))
+            self.glyphs[key] = glyph
+        return glyph
+
+
+# Compartilhado por todos os sistemas de partículas
+glyph_cache = ParticleGlyphCache()
 
-class Particle:
-    def __init__(self, x, y, color, velocity, lifetime, size, fade=True, gravity=False):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.initial_color = color
-        self.velocity = velocity
-        self.lifetime = lifetime
-        self.initial_lifetime = lifetime
-        self.size = size
-        self.initial_size = size
-        self.fade = fade
-        self.gravity = gravity
-        
-    def update(self):
-        self.x += self.velocity[0]
-        self.y += self.velocity[1]
-        self.lifetime -= 1
-        
-        if self.gravity:
-            self.velocity[1] += 0.1  # Aplica gravidade
-            
-        if self.fade:
-            # Calcula a opacidade baseada no tempo de vida restante
-            fade_ratio = self.lifetime / self.initial_lifetime
-            if len(self.initial_color) == 4:  # Se tem alpha
-                self.color = (self.initial_color[0], 
-                            self.initial_color[1], 
-                            self.initial_color[2], 
-                            int(self.initial_color[3] * fade_ratio))
-            # Reduz o tamanho gradualmente
-            self.size = self.initial_size * fade_ratio
 
 class ParticleSystem:
-    def __init__(self):
-        self.particles = []
-    
+    """Sistema de partículas em estrutura de arrays (NumPy).
+
+    Posições, velocidades, tempos de vida, tamanhos e cores ficam em arrays
+    pré-alocados com `capacity` posições. As partículas vivas ocupam sempre o
+    início dos arrays, da mais antiga para a mais nova, então:
+    - integração, gravidade, fade e remoção das mortas são operações vetorizadas;
+    - quando a capacidade estoura, as partículas mais antigas são recicladas.
+    """
+
+    GRAVITY = 0.1  # Aceleração vertical das partículas com gravidade
+
+    def __init__(self, capacity=2000):
+        self.capacity = capacity
+        self.count = 0  # Número de partículas vivas
+        self.rng = np.random.default_rng()
+
+        self.positions = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocities = np.zeros((capacity, 2), dtype=np.float32)
+        self.lifetimes = np.zeros(capacity, dtype=np.float32)
+        self.initial_lifetimes = np.ones(capacity, dtype=np.float32)
+        self.sizes = np.zeros(capacity, dtype=np.float32)
+        self.initial_sizes = np.zeros(capacity, dtype=np.float32)
+        self.colors = np.zeros((capacity, 4), dtype=np.uint8)  # RGBA atual
+        self.initial_alphas = np.zeros(capacity, dtype=np.float32)
+        self.has_alpha = np.zeros(capacity, dtype=bool)  # Cor original tinha canal alpha
+        self.has_gravity = np.zeros(capacity, dtype=bool)
+
+        self._arrays = (self.positions, self.velocities, self.lifetimes, self.initial_lifetimes,
+                        self.sizes, self.initial_sizes, self.colors, self.initial_alphas,
+                        self.has_alpha, self.has_gravity)
+
+    def __len__(self):
+        return self.count
+
+    def _emit(self, x, y, vx, vy, lifetimes, sizes, color, gravity=False):
+        """Adiciona um lote de partículas, reciclando as mais antigas se necessário."""
+        n = len(vx)
+        if n == 0:
+            return
+        if n > self.capacity:
+            # Lote maior que o sistema inteiro: fica só com o final do lote
+            x = x[-self.capacity:] if np.ndim(x) else x
+            y = y[-self.capacity:] if np.ndim(y) else y
+            vx, vy = vx[-self.capacity:], vy[-self.capacity:]
+            lifetimes, sizes = lifetimes[-self.capacity:], sizes[-self.capacity:]
+            n = self.capacity
+
+        overflow = self.count + n - self.capacity
+        if overflow > 0:
+            # Descarta as mais antigas deslocando as restantes para o início
+            keep = self.count - overflow
+            for array in self._arrays:
+                array[:keep] = array[overflow:self.count]
+            self.count = keep
+
+        start, end = self.count, self.count + n
+        self.positions[start:end, 0] = x
+        self.positions[start:end, 1] = y
+        self.velocities[start:end, 0] = vx
+        self.velocities[start:end, 1] = vy
+        self.lifetimes[start:end] = lifetimes
+        self.initial_lifetimes[start:end] = lifetimes
+        self.sizes[start:end] = sizes
+        self.initial_sizes[start:end] = sizes
+        alpha = color[3] if len(color) == 4 else 255
+        self.colors[start:end] = (color[0], color[1], color[2], alpha)
+        self.initial_alphas[start:end] = alpha
+        self.has_alpha[start:end] = len(color) == 4
+        self.has_gravity[start:end] = gravity
+        self.count = end
+
     def create_explosion(self, x, y, color, num_particles=20):
-        for _ in range(num_particles):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            velocity = [math.cos(angle) * speed, math.sin(angle) * speed]
-            lifetime = random.randint(20, 40)
-            size = random.uniform(2, 4)
-            particle = Particle(x, y, color, velocity, lifetime, size)
-            self.particles.append(particle)
-    
+        angles = self.rng.uniform(0, 2 * math.pi, num_particles)
+        speeds = self.rng.uniform(2, 5, num_particles)
+        lifetimes = self.rng.integers(20, 41, num_particles)
+        sizes = self.rng.uniform(2, 4, num_particles)
+        self._emit(x, y, np.cos(angles) * speeds, np.sin(angles) * speeds, lifetimes, sizes, color)
+
     def create_trail(self, x, y, color, direction, num_particles=5):
-        for _ in range(num_particles):
-            offset_x = random.uniform(-5, 5)
-            offset_y = random.uniform(-5, 5)
-            velocity = [-direction[0] * random.uniform(1, 3),
-                       -direction[1] * random.uniform(1, 3)]
-            lifetime = random.randint(10, 20)
-            size = random.uniform(2, 4)
-            particle = Particle(x + offset_x, y + offset_y, color, velocity, lifetime, size)
-            self.particles.append(particle)
-    
+        offsets_x = self.rng.uniform(-5, 5, num_particles)
+        offsets_y = self.rng.uniform(-5, 5, num_particles)
+        vx = -direction[0] * self.rng.uniform(1, 3, num_particles)
+        vy = -direction[1] * self.rng.uniform(1, 3, num_particles)
+        lifetimes = self.rng.integers(10, 21, num_particles)
+        sizes = self.rng.uniform(2, 4, num_particles)
+        self._emit(x + offsets_x, y + offsets_y, vx, vy, lifetimes, sizes, color)
+
     def create_impact(self, x, y, color, direction, num_particles=15):
         angle_spread = math.pi / 4  # 45 graus para cada lado
         base_angle = math.atan2(direction[1], direction[0])
-        
-        for _ in range(num_particles):
-            angle = base_angle + random.uniform(-angle_spread, angle_spread)
-            speed = random.uniform(3, 7)
-            velocity = [math.cos(angle) * speed, math.sin(angle) * speed]
-            lifetime = random.randint(15, 30)
-            size = random.uniform(2, 5)
-            particle = Particle(x, y, color, velocity, lifetime, size, gravity=True)
-            self.particles.append(particle)
-    
-    def update(self):
-        for particle in self.particles[:]:
-            particle.update()
-            if particle.lifetime <= 0:
-                self.particles.remove(particle)
-    
+        angles = base_angle + self.rng.uniform(-angle_spread, angle_spread, num_particles)
+        speeds = self.rng.uniform(3, 7, num_particles)
+        lifetimes = self.rng.integers(15, 31, num_particles)
+        sizes = self.rng.uniform(2, 5, num_particles)
+        self._emit(x, y, np.cos(angles) * speeds, np.sin(angles) * speeds, lifetimes, sizes, color, gravity=True)
+
+    def update(self, step=1.0):
+        """Avança as partículas; step é o passo da simulação em frames de referência."""
+        n = self.count
+        if n == 0:
+            return
+
+        # Integração e gravidade
+        self.positions[:n] += self.velocities[:n] * step
+        self.lifetimes[:n] -= step
+        self.velocities[:n, 1] += self.has_gravity[:n] * (self.GRAVITY * step)
+
+        # Fade: tamanho e alpha proporcionais ao tempo de vida restante
+        fade_ratio = self.lifetimes[:n] / self.initial_lifetimes[:n]
+        self.sizes[:n] = self.initial_sizes[:n] * fade_ratio
+        faded_alpha = (self.initial_alphas[:n] * np.clip(fade_ratio, 0, 1)).astype(np.uint8)
+        self.colors[:n, 3] = np.where(self.has_alpha[:n], faded_alpha, self.colors[:n, 3])
+
+        # Compactação: mantém as vivas no início dos arrays, preservando a ordem
+        alive = self.lifetimes[:n] > 0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count != n:
+            for array in self._arrays:
+                array[:alive_count] = array[:n][alive]
+            self.count = alive_count
+
     def draw(self, screen, camera_offset_x=0, camera_offset_y=0):
-        for particle in self.particles:
-            screen_x = int(particle.x + camera_offset_x)
-            screen_y = int(particle.y + camera_offset_y)
-            
-            if len(particle.color) == 4:  # Se tem canal alpha
-                surf = pygame.Surface((particle.size * 2, particle.size * 2), pygame.SRCALPHA)
-                pygame.draw.circle(surf, particle.color, (particle.size, particle.size), particle.size)
-                screen.blit(surf, (screen_x - particle.size, screen_y - particle.size))
-            else:
-                pygame.draw.circle(screen, particle.color, (screen_x, screen_y), particle.size)
\ No newline at end of file
+        n = self.count
+        if n == 0:
+            return
+        xs = (self.positions[:n, 0] + camera_offset_x).astype(np.int32).tolist()
+        ys = (self.positions[:n, 1] + camera_offset_y).astype(np.int32).tolist()
+        # Quantiza tamanho e alpha para reaproveitar os sprites do cache
+        size_steps = np.rint(self.sizes[:n] / ParticleGlyphCache.SIZE_STEP).astype(np.int32).tolist()
+        alpha_steps = np.rint(self.colors[:n, 3] / ParticleGlyphCache.ALPHA_STEP).astype(np.int32).tolist()
+        colors = self.colors[:n, :3].tolist()
+
+        get_glyph = glyph_cache.get
+        batch = []
+        for screen_x, screen_y, size_step, color, alpha_step in zip(xs, ys, size_steps, colors, alpha_steps):
+            if size_step <= 0 or alpha_step <= 0:
+                continue
+            surf, offset = get_glyph(size_step, color[0], color[1], color[2], alpha_step)
+            batch.append((surf, (screen_x - offset, screen_y - offset)))
+        if batch:
+            screen.blits(batch, doreturn=False)
@@ -9,16 +9,21 @@ sys.path.insert(0, project_root)
 
 import pygame
 from utils.game_manager import TEXTS
+from utils.display import QUALITY_PRESETS
+from utils.text_cache import text_cache
 
 class SettingsState:
+    NEEDS_UPDATE = False  # update() não faz nada: parado, o loop principal só espera eventos
+
     def __init__(self, game_manager, screen_width, screen_height):
         self.game_manager = game_manager
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.font = pygame.font.Font(None, 74)
-        self.small_font = pygame.font.Font(None, 50)
-        self.lang_font = pygame.font.Font(None, 45)
-        self.credits_font = pygame.font.Font(None, 32)
+        # Tamanhos das fontes (as fontes e os textos vêm do text_cache)
+        self.font_size = 74
+        self.small_font_size = 50
+        self.lang_font_size = 45
+        self.credits_font_size = 32
 
         # --- Elementos da UI ---
         # As superfícies e rects serão inicializados/atualizados em _setup_ui()
@@ -27,6 +32,8 @@ class SettingsState:
         self.volume_label_surface = None
         self.language_label_surface = None
         self.credits_label_surface = None
+        self.quality_label_surface = None
+        self.quality_options = []  # (qualidade, surface, rect) de cada opção
 
         self.back_button_text = None
         self.back_button_rect = None
@@ -37,11 +44,20 @@ class SettingsState:
         self.credits_text_surfaces = []
 
         # Slider de Volume
-        self.volume_slider_rect = pygame.Rect(self.screen_width / 2 - 150, self.screen_height / 2 - 100, 300, 20)
+        self.volume_slider_rect = pygame.Rect(self.screen_width / 2 - 150, self.screen_height / 2 - 140, 300, 20)
         self.volume_handle_rect = pygame.Rect(0, 0, 30, 40)
         self.dragging_handle = False
+        # Área redesenhada quando só o volume muda: a barra mais o handle nas duas pontas
+        self.volume_area_rect = self.volume_slider_rect.inflate(self.volume_handle_rect.width + 4,
+                                                                self.volume_handle_rect.height - self.volume_slider_rect.height + 4)
+
+        # Redesenho parcial: a tela inteira só é redesenhada ao entrar, ao trocar o
+        # idioma ou quando a janela pede; o slider é redesenhado sozinho
+        self.needs_full_redraw = True
+        self.drawn_volume = None
 
         # Cores
+        self.background_color = (0, 0, 52)
         self.text_color = (220, 220, 255)
         self.selected_lang_color = (0,0,255)  # Azul para idioma selecionado
         self.unselected_lang_color = (255, 255, 255) # Branco para não selecionado
@@ -55,45 +71,57 @@ class SettingsState:
     def _setup_ui(self):
         """Cria ou atualiza todos os elementos de texto da UI com base no idioma atual."""
         lang = self.game_manager.language
+        self.needs_full_redraw = True
 
         # Título
         title_text = TEXTS[lang]['settings']
-        self.title_surface = self.font.render(title_text, True, self.text_color)
+        self.title_surface = text_cache.render(title_text, self.font_size, self.text_color)
         self.title_rect = self.title_surface.get_rect(center=(self.screen_width / 2, 120))
 
         # Label do Volume
         volume_label_text = TEXTS[lang]['volume']
-        self.volume_label_surface = self.small_font.render(volume_label_text, True, self.text_color)
+        self.volume_label_surface = text_cache.render(volume_label_text, self.small_font_size, self.text_color)
+
+        # Qualidade: a resolução em que o jogo é desenhado antes de ser ampliado até o monitor
+        self.quality_label_surface = text_cache.render(TEXTS[lang]['quality'], self.small_font_size, self.text_color)
+        self.quality_options = []
+        option_left = self.screen_width / 2 - 150
+        for quality, (width, height) in QUALITY_PRESETS.items():
+            color = self.selected_lang_color if quality == self.game_manager.quality else self.unselected_lang_color
+            surface = text_cache.render(f"{TEXTS[lang]['quality_' + quality]} ({height}p)", self.lang_font_size, color)
+            rect = surface.get_rect(midleft=(option_left, self.screen_height / 2 - 60))
+            self.quality_options.append((quality, surface, rect))
+            option_left = rect.right + 30
 
         # Label do Idioma
         language_label_text = TEXTS[lang]['language']
-        self.language_label_surface = self.small_font.render(language_label_text, True, self.text_color)
+        self.language_label_surface = text_cache.render(language_label_text, self.small_font_size, self.text_color)
 
         # Botões de Idioma
         pt_color = self.selected_lang_color if lang == 'pt' else self.unselected_lang_color
         en_color = self.selected_lang_color if lang == 'en' else self.unselected_lang_color
 
-        self.lang_pt_surface = self.lang_font.render("Português (Brasil)", True, pt_color)
-        self.lang_pt_rect = self.lang_pt_surface.get_rect(midleft=(self.screen_width / 2 - 150, self.screen_height / 2))
+        self.lang_pt_surface = text_cache.render("Português (Brasil)", self.lang_font_size, pt_color)
+        self.lang_pt_rect = self.lang_pt_surface.get_rect(midleft=(self.screen_width / 2 - 150, self.screen_height / 2 + 20))
 
-        self.lang_en_surface = self.lang_font.render("English", True, en_color)
-        self.lang_en_rect = self.lang_en_surface.get_rect(midleft=(self.lang_pt_rect.right + 30, self.screen_height / 2))
+        self.lang_en_surface = text_cache.render("English", self.lang_font_size, en_color)
+        self.lang_en_rect = self.lang_en_surface.get_rect(midleft=(self.lang_pt_rect.right + 30, self.screen_height / 2 + 20))
 
         # --- NOVO: CRÉDITOS ---
         # Label dos Créditos
         credits_label_text = TEXTS[lang]['credits']
-        self.credits_label_surface = self.small_font.render(credits_label_text, True, self.text_color)
+        self.credits_label_surface = text_cache.render(credits_label_text, self.small_font_size, self.text_color)
 
         # Texto dos Créditos (multi-linha)
         self.credits_text_surfaces.clear()
         credits_full_text = TEXTS[lang]['credits_text']
         for line in credits_full_text.split('\n'):
-            line_surface = self.credits_font.render(line, True, self.text_color)
+            line_surface = text_cache.render(line, self.credits_font_size, self.text_color)
             self.credits_text_surfaces.append(line_surface)
 
         # Botão Voltar
         back_text_str = TEXTS[lang]['back']
-        self.back_button_text = self.small_font.render(back_text_str, True, self.text_color)
+        self.back_button_text = text_cache.render(back_text_str, self.small_font_size, self.text_color)
         self.back_button_rect = self.back_button_text.get_rect(center=(self.screen_width / 2, self.screen_height - 120))
 
     def handle_event(self, event):
@@ -111,6 +139,11 @@ class SettingsState:
                     self.game_manager.set_language('en')
                     self._setup_ui()  # Atualiza a UI com o novo idioma
 
+                # A tela e os estados são recriados pelo loop principal na nova resolução
+                for quality, _, rect in self.quality_options:
+                    if rect.collidepoint(event.pos):
+                        self.game_manager.set_quality(quality)
+
                 if self.volume_handle_rect.collidepoint(event.pos):
                     self.dragging_handle = True
                 elif self.volume_slider_rect.collidepoint(event.pos):
@@ -139,12 +172,26 @@ class SettingsState:
         handle_x = self.volume_slider_rect.left + (self.game_manager.volume * self.volume_slider_rect.width)
         self.volume_handle_rect.center = (handle_x, self.volume_slider_rect.centery)
 
-    def update(self):
+    def update(self, dt):
         """Lógica de atualização do estado (ex: animações)."""
         pass
 
+    def _draw_volume_slider(self, screen):
+        pygame.draw.rect(screen, (50, 50, 80), self.volume_slider_rect, border_radius=10)  # Barra
+        pygame.draw.rect(screen, (180, 180, 255), self.volume_handle_rect, border_radius=8) # Handle
+        self.drawn_volume = self.game_manager.volume
+
     def draw(self, screen):
-        screen.fill((0,0,52))  # Fundo azul escuro
+        """Desenha os ajustes e retorna as áreas alteradas (None = tela inteira)."""
+        if not self.needs_full_redraw:
+            if self.game_manager.volume == self.drawn_volume:
+                return []
+            screen.fill(self.background_color, self.volume_area_rect)
+            self._draw_volume_slider(screen)
+            return [self.volume_area_rect]
+
+        self.needs_full_redraw = False
+        screen.fill(self.background_color)  # Fundo azul escuro
 
         # Título
         screen.blit(self.title_surface, self.title_rect)
@@ -154,8 +201,13 @@ class SettingsState:
         screen.blit(self.volume_label_surface, volume_label_rect)
 
         # Slider de Volume
-        pygame.draw.rect(screen, (50, 50, 80), self.volume_slider_rect, border_radius=10)  # Barra
-        pygame.draw.rect(screen, (180, 180, 255), self.volume_handle_rect, border_radius=8) # Handle
+        self._draw_volume_slider(screen)
+
+        # Opções de qualidade
+        quality_label_rect = self.quality_label_surface.get_rect(midright=(self.screen_width / 2 - 170, self.screen_height / 2 - 60))
+        screen.blit(self.quality_label_surface, quality_label_rect)
+        for _, surface, rect in self.quality_options:
+            screen.blit(surface, rect)
 
         # Label do Idioma
         language_label_rect = self.language_label_surface.get_rect(midright=(self.lang_pt_rect.left - 20, self.lang_pt_rect.centery))
@@ -175,7 +227,7 @@ class SettingsState:
 
         # Texto dos Créditos (multi-linha)
         line_y = credits_y_start + 50
-        line_height = self.credits_font.get_height() + 5
+        line_height = text_cache.get_font(self.credits_font_size).get_height() + 5
         for line_surface in self.credits_text_surfaces:
             line_rect = line_surface.get_rect(center=(self.screen_width / 2, line_y))
             screen.blit(line_surface, line_rect)
@@ -183,4 +235,5 @@ class SettingsState:
 
         # Botão Voltar
         if self.back_button_text:
-            screen.blit(self.back_button_text, self.back_button_rect)
\ No newline at end of file
+            screen.blit(self.back_button_text, self.back_button_rect)
+        return None
\ No newline at end of file
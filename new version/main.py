@@ -1,55 +1,154 @@
 # main.pyc
 # pyright: ignore[reportMissingImports]
 import pygame
+import os
 import sys
+import time
 from utils.game_manager import GameManager
 from game_states.menu_state import MenuState
 from game_states.cutscene_state import CutsceneState
 from game_states.gameplay_state import GameplayState
 from game_states.settings_state import SettingsState
+from utils.asset_cache import asset_cache
+from utils.profiler import profiler
+from utils.display import Display, QUALITY_PRESETS
 
 # --- CONFIGURAÇÕES DA TELA ---
-FPS = 90 # Frames por segundo
+FPS = 90 # Limite de frames desenhados por segundo (0 = sem limite)
+# O jogo é desenhado numa resolução lógica fixa (a opção de qualidade nos Ajustes,
+# ver utils/display.py) e ampliado uma única vez até a resolução do monitor
+
+# --- CONFIGURAÇÕES DA SIMULAÇÃO ---
+# A lógica roda em passos fixos, independente da taxa de desenho
+SIMULATION_HZ = 120
+SIMULATION_DT = 1.0 / SIMULATION_HZ
+MAX_FRAME_TIME = 0.25 # Limita o atraso acumulado para evitar a "espiral da morte"
+# Menus parados (nada para atualizar nem redesenhar) esperam eventos por até este tempo (ms)
+IDLE_WAIT_MS = 250
+
+# --- ESTADOS ---
+# Estados criados sob demanda são descartados após este tempo (s) sem visita
+UNLOAD_IDLE_AFTER = 300
+
+# --- PROFILER ---
+# F3 liga/desliga o overlay de tempos; ao sair, os frames medidos vão para um CSV
+PROFILE_DIR = 'profiles'
+
+def add_states(game_manager, SCREEN_WIDTH, SCREEN_HEIGHT):
+    """Registra os estados do jogo para a resolução lógica dada."""
+    # Os estados das fases e dos ajustes só são criados quando visitados pela primeira
+    # vez; as texturas deles já começam a ser decodificadas em segundo plano
+    game_manager.add_state('menu', MenuState(game_manager, SCREEN_WIDTH, SCREEN_HEIGHT))
+    game_manager.add_state('cutscene', CutsceneState(game_manager, SCREEN_WIDTH, SCREEN_HEIGHT))
+    game_manager.add_state('gameplay', factory=lambda: GameplayState(game_manager, SCREEN_WIDTH, SCREEN_HEIGHT),
+                           assets=GameplayState.asset_specs_for(SCREEN_WIDTH, SCREEN_HEIGHT))
+    game_manager.add_state('settings', factory=lambda: SettingsState(game_manager, SCREEN_WIDTH, SCREEN_HEIGHT))
+    game_manager.add_state('boss_fight', factory=lambda: GameplayState(game_manager, SCREEN_WIDTH, SCREEN_HEIGHT, is_boss_fight=True),
+                           assets=GameplayState.asset_specs_for(SCREEN_WIDTH, SCREEN_HEIGHT, is_boss_fight=True)) # Estado para a luta contra o chefe
+    # Os estados pré-carregam suas texturas no cache compartilhado
+    print(f"Cache de assets após o carregamento: {asset_cache.stats()}")
+
+def apply_display_change(game_manager, display):
+    """Reabre a tela após trocar a qualidade ou o modo tela cheia; retorna a nova Surface."""
+    game_manager.display_changed = False
+    logical_size = QUALITY_PRESETS[game_manager.quality]
+    if logical_size == display.logical_size:
+        # Mesma resolução lógica: os estados continuam valendo
+        screen = display.open(logical_size, game_manager.fullscreen)
+    else:
+        # As texturas foram escaladas para a resolução antiga: recria os estados
+        state_name = game_manager.current_state_name
+        game_manager.clear_states()
+        screen = display.open(logical_size, game_manager.fullscreen)
+        add_states(game_manager, *logical_size)
+        game_manager.set_state(state_name)
+    game_manager.invalidate_screen()
+    return screen
 
 def main():
     pygame.init()
     pygame.mixer.init() # Inicializa o mixer para áudio
 
-    # Obtém a resolução do monitor
-    info = pygame.display.Info()
-    SCREEN_WIDTH = info.current_w
-    SCREEN_HEIGHT = info.current_h
+    game_manager = GameManager()
+    # Grava a entrada das partidas para reprodução: python main.py --record replays
+    if '--record' in sys.argv[1:-1]:
+        game_manager.replay_dir = sys.argv[sys.argv.index('--record') + 1]
+    # Mede desde o primeiro frame: python main.py --profile
+    if '--profile' in sys.argv[1:]:
+        profiler.enabled = True
 
-    # Configura tela cheia
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
+    # Configura tela cheia na resolução lógica da qualidade escolhida
+    display = Display()
+    screen = display.open(QUALITY_PRESETS[game_manager.quality], game_manager.fullscreen)
     pygame.display.set_caption("Guerra Intergalatica") # Título da janela do jogo
 
-    game_manager = GameManager()
-
     # Adiciona os estados ao gerenciador
-    game_manager.add_state('menu', MenuState(game_manager, SCREEN_WIDTH, SCREEN_HEIGHT))
-    game_manager.add_state('cutscene', CutsceneState(game_manager, SCREEN_WIDTH, SCREEN_HEIGHT))
-    game_manager.add_state('gameplay', GameplayState(game_manager, SCREEN_WIDTH, SCREEN_HEIGHT))
-    game_manager.add_state('settings', SettingsState(game_manager, SCREEN_WIDTH, SCREEN_HEIGHT))
-    game_manager.add_state('boss_fight', GameplayState(game_manager, SCREEN_WIDTH, SCREEN_HEIGHT, is_boss_fight=True)) # Estado para a luta contra o chefe
+    add_states(game_manager, *QUALITY_PRESETS[game_manager.quality])
+    game_manager.unload_idle_after = UNLOAD_IDLE_AFTER
+
     # Define o estado inicial do jogo
     game_manager.set_state('menu')
 
     clock = pygame.time.Clock()
     running = True
+    accumulator = 0.0
+    previous_time = time.perf_counter()
+    waiting_event = None # Evento que acordou a espera de um menu parado
 
     while running:
-        for event in pygame.event.get():
+        profiler.begin_frame()
+        now = time.perf_counter()
+        frame_time = min(now - previous_time, MAX_FRAME_TIME)
+        previous_time = now
+        accumulator += frame_time
+
+        events = pygame.event.get()
+        if waiting_event is not None:
+            events.insert(0, waiting_event)
+            waiting_event = None
+        for event in events:
+            event = display.to_logical(event) # Mouse em coordenadas da resolução lógica
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle()
+                game_manager.invalidate_screen() # Apaga o overlay nas telas com redesenho parcial
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                game_manager.invalidate_screen() # A janela perdeu o conteúdo e precisa ser redesenhada
             game_manager.handle_event(event) # Passa o evento para o estado atual
+        if game_manager.display_changed:
+            screen = apply_display_change(game_manager, display)
+
+        asset_cache.pump() # Guarda as imagens que a thread de carregamento já decodificou
+
+        # Avança a simulação em passos fixos pelo tempo que passou desde o último frame
+        while accumulator >= SIMULATION_DT:
+            game_manager.update(SIMULATION_DT) # Atualiza a lógica do estado atual
+            accumulator -= SIMULATION_DT
 
-        game_manager.update() # Atualiza a lógica do estado atual
+        # Fração do próximo passo já decorrida, usada para interpolar o desenho
+        dirty_rects = game_manager.draw(screen, accumulator / SIMULATION_DT) # Desenha o estado atual na tela
+        profiler.draw_overlay(screen)
 
-        game_manager.draw(screen) # Desenha o estado atual na tela
+        # Atualiza a tela inteira, ou só as áreas que mudaram (menus)
+        display.present(None if profiler.enabled else dirty_rects)
+        profiler.end_frame() # Mede até o flip, sem a espera do limitador de FPS
+        if dirty_rects == [] and game_manager.can_idle() and not profiler.enabled:
+            # Menu parado: nada mudou e não há lógica por passo, então dorme até o
+            # próximo evento (ou IDLE_WAIT_MS, para guardar os assets decodificados)
+            event = pygame.event.wait(IDLE_WAIT_MS)
+            if event.type != pygame.NOEVENT:
+                waiting_event = event # Tratado no início do próximo frame, antes dos outros
+            previous_time = time.perf_counter()
+            accumulator = 0.0 # O tempo parado não vira passos de simulação
+        else:
+            clock.tick(FPS) # Controla o FPS
 
-        pygame.display.flip() # Atualiza a tela inteira
-        clock.tick(FPS) # Controla o FPS
+    # Salva as gravações das partidas em andamento
+    for state in game_manager.states.values():
+        if hasattr(state, 'finish_recording'):
+            state.finish_recording()
+    profiler.dump_csv(os.path.join(PROFILE_DIR, time.strftime('frames_%Y%m%d_%H%M%S.csv')))
 
     pygame.quit()
     sys.exit()
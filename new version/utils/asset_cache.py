@@ -0,0 +1,228 @@
+# utils/asset_cache.py
+import os
+import queue
+import threading
+import pygame
+
+# Raiz do projeto (pasta que contém 'assets')
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def asset_path(*parts):
+    """Retorna o caminho absoluto de um arquivo dentro de 'assets'."""
+    return os.path.join(PROJECT_ROOT, 'assets', *parts)
+
+
+def image_path(name):
+    """Retorna o caminho absoluto de uma imagem em 'assets/images'."""
+    return asset_path('images', name)
+
+
+class AssetCache:
+    """Cache central de imagens já decodificadas, convertidas e redimensionadas.
+
+    Cada entrada é identificada por (caminho, tamanho alvo, alpha). Assim vários
+    inimigos ou coletáveis com a mesma textura compartilham a mesma Surface e
+    criar um objeto novo vira uma consulta ao dicionário em vez de uma leitura
+    do disco. As Surfaces retornadas são compartilhadas: não as modifique.
+
+    O tamanho alvo pode ter uma dimensão None, ex: (None, 720), para
+    redimensionar mantendo a proporção original da imagem.
+
+    Com `headless` ativo (simulação sem tela) as imagens não são convertidas
+    para o formato da tela, e as de tamanho fixo nem são decodificadas: basta
+    uma Surface vazia do tamanho certo, já que nada será desenhado.
+
+    preload_async() decodifica e redimensiona as imagens numa thread de fundo (o
+    pygame libera o GIL ao ler PNGs e ao redimensionar); pump(), chamado pelo
+    loop principal, faz a conversão para o formato da tela, que precisa
+    acontecer na thread principal. get_image() de uma imagem ainda na fila
+    espera por ela em vez de decodificá-la de novo.
+    """
+
+    WAIT_TIMEOUT = 0.5  # Segundos entre verificações da thread ao esperar uma imagem
+
+    def __init__(self):
+        self.images = {}
+        self.sounds = {}
+        self.hits = 0
+        self.misses = 0
+        self.headless = False
+
+        # --- Carregamento em segundo plano ---
+        self._pending = set()  # Chaves pedidas à thread e ainda não guardadas
+        self._failed = {}  # Chave -> erro da decodificação em segundo plano
+        self._requests = queue.Queue()
+        self._decoded = queue.Queue()
+        self._worker = None
+
+    def _make_key(self, path, size, alpha):
+        if size is not None:
+            size = (size[0], size[1])
+        return (path, size, alpha)
+
+    def get_image(self, path, size=None, alpha=True):
+        """Retorna a imagem do cache, carregando-a do disco apenas na primeira vez.
+
+        Lança pygame.error / FileNotFoundError se a imagem não puder ser carregada,
+        para que cada chamador mantenha o seu próprio fallback.
+        """
+        key = self._make_key(path, size, alpha)
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        if key in self._pending:
+            # Já está sendo decodificada em segundo plano: espera em vez de repetir o trabalho
+            self._wait_for(key)
+            image = self.images.get(key)
+            if image is not None:
+                return image
+        image = self._load_image(path, key[1], alpha)
+        self.images[key] = image
+        return image
+
+    def _load_image(self, path, size, alpha):
+        if self.headless and size is not None and None not in size:
+            return pygame.Surface(size)
+        return self._convert(self._decode(path, size), alpha)
+
+    def _convert(self, image, alpha):
+        if self.headless:
+            return image
+        return image.convert_alpha() if alpha else image.convert()
+
+    def _decode(self, path, size):
+        """Lê e redimensiona a imagem, sem converter (pode rodar fora da thread principal)."""
+        image = pygame.image.load(path)
+        if size is not None:
+            width, height = size
+            original_w, original_h = image.get_size()
+            # Calcula a dimensão que faltar mantendo a proporção da imagem
+            if width is None:
+                width = int(height * original_w / original_h) if original_h > 0 else height
+            if height is None:
+                height = int(width * original_h / original_w) if original_w > 0 else width
+            if (width, height) != (original_w, original_h):
+                image = pygame.transform.scale(image, (width, height))
+        return image
+
+    def get_sound(self, path):
+        """Retorna o som do cache (um pygame.mixer.Sound por arquivo); lança pygame.error se falhar."""
+        sound = self.sounds.get(path)
+        if sound is None:
+            sound = pygame.mixer.Sound(path)
+            self.sounds[path] = sound
+        return sound
+
+    def preload_async(self, specs):
+        """Agenda a decodificação de (caminho, tamanho, alpha) numa thread de fundo.
+
+        Retorna imediatamente; use ready()/progress() para acompanhar e pump()
+        a cada frame para guardar as imagens prontas no cache.
+        """
+        if self.headless:
+            self.preload(specs)  # Sem tela quase nada é decodificado; não vale a thread
+            return
+        for path, size, alpha in specs:
+            key = self._make_key(path, size, alpha)
+            if key in self.images or key in self._pending:
+                continue
+            self._pending.add(key)
+            self._requests.put(key)
+        if self._pending and self._worker is None:
+            self._worker = threading.Thread(target=self._worker_loop, name='asset-preloader', daemon=True)
+            self._worker.start()
+
+    def _worker_loop(self):
+        while True:
+            key = self._requests.get()
+            path, size, alpha = key
+            try:
+                self._decoded.put((key, self._decode(path, size), None))
+            except (pygame.error, FileNotFoundError, OSError) as e:
+                self._decoded.put((key, None, e))
+
+    def _store_decoded(self, key, image, error):
+        self._pending.discard(key)
+        if error is not None:
+            print(f"AVISO: Não foi possível pré-carregar '{key[0]}': {error}")
+            self._failed[key] = error
+        else:
+            self.images[key] = self._convert(image, key[2])
+
+    def _wait_for(self, key):
+        while key in self._pending:
+            try:
+                item = self._decoded.get(timeout=self.WAIT_TIMEOUT)
+            except queue.Empty:
+                # Decodificação lenta ou thread morta: se morreu, get_image decodifica aqui
+                self._check_worker()
+                continue
+            self._store_decoded(*item)
+
+    def _check_worker(self):
+        """Se a thread de carregamento morreu, desiste do que estava pendente (vira carregamento normal)."""
+        if not self._pending or (self._worker is not None and self._worker.is_alive()):
+            return
+        self.pump()  # O que ela terminou antes de parar ainda vale
+        if self._pending:
+            print(f"AVISO: A thread de carregamento parou; {len(self._pending)} imagem(ns) serão carregadas na thread principal.")
+            self._pending.clear()
+        self._worker = None
+
+    def pump(self):
+        """Guarda no cache as imagens já decodificadas pela thread; retorna quantas eram."""
+        stored = 0
+        while True:
+            try:
+                item = self._decoded.get_nowait()
+            except queue.Empty:
+                return stored
+            self._store_decoded(*item)
+            stored += 1
+
+    def progress(self, specs):
+        """Fração (0 a 1) das imagens de `specs` já prontas (falhas contam como prontas)."""
+        self.pump()
+        self._check_worker()
+        if not specs:
+            return 1.0
+        done = sum(1 for path, size, alpha in specs if self._make_key(path, size, alpha) not in self._pending)
+        return done / len(specs)
+
+    def ready(self, specs):
+        return self.progress(specs) >= 1.0
+
+    def preload(self, specs):
+        """Carrega antecipadamente uma lista de (caminho, tamanho, alpha).
+
+        Falhas são apenas avisadas; o chamador terá o erro de novo ao pedir a imagem.
+        """
+        for path, size, alpha in specs:
+            try:
+                self.get_image(path, size, alpha)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"AVISO: Não foi possível pré-carregar '{path}': {e}")
+
+    def discard(self, specs):
+        """Tira do cache as imagens de (caminho, tamanho, alpha); quem ainda as usa mantém a sua referência."""
+        for path, size, alpha in specs:
+            self.images.pop(self._make_key(path, size, alpha), None)
+
+    def clear(self):
+        self.images.clear()
+        self.sounds.clear()
+        self._failed.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Retorna os contadores do cache (acertos, faltas e entradas)."""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.images)}
+
+
+# Instância compartilhada por todos os estados do jogo
+asset_cache = AssetCache()
@@ -0,0 +1,187 @@
+# utils/background.py
+import pygame
+
+
+def _is_opaque(image):
+    return not (image.get_flags() & pygame.SRCALPHA) and image.get_alpha() is None
+
+
+class ParallaxLayer:
+    """Camada de fundo repetida na horizontal, que rola a `factor` da velocidade da câmera.
+
+    Camadas transparentes são recortadas na vertical até a área com pixels
+    visíveis (get_bounding_rect), então o custo de desenhá-las é o da faixa
+    que realmente aparece, não o da tela inteira.
+    """
+
+    def __init__(self, image, factor, y=0):
+        self.factor = factor
+        self.opaque = _is_opaque(image)
+        if not self.opaque:
+            bounds = image.get_bounding_rect()
+            if bounds.height < image.get_height():
+                # Só na vertical: a largura é o período da repetição
+                image = image.subsurface((0, bounds.y, image.get_width(), bounds.height)).copy()
+                y += bounds.y
+        self.image = image
+        self.y = y
+        self.width, self.height = image.get_size()
+
+    def covers(self, top, bottom):
+        """Se a camada esconde totalmente a faixa de linhas [top, bottom) da tela."""
+        return self.opaque and self.y <= top and self.y + self.height >= bottom
+
+    def draw(self, screen, camera_offset_x, left, right, bottom):
+        """Desenha as colunas [left, right) e linhas acima de `bottom`; retorna o número de blits."""
+        height = min(self.height, bottom - self.y)
+        if right <= left or height <= 0:
+            return 0
+        # Coluna da tela onde começa a cópia da imagem que contém `left`
+        x = int(camera_offset_x * self.factor) % self.width
+        x += (left - x) // self.width * self.width
+        blits = 0
+        while x < right:
+            src_left = left - x if x < left else 0
+            src_right = min(self.width, right - x)
+            screen.blit(self.image, (x + src_left, self.y), (src_left, 0, src_right - src_left, height))
+            blits += 1
+            x += self.width
+        return blits
+
+
+class BackgroundLayers:
+    """Fundo do nível: camadas de parallax e uma faixa estática pré-composta.
+
+    - Camadas com o mesmo fator de parallax e a mesma largura são compostas
+      numa só quando adicionadas (um blit em vez de um por camada).
+    - Só se desenha a partir da camada opaca mais alta que cobre a tela; as de
+      baixo ficariam escondidas. Se nenhuma cobre, a área é limpa com
+      `clear_color` (e a tela não precisa ser limpa antes).
+    - Cenário fixo no mundo (ex: o fundo da nave e a nave no final da fase) é
+      composto uma vez numa faixa com a altura da tela (set_static); por frame
+      só o pedaço visível dela é copiado, e as camadas de parallax param onde
+      a faixa opaca começa.
+
+    A câmera deste jogo não se move na vertical, então as coordenadas Y do
+    mundo são as da tela.
+    """
+
+    def __init__(self, screen_width, screen_height, clear_color=(0, 0, 0)):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.clear_color = clear_color
+        self.layers = []
+        self.static_strip = None
+        self.static_rect = None  # Posição da faixa no mundo
+        self.static_pieces = []  # Peças que ficam fora da faixa (desenhadas recortadas)
+        self.static_key = None
+        self.static_cover = None  # Faixa de X do mundo escondida pela peça opaca da faixa
+        self.blit_count = 0  # Blits do último draw (para o profiler)
+
+    def add_layer(self, image, factor, y=0):
+        """Adiciona uma camada acima das existentes."""
+        layer = ParallaxLayer(image, factor, y)
+        if self.layers:
+            top = self.layers[-1]
+            if top.factor == layer.factor and top.width == layer.width:
+                # Mesmo movimento: compõe as duas numa única imagem
+                y0 = min(top.y, layer.y)
+                height = max(top.y + top.height, layer.y + layer.height) - y0
+                opaque = top.opaque and top.y == y0 and top.height == height
+                merged = pygame.Surface((top.width, height), 0 if opaque else pygame.SRCALPHA)
+                merged.blit(top.image, (0, top.y - y0))
+                merged.blit(layer.image, (0, layer.y - y0))
+                self.layers[-1] = ParallaxLayer(self._converted(merged, opaque), top.factor, y0)
+                return
+        self.layers.append(layer)
+
+    def set_static(self, pieces, strip_width):
+        """Compõe as peças fixas [(imagem, (x, y) no mundo), ...] numa faixa.
+
+        A faixa começa na peça mais à esquerda e tem no máximo `strip_width` de
+        largura (uma imagem muito larga não vira uma Surface enorme); o que
+        passa dela é copiado direto das peças, só a parte visível.
+        """
+        key = tuple((id(image), pos) for image, pos in pieces) + (strip_width,)
+        if key == self.static_key:
+            return
+        self.clear_static()
+        if not pieces:
+            return
+        bounds = pygame.Rect(pieces[0][1], pieces[0][0].get_size()).unionall(
+            [pygame.Rect(pos, image.get_size()) for image, pos in pieces[1:]])
+        bounds = bounds.clip(pygame.Rect(bounds.x, 0, min(bounds.width, strip_width), self.screen_height))
+        first_image, first_pos = pieces[0]
+        first_rect = pygame.Rect(first_pos, first_image.get_size())
+        opaque = _is_opaque(first_image) and first_rect.contains(bounds)
+        strip = pygame.Surface(bounds.size, 0 if opaque else pygame.SRCALPHA)
+        for image, pos in pieces:
+            strip.blit(image, (pos[0] - bounds.x, pos[1] - bounds.y))
+        self.static_strip = self._converted(strip, opaque)
+        self.static_rect = bounds
+        self.static_pieces = [(image, pygame.Rect(pos, image.get_size())) for image, pos in pieces]
+        if _is_opaque(first_image) and first_rect.y <= 0 and first_rect.bottom >= self.screen_height:
+            self.static_cover = (first_rect.x, first_rect.right)
+        self.static_key = key
+
+    def clear_static(self):
+        self.static_strip = None
+        self.static_rect = None
+        self.static_pieces = []
+        self.static_key = None
+        self.static_cover = None
+
+    def _converted(self, surface, opaque):
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert() if opaque else surface.convert_alpha()
+
+    def draw(self, screen, camera_offset_x, bottom=None):
+        """Desenha o fundo; `bottom` é a primeira linha coberta por algo opaco (ex: o chão)."""
+        bottom = self.screen_height if bottom is None else min(bottom, self.screen_height)
+        blits = 0
+
+        # Colunas da tela onde as camadas de parallax aparecem (fora da parte opaca da faixa)
+        spans = [(0, self.screen_width)]
+        if self.static_cover is not None:
+            cover_left = self.static_cover[0] + camera_offset_x
+            cover_right = self.static_cover[1] + camera_offset_x
+            spans = [(0, min(self.screen_width, cover_left)), (max(0, cover_right), self.screen_width)]
+
+        # Camada opaca mais alta que cobre a tela: as de baixo não precisam ser desenhadas
+        first = None
+        for i in range(len(self.layers) - 1, -1, -1):
+            if self.layers[i].covers(0, bottom):
+                first = i
+                break
+        for left, right in spans:
+            if right <= left or bottom <= 0:
+                continue
+            if first is None:
+                screen.fill(self.clear_color, (left, 0, right - left, bottom))
+                blits += 1
+            for layer in self.layers[first or 0:]:
+                blits += layer.draw(screen, camera_offset_x, left, right, bottom)
+
+        if self.static_strip is not None:
+            blits += self._draw_static(screen, camera_offset_x)
+        self.blit_count = blits
+
+    def _draw_static(self, screen, camera_offset_x):
+        view = pygame.Rect(-camera_offset_x, 0, self.screen_width, self.screen_height)
+        blits = 0
+        visible = self.static_rect.clip(view)
+        if visible.width > 0:
+            area = visible.move(-self.static_rect.x, -self.static_rect.y)
+            screen.blit(self.static_strip, (visible.x + camera_offset_x, visible.y), area)
+            blits += 1
+        # Além da faixa: copia direto de cada peça só o que está visível
+        if view.right > self.static_rect.right:
+            beyond = pygame.Rect(self.static_rect.right, 0, view.right - self.static_rect.right, self.screen_height)
+            beyond = beyond.clip(view)
+            for image, rect in self.static_pieces:
+                visible = rect.clip(beyond)
+                if visible.width > 0 and visible.height > 0:
+                    screen.blit(image, (visible.x + camera_offset_x, visible.y), visible.move(-rect.x, -rect.y))
+                    blits += 1
+        return blits
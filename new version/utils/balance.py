@@ -0,0 +1,205 @@
+# utils/balance.py
+"""Simulações de balanceamento: um bot joga partidas headless com parâmetros ajustados.
+
+Cada simulação recebe um dict de configuração (semente, nível e os parâmetros
+que costumamos ajustar à mão) e devolve um dict de resultados com tempo de
+sobrevivência, dano sofrido e custo dos passos. simulate() é uma função de
+módulo para poder rodar nos processos de um multiprocessing.Pool; veja
+benchmarks/balance_sweep.py.
+"""
+import random
+import pygame
+
+from utils.headless import init_headless, ScriptedInput, run_headless
+
+SCREEN_SIZE = (1280, 720)
+
+# Valores atuais do jogo; uma configuração só precisa informar o que muda
+DEFAULT_PARAMS = {
+    'num_trenches': 2,
+    'trench_spacing': 3000,
+    'enemy_shot_cooldown': 2000,
+    'boss_attack_cooldown': 1200,
+    'boss_phase2': 0.6,
+    'boss_phase3': 0.3,
+}
+
+
+class BotPolicy:
+    """Bot simples e determinístico: avança atirando, pula barricadas e foge dos lasers.
+
+    Nas trincheiras anda para a direita segurando o tiro, mira para cima quando
+    há inimigos voadores à frente e pula quando fica parado contra uma barricada.
+    Na arena do chefe fica embaixo dele mirando para cima e pula quando um laser
+    chega perto.
+    """
+
+    def __init__(self, keys, seed):
+        self.keys = keys
+        self.rng = random.Random(f"{seed}:bot")
+        self.stuck_ticks = 0
+
+    def __call__(self, state, tick):
+        keys = self.keys
+        keys.release_all()
+        keys.press(pygame.K_x)
+        if state.is_boss_fight:
+            self._boss_fight(state)
+        else:
+            self._trenches(state)
+
+    def _trenches(self, state):
+        self.keys.press(pygame.K_RIGHT)
+        player_x = state.player_pos[0]
+        for enemy in state.enemies:
+            if enemy.is_flying and 0 < enemy.pos[0] - player_x < state.screen_width / 2:
+                self.keys.press(pygame.K_UP)
+                break
+
+        # Parado contra uma barricada: pula (com um pouco de atraso aleatório)
+        if abs(state.player_velocity_x) < 1:
+            self.stuck_ticks += 1
+        else:
+            self.stuck_ticks = 0
+        if self.stuck_ticks > self.rng.randint(5, 20):
+            state.request_jump()
+            self.stuck_ticks = 0
+
+    def _boss_fight(self, state):
+        boss = state.boss
+        if boss is None:
+            return
+        player_center = state.player_pos[0] + state.player_rect_size[0] / 2
+        boss_center = boss.pos[0] + boss.size[0] / 2
+        if boss_center > player_center + 40:
+            self.keys.press(pygame.K_RIGHT)
+        elif boss_center < player_center - 40:
+            self.keys.press(pygame.K_LEFT)
+        self.keys.press(pygame.K_UP)
+
+        # Pula quando algum laser está a menos de 150 px do jogador
+        lasers = state.enemy_bullets
+        n = len(lasers)
+        if n:
+            player_center_y = state.player_pos[1] + state.player_rect_size[1] / 2
+            dx = lasers.positions[:n, 0] - player_center
+            dy = lasers.positions[:n, 1] - player_center_y
+            if ((dx * dx + dy * dy) < 150 * 150).any() and self.rng.random() < 0.5:
+                state.request_jump()
+
+
+def _apply_params(state, params):
+    """Aplica os parâmetros de balanceamento antes de a partida começar (só nesta partida)."""
+    state.num_trenches = params['num_trenches']
+    state.trench_spacing = params['trench_spacing']
+    state.enemy_shot_cooldown = params['enemy_shot_cooldown']
+
+
+def _apply_boss_params(state, params):
+    if state.boss:
+        state.boss.attack_cooldown = params['boss_attack_cooldown']
+        state.boss.phase_thresholds = {2: params['boss_phase2'], 3: params['boss_phase3']}
+
+
+def simulate(config):
+    """Roda uma partida headless com o bot e retorna as métricas.
+
+    config: {'seed', 'boss_fight' (bool), 'ticks', ...parâmetros de DEFAULT_PARAMS}.
+    """
+    from utils.game_manager import GameManager
+    from game_states.gameplay_state import GameplayState
+
+    params = dict(DEFAULT_PARAMS)
+    params.update({key: value for key, value in config.items() if key in DEFAULT_PARAMS})
+
+    keys = ScriptedInput()
+    state = GameplayState(GameManager(), *SCREEN_SIZE, is_boss_fight=config.get('boss_fight', False),
+                          input_source=keys, seed=config['seed'])
+    _apply_params(state, params)
+    state.reset_player()
+    _apply_boss_params(state, params)
+
+    bot = BotPolicy(keys, config['seed'])
+    damage = [0]
+    last_hit_points = [state.player_hit_points]
+
+    def on_tick(state, tick):
+        # Soma o dano sofrido no passo anterior (corações recuperados não descontam)
+        if state.player_hit_points < last_hit_points[0]:
+            damage[0] += last_hit_points[0] - state.player_hit_points
+        last_hit_points[0] = state.player_hit_points
+        if state.is_game_over or state.loading_screen_active or state.game_won:
+            return True
+        bot(state, tick)
+        return False
+
+    stats = run_headless(state, config.get('ticks', 20000), on_tick=on_tick)
+
+    if state.is_game_over:
+        outcome = 'morreu'
+    elif state.game_won:
+        outcome = 'venceu'
+    elif state.loading_screen_active:
+        outcome = 'chegou ao chefe'
+    else:
+        outcome = 'tempo esgotado'
+
+    result = dict(params)
+    result.update({
+        'seed': config['seed'],
+        'boss_fight': config.get('boss_fight', False),
+        'outcome': outcome,
+        'survival_s': stats['simulated_s'],
+        'damage_taken': damage[0],
+        'boss_health': state.boss.health if state.boss else None,
+        'mean_tick_ms': stats['mean_tick_ms'],
+        'p99_tick_ms': stats['p99_tick_ms'],
+    })
+    return result
+
+
+def init_worker():
+    """Inicializador dos processos do pool: pygame sem janela e assets headless."""
+    init_headless()
+
+
+def sweep(configs, processes=None, chunksize=1):
+    """Roda todas as configurações em paralelo (um processo por núcleo) e retorna os resultados.
+
+    Os resultados chegam na ordem em que terminam; cada um carrega a própria configuração.
+    """
+    import multiprocessing
+
+    # close()/join() em vez do `with`: o SDL captura o SIGTERM usado por
+    # Pool.terminate(), e os processos não terminariam
+    pool = multiprocessing.Pool(processes, initializer=init_worker)
+    try:
+        results = list(pool.imap_unordered(simulate, configs, chunksize))
+    finally:
+        pool.close()
+        pool.join()
+    return results
+
+
+def summarize(results):
+    """Agrupa os resultados por combinação de parâmetros (média entre as sementes)."""
+    groups = {}
+    for result in results:
+        key = tuple(result[name] for name in DEFAULT_PARAMS) + (result['boss_fight'],)
+        groups.setdefault(key, []).append(result)
+
+    rows = []
+    for key in sorted(groups):
+        group = groups[key]
+        count = len(group)
+        row = dict(zip(list(DEFAULT_PARAMS) + ['boss_fight'], key))
+        row.update({
+            'runs': count,
+            'deaths': sum(1 for r in group if r['outcome'] == 'morreu'),
+            'survival_s': sum(r['survival_s'] for r in group) / count,
+            'damage_taken': sum(r['damage_taken'] for r in group) / count,
+            'mean_tick_ms': sum(r['mean_tick_ms'] for r in group) / count,
+            'p99_tick_ms': max(r['p99_tick_ms'] for r in group),
+        })
+        rows.append(row)
+    return rows
@@ -16,6 +16,7 @@ class Button:
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
         self.is_hovered = False
+        self.drawn_hovered = None  # Estado de hover da última vez que o botão foi desenhado
 
         # valores default
         self.color = (100, 100, 100)  # Cinza escuro
@@ -97,8 +98,14 @@ class Button:
                 except Exception as e:
                     print(f"Erro ao executar callback do botão: {e}")
 
+    def needs_redraw(self):
+        """True se a aparência mudou desde o último desenho (ex: o mouse entrou ou saiu)."""
+        return self.is_hovered != self.drawn_hovered
+
     def draw(self, screen):
         current_color = self.hover_color if self.is_hovered else self.color
         pygame.draw.rect(screen, current_color, self.rect, border_radius=10)
         screen.blit(self.text_surface, self.text_rect)
+        self.drawn_hovered = self.is_hovered
+        return self.rect
 
@@ -0,0 +1,88 @@
+# utils/display.py
+import pygame
+
+# Resoluções lógicas (em que o jogo é desenhado) de cada opção de qualidade
+QUALITY_PRESETS = {
+    'desempenho': (1280, 720),
+    'qualidade': (1920, 1080),
+}
+DEFAULT_QUALITY = 'desempenho'
+
+MOUSE_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+
+
+class Display:
+    """Janela do jogo com resolução lógica fixa e uma única ampliação até o monitor.
+
+    Os estados sempre desenham em `screen`, no tamanho lógico. O modo
+    preferido é pygame.SCALED: o SDL amplia o quadro na GPU e já entrega o
+    mouse em coordenadas lógicas. Se o SCALED não estiver disponível (ex: sem
+    renderer), o quadro é desenhado numa Surface lógica e ampliado com
+    pygame.transform.scale direto na janela (mantendo a proporção, com faixas
+    pretas como o SCALED), e os eventos do mouse são convertidos por
+    to_logical().
+    """
+
+    def __init__(self):
+        info = pygame.display.Info()
+        self.native_size = (info.current_w, info.current_h)  # Antes do primeiro set_mode
+        self.logical_size = None
+        self.fullscreen = True
+        self.window = None  # Surface da janela
+        self.screen = None  # Onde os estados desenham (tamanho lógico)
+        self.manual_scale = False  # Ampliação feita aqui, sem o SCALED
+        self.hardware_scaled = False
+        self.viewport = None  # Área da janela onde o quadro ampliado aparece
+
+    def open(self, logical_size, fullscreen=True):
+        """(Re)abre a janela e retorna a Surface lógica."""
+        self.logical_size = logical_size
+        self.fullscreen = fullscreen
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        try:
+            self.window = pygame.display.set_mode(logical_size, flags | pygame.SCALED)
+            self.screen = self.window
+            self.manual_scale = False
+            self.hardware_scaled = True
+        except pygame.error as e:
+            print(f"AVISO: Não foi possível usar pygame.SCALED ({e}). Ampliando o quadro sem aceleração.")
+            self.hardware_scaled = False
+            window_size = self.native_size if fullscreen else logical_size
+            self.window = pygame.display.set_mode(window_size, flags)
+            self.manual_scale = self.window.get_size() != logical_size
+            self.screen = pygame.Surface(logical_size).convert() if self.manual_scale else self.window
+            if self.manual_scale:
+                window_w, window_h = self.window.get_size()
+                scale = min(window_w / logical_size[0], window_h / logical_size[1])
+                self.viewport = pygame.Rect(0, 0, int(logical_size[0] * scale), int(logical_size[1] * scale))
+                self.viewport.center = (window_w // 2, window_h // 2)
+                self.window.fill((0, 0, 0))
+        print(f"Tela: {logical_size[0]}x{logical_size[1]} lógicos em {self.window.get_size()}"
+              f"{' (SCALED)' if self.hardware_scaled else ''}")
+        return self.screen
+
+    def to_logical(self, event):
+        """Converte a posição de um evento de mouse para coordenadas lógicas."""
+        if not self.manual_scale or event.type not in MOUSE_EVENTS:
+            return event
+        view = self.viewport
+        logical_w, logical_h = self.logical_size
+        attributes = dict(event.dict)
+        attributes['pos'] = ((event.pos[0] - view.x) * logical_w // view.width,
+                             (event.pos[1] - view.y) * logical_h // view.height)
+        if 'rel' in attributes:
+            attributes['rel'] = (event.rel[0] * logical_w // view.width, event.rel[1] * logical_h // view.height)
+        return pygame.event.Event(event.type, attributes)
+
+    def present(self, dirty_rects=None):
+        """Mostra o quadro: dirty_rects None = tela inteira, lista = só essas áreas."""
+        if self.manual_scale:
+            if dirty_rects is not None and not dirty_rects:
+                return  # Nada mudou
+            # A ampliação cobre o quadro todo de qualquer forma
+            pygame.transform.scale(self.screen, self.viewport.size, self.window.subsurface(self.viewport))
+            pygame.display.flip()
+        elif dirty_rects is None:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
@@ -1,42 +1,164 @@
 # utils/game_manager.py
+import time
 import pygame
+from utils.asset_cache import asset_cache
+from utils.display import QUALITY_PRESETS, DEFAULT_QUALITY
+from utils.profiler import profiler
+from utils.sprite_variants import sprite_variants
+from utils.text_cache import text_cache
 
 class GameManager:
     def __init__(self):
         self.current_state = None
-        self.states = {}
+        self.current_state_name = None
+        self.states = {} # Estados já criados
+        self.factories = {} # Estados criados só no primeiro set_state (podem ser descarregados)
+        self.last_visit = {} # Nome -> instante (time.monotonic) em que o estado foi deixado
+        self.unload_idle_after = None # Segundos sem visita até descarregar um estado (None = nunca)
         self.volume = 0.5 # Volume inicial (0.0 a 1.0)
         self.language = 'pt' # Idioma inicial
+        self.interpolation_alpha = 1.0 # Fração entre o passo anterior e o atual da simulação (para o desenho)
+        self.replay_dir = None # Pasta onde as partidas são gravadas (None = não grava)
+        self.quality = DEFAULT_QUALITY # Chave de QUALITY_PRESETS: resolução lógica do jogo
+        self.fullscreen = True
+        self.display_changed = False # O loop principal reabre a tela quando True
 
-    def add_state(self, name, state):
-        self.states[name] = state
+    def add_state(self, name, state=None, factory=None, assets=None):
+        """Registra um estado pronto (`state`) ou uma função sem argumentos que o cria (`factory`).
 
-    def set_state(self, name):
-        if name in self.states:
-            self.current_state = self.states[name]
-            self.current_state.enter() # Método para inicializar o estado
+        Com `factory`, o estado só é construído no primeiro set_state(name), e
+        `assets` (lista de (caminho, tamanho, alpha)) já começa a ser decodificada
+        em segundo plano para que ele fique pronto rápido.
+        """
+        if factory is not None:
+            self.factories[name] = factory
+            if assets:
+                asset_cache.preload_async(assets)
         else:
+            self.states[name] = state
+
+    def get_state(self, name):
+        """Retorna o estado, criando-o pela sua função se ainda não existir (None se não registrado)."""
+        state = self.states.get(name)
+        if state is None and name in self.factories:
+            state = self.factories[name]()
+            self.states[name] = state
+        return state
+
+    def set_state(self, name):
+        state = self.get_state(name)
+        if state is None:
             print(f"Erro: Estado '{name}' não encontrado.")
+            return
+        if self.current_state_name is not None:
+            self.last_visit[self.current_state_name] = time.monotonic()
+        self.current_state = state
+        self.current_state_name = name
+        self.unload_idle_states()
+        self.current_state.enter() # Método para inicializar o estado
+
+    def unload_idle_states(self):
+        """Descarta os estados criados por função que não são visitados há `unload_idle_after` segundos."""
+        if self.unload_idle_after is None:
+            return
+        now = time.monotonic()
+        for name in list(self.states):
+            if name == self.current_state_name or name not in self.factories:
+                continue
+            if now - self.last_visit.get(name, now) >= self.unload_idle_after:
+                self.unload_state(name)
+
+    def unload_state(self, name):
+        """Descarta um estado criado por função; ele será recriado no próximo set_state.
+
+        As imagens que só ele usava saem do cache compartilhado.
+        """
+        if name == self.current_state_name or name not in self.factories:
+            return
+        state = self.states.pop(name, None)
+        if state is None:
+            return
+        if hasattr(state, 'unload'):
+            state.unload()
+        if hasattr(state, 'asset_specs'):
+            in_use = set()
+            for other in self.states.values():
+                if hasattr(other, 'asset_specs'):
+                    in_use.update(other.asset_specs())
+            unused = [spec for spec in state.asset_specs() if spec not in in_use]
+            asset_cache.discard(unused)
+            sprite_variants.discard(unused)
+        print(f"Estado '{name}' descarregado")
+
+    def clear_states(self):
+        """Descarta todos os estados e as texturas do cache (ex: ao mudar a resolução lógica)."""
+        for state in self.states.values():
+            if hasattr(state, 'unload'):
+                state.unload()
+        self.states.clear()
+        self.factories.clear()
+        self.last_visit.clear()
+        self.current_state = None
+        self.current_state_name = None
+        asset_cache.clear()
+        sprite_variants.clear()
 
     def handle_event(self, event):
         if self.current_state:
             self.current_state.handle_event(event)
 
-    def update(self):
+    def update(self, dt):
+        """Avança o estado atual em um passo de simulação de dt segundos."""
         if self.current_state:
-            self.current_state.update()
+            with profiler.section('update'):
+                self.current_state.update(dt)
+
+    def draw(self, screen, interpolation_alpha=1.0):
+        """Desenha o estado atual.
 
-    def draw(self, screen):
+        Retorna a lista de áreas da tela que mudaram, para o loop principal
+        atualizar só elas com pygame.display.update(rects). None significa que a
+        tela inteira foi redesenhada (estados que não fazem redesenho parcial).
+        """
+        self.interpolation_alpha = interpolation_alpha
         if self.current_state:
-            self.current_state.draw(screen)
+            with profiler.section('draw'):
+                return self.current_state.draw(screen)
+        return None
+
+    def can_idle(self):
+        """Se o estado atual não tem lógica por passo (NEEDS_UPDATE = False nos menus).
+
+        Nesse caso, quando o desenho não muda nada, o loop principal pode
+        esperar o próximo evento em vez de rodar passos e frames vazios.
+        """
+        return not getattr(self.current_state, 'NEEDS_UPDATE', True)
+
+    def invalidate_screen(self):
+        """Força o estado atual a redesenhar a tela inteira no próximo frame."""
+        if hasattr(self.current_state, 'needs_full_redraw'):
+            self.current_state.needs_full_redraw = True
 
     def set_volume(self, vol):
         self.volume = max(0.0, min(1.0, vol)) # Garante que o volume esteja entre 0 e 1
         pygame.mixer.music.set_volume(self.volume)
         print(f"Volume ajustado para: {self.volume}")
 
+    def set_quality(self, quality):
+        """Troca a resolução lógica; a tela e os estados são recriados no próximo frame."""
+        if quality not in QUALITY_PRESETS or quality == self.quality:
+            return
+        self.quality = quality
+        self.display_changed = True
+        print(f"Qualidade ajustada para: {self.quality} {QUALITY_PRESETS[quality]}")
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        self.display_changed = True
+
     def set_language(self, lang):
         self.language = lang
+        text_cache.invalidate() # Os textos renderizados no idioma anterior não servem mais
         print(f"Idioma ajustado para: {self.language}")
 
 # Dicionário de textos para localização
@@ -49,6 +171,9 @@ TEXTS = {
         'volume': 'Volume:',
         'language': 'Idioma:',
         'credits': 'Créditos:',
+        'quality': 'Qualidade:',
+        'quality_desempenho': 'Desempenho',
+        'quality_qualidade': 'Alta',
         'credits_text': 'Desenvolvido por:Pedro Jorge, Rafael Fonseca, Alef Pires e Victor Solano\nArt: Yasmin França\nMusic: Dimitri Araujo',
         'back': 'Voltar'
     },
@@ -60,6 +185,9 @@ TEXTS = {
         'volume': 'Volume:',
         'language': 'Language:',
         'credits': 'Credits:',
+        'quality': 'Quality:',
+        'quality_desempenho': 'Performance',
+        'quality_qualidade': 'High',
         'credits_text': 'Developed by: Pedro Jorge, Rafael Fonseca, Alef Pires and Victor Solano\nArt: Yasmin França\nMusic: Dimitri Araujo',
         'back': 'Back'
     }
@@ -0,0 +1,104 @@
+# utils/headless.py
+"""Ferramentas para rodar o GameplayState sem tela (testes de carga, balanceamento, CI).
+
+Exemplo:
+    init_headless()
+    keys = ScriptedInput()
+    state = GameplayState(GameManager(), 1280, 720, input_source=keys, seed=42)
+    state.reset_player()
+    keys.press(pygame.K_RIGHT)
+    run_headless(state, ticks=10000)
+"""
+import os
+import time
+import pygame
+
+from utils.asset_cache import asset_cache
+
+# Passo padrão da simulação, igual ao do loop principal (120 Hz)
+DEFAULT_DT = 1.0 / 120
+
+
+def init_headless():
+    """Inicializa o pygame sem janela nem áudio e coloca o cache de assets em modo headless."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    pygame.init()
+    asset_cache.headless = True
+
+
+class ManualClock:
+    """Relógio virtual com a mesma interface de pygame.time (get_ticks em ms)."""
+
+    def __init__(self, start_ms=0):
+        self.now_ms = start_ms
+
+    def get_ticks(self):
+        return int(self.now_ms)
+
+    def advance(self, ms):
+        self.now_ms += ms
+
+
+class KeyState:
+    """Imita o retorno de pygame.key.get_pressed(): keys[pygame.K_x] -> bool."""
+
+    def __init__(self, pressed):
+        self._pressed = pressed
+
+    def __getitem__(self, key):
+        return key in self._pressed
+
+
+class ScriptedInput:
+    """Fonte de entrada controlada por código (bots, scripts de teste)."""
+
+    def __init__(self):
+        self.pressed = set()
+
+    def press(self, *keys):
+        self.pressed.update(keys)
+
+    def release(self, *keys):
+        self.pressed.difference_update(keys)
+
+    def release_all(self):
+        self.pressed.clear()
+
+    def get_pressed(self):
+        return KeyState(frozenset(self.pressed))
+
+
+def run_headless(state, ticks, dt=DEFAULT_DT, on_tick=None, clock=None):
+    """Avança o estado `ticks` passos de `dt` segundos, o mais rápido possível.
+
+    on_tick(state, tick) é chamado antes de cada passo (ex: para um bot mudar as
+    teclas); se retornar True a simulação para. `clock` só é necessário quando um
+    ManualClock foi injetado no estado: ele é avançado aqui a cada passo (sem
+    relógio injetado, o estado avança o próprio relógio virtual).
+    Retorna estatísticas de custo.
+    """
+    step_ms = dt * 1000
+    tick_times = []
+    start = time.perf_counter()
+    executed = 0
+    for tick in range(ticks):
+        if on_tick is not None and on_tick(state, tick):
+            break
+        if clock is not None:
+            clock.advance(step_ms)
+        tick_start = time.perf_counter()
+        state.update(dt)
+        tick_times.append(time.perf_counter() - tick_start)
+        executed += 1
+    elapsed = time.perf_counter() - start
+
+    tick_times.sort()
+    return {
+        'ticks': executed,
+        'elapsed_s': elapsed,
+        'ticks_per_second': executed / elapsed if elapsed > 0 else 0.0,
+        'mean_tick_ms': (sum(tick_times) / executed * 1000) if executed else 0.0,
+        'p99_tick_ms': tick_times[int(executed * 0.99) - 1] * 1000 if executed else 0.0,
+        'simulated_s': executed * dt,
+    }
@@ -0,0 +1,186 @@
+# utils/pools.py
+"""Armazenamento de projéteis e coletáveis sem alocação por objeto.
+
+Os projéteis ficam em arrays NumPy contíguos (estrutura de arrays, como o
+ParticleSystem): posição, direção, velocidade, dano, tipo e hitbox. Mover,
+descartar os que saíram da tela e testar colisões AABB contra o jogador ou
+contra uma lista de retângulos são poucas operações vetorizadas por passo, em
+vez de um laço Python por projétil. Os vivos ocupam sempre o início dos arrays,
+na ordem em que foram disparados.
+
+Para listas comuns de objetos (ex: coletáveis) há swap_remove, que remove em
+O(1) trocando o item pelo último da lista.
+"""
+import numpy as np
+import pygame
+
+
+def swap_remove(items, index):
+    """Remove items[index] em O(1) colocando o último item no lugar; retorna o removido."""
+    last = items.pop()
+    if index < len(items):
+        removed = items[index]
+        items[index] = last
+        return removed
+    return last
+
+
+class ProjectilePool:
+    """Projéteis ativos em arrays NumPy pré-alocados (crescem se faltar espaço).
+
+    A hitbox de cada projétil é um quadrado de lado `hitbox` centrado na
+    posição, com as coordenadas truncadas como em pygame.Rect(x - r, y - r, ...),
+    e as colisões seguem a regra de Rect.colliderect (bordas encostadas não colidem).
+    """
+
+    KINDS = ('player_bullet', 'enemy_laser', 'boss_laser')
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.count = 0  # Número de projéteis ativos
+
+        self.positions = np.zeros((capacity, 2), dtype=np.float64)
+        self.prev_positions = np.zeros((capacity, 2), dtype=np.float64)  # Antes do último integrate (desenho)
+        self.directions = np.zeros((capacity, 2), dtype=np.float64)  # Vetores unitários
+        self.speeds = np.zeros(capacity, dtype=np.float64)  # Pixels por frame de referência
+        self.damages = np.zeros(capacity, dtype=np.int32)
+        self.kinds = np.zeros(capacity, dtype=np.int8)  # Índice em KINDS
+        self.hitboxes = np.zeros(capacity, dtype=np.float64)  # Lado da hitbox
+        self._bounds = None  # Hitboxes calculadas após a última mudança (várias consultas por passo)
+
+    def _arrays(self):
+        return (self.positions, self.prev_positions, self.directions, self.speeds, self.damages, self.kinds,
+                self.hitboxes)
+
+    def __len__(self):
+        return self.count
+
+    def _reserve(self, n):
+        """Garante espaço para mais n projéteis (dobra a capacidade quando falta)."""
+        needed = self.count + n
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in ('positions', 'prev_positions', 'directions', 'speeds', 'damages', 'kinds', 'hitboxes'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def spawn(self, x, y, dx, dy, speed, damage=1, kind='enemy_laser', hitbox=10):
+        """Ativa um projétil e retorna o seu índice."""
+        self._reserve(1)
+        i = self.count
+        self.positions[i] = (x, y)
+        self.prev_positions[i] = (x, y)
+        self.directions[i] = (dx, dy)
+        self.speeds[i] = speed
+        self.damages[i] = damage
+        self.kinds[i] = self.KINDS.index(kind)
+        self.hitboxes[i] = hitbox
+        self.count += 1
+        self._bounds = None
+        return i
+
+    def spawn_many(self, x, y, dxs, dys, speed, damage=1, kind='enemy_laser', hitbox=10):
+        """Ativa um lote de projéteis de uma vez (ex: um anel de lasers do chefe).
+
+        x/y podem ser escalares (todos saem do mesmo ponto) ou arrays.
+        """
+        n = len(dxs)
+        if n == 0:
+            return
+        self._reserve(n)
+        start, end = self.count, self.count + n
+        self.positions[start:end, 0] = x
+        self.positions[start:end, 1] = y
+        self.prev_positions[start:end] = self.positions[start:end]
+        self.directions[start:end, 0] = dxs
+        self.directions[start:end, 1] = dys
+        self.speeds[start:end] = speed
+        self.damages[start:end] = damage
+        self.kinds[start:end] = self.KINDS.index(kind)
+        self.hitboxes[start:end] = hitbox
+        self.count = end
+        self._bounds = None
+
+    def integrate(self, step, first=0):
+        """Move os projéteis a partir do índice `first` (padrão: todos); step é o passo
+        da simulação em frames de referência. A posição anterior fica em prev_positions."""
+        n = self.count
+        if n > first:
+            self.prev_positions[first:n] = self.positions[first:n]
+            velocity = self.directions[first:n] * self.speeds[first:n, None]
+            self.positions[first:n] += velocity * step
+            self._bounds = None
+
+    def interpolated_positions(self, alpha):
+        """Posições dos projéteis ativos entre o passo anterior (alpha 0) e o atual (alpha 1)."""
+        n = self.count
+        if alpha >= 1.0:
+            return self.positions[:n]
+        previous = self.prev_positions[:n]
+        return previous + (self.positions[:n] - previous) * alpha
+
+    def bounds(self):
+        """Retorna (esquerda, topo, direita, base) das hitboxes ativas."""
+        if self._bounds is None:
+            n = self.count
+            size = self.hitboxes[:n]
+            corners = np.trunc(self.positions[:n] - (size / 2)[:, None])
+            left, top = corners[:, 0], corners[:, 1]
+            self._bounds = (left, top, left + size, top + size)
+        return self._bounds
+
+    def area(self):
+        """Retângulo que contém todas as hitboxes ativas (para consultar a grade espacial)."""
+        left, top, right, bottom = self.bounds()
+        x, y = int(left.min()), int(top.min())
+        return pygame.Rect(x, y, int(right.max()) - x, int(bottom.max()) - y)
+
+    def overlaps(self, rect):
+        """Máscara dos projéteis cuja hitbox colide com `rect`."""
+        left, top, right, bottom = self.bounds()
+        if rect.width <= 0 or rect.height <= 0:
+            return np.zeros(self.count, dtype=bool)
+        return (left < rect.right) & (right > rect.left) & (top < rect.bottom) & (bottom > rect.top)
+
+    def overlaps_rects(self, rects):
+        """Matriz (retângulos x projéteis) de colisões contra uma lista de pygame.Rect."""
+        left, top, right, bottom = self.bounds()
+        if not rects:
+            return np.zeros((0, self.count), dtype=bool)
+        # Retângulos vazios nunca colidem (como em colliderect): viram caixas invertidas
+        boxes = np.array([(r.left, r.top, r.right, r.bottom) if r.width > 0 and r.height > 0
+                          else (np.inf, np.inf, -np.inf, -np.inf) for r in rects], dtype=np.float64)
+        return ((left[None, :] < boxes[:, 2:3]) & (right[None, :] > boxes[:, 0:1]) &
+                (top[None, :] < boxes[:, 3:4]) & (bottom[None, :] > boxes[:, 1:2]))
+
+    def outside(self, left, top, right, bottom):
+        """Máscara dos projéteis cuja posição está fora dos limites dados."""
+        n = self.count
+        x = self.positions[:n, 0]
+        y = self.positions[:n, 1]
+        return (x < left) | (x > right) | (y < top) | (y > bottom)
+
+    def remove(self, mask):
+        """Descarta os projéteis marcados em `mask`, mantendo a ordem dos restantes."""
+        n = self.count
+        keep = ~mask
+        alive_count = int(np.count_nonzero(keep))
+        if alive_count == n:
+            return
+        for array in self._arrays():
+            array[:alive_count] = array[:n][keep]
+        self.count = alive_count
+        self._bounds = None
+
+    def clear(self):
+        self.count = 0
+        self._bounds = None
+
+    def stats(self):
+        return {'active': self.count, 'capacity': self.capacity}
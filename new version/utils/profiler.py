@@ -0,0 +1,211 @@
+# utils/profiler.py
+"""Medição do custo de cada parte do frame (atualização, desenho, subsistemas).
+
+Uso:
+    with profiler.section('physics'):
+        ...
+
+Desligado, section() devolve um contexto vazio compartilhado e o custo é
+praticamente zero. Ligado (F3 no jogo ou `python main.py --profile`), cada
+frame guarda o tempo total e o tempo de cada seção em um buffer circular; o
+overlay mostra o gráfico dos últimos frames com p50/p95/p99 e, ao sair, o
+histórico é salvo em CSV para comparar máquinas e versões. O CSV guarda no
+máximo os últimos `history * max_blocks` frames (padrão 60000, uns 11 minutos
+a 90 FPS e cerca de 3 MB), então o profiler pode ficar ligado a sessão toda.
+
+Contadores (ex: inimigos ativos/dormentes) são publicados com
+profiler.set_counter(nome, valor) e aparecem no overlay com o último valor.
+"""
+import collections
+import contextlib
+import csv
+import os
+import time
+import numpy as np
+import pygame
+
+# Seções conhecidas, na ordem das colunas do CSV e do overlay
+SECTIONS = (
+    'update', 'input', 'physics', 'player_bullets', 'enemies', 'enemy_bullets',
+    'collectibles', 'camera',
+    'draw', 'background', 'entities', 'hud',
+)
+
+# Orçamento de referência para o gráfico (um frame a 60 FPS)
+FRAME_BUDGET_MS = 1000.0 / 60
+
+_NULL_SECTION = contextlib.nullcontext()
+
+
+class _Section:
+    """Contexto que soma o tempo gasto dentro dele na seção do frame atual."""
+
+    __slots__ = ('profiler', 'index', 'start')
+
+    def __init__(self, profiler, index):
+        self.profiler = profiler
+        self.index = index
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.current[self.index] += time.perf_counter() - self.start
+        return False
+
+
+class FrameProfiler:
+    """Guarda os tempos (ms) dos últimos `history` frames em arrays NumPy."""
+
+    def __init__(self, history=600, max_blocks=100):
+        self.enabled = False
+        self.history = history
+        self.section_names = list(SECTIONS)
+        self._indices = {name: i for i, name in enumerate(self.section_names)}
+        self._sections = {}  # Contextos reutilizados, um por seção
+        self.current = [0.0] * len(self.section_names)  # Segundos somados no frame atual
+
+        # Buffer circular: coluna 0 = frame inteiro, demais = seções
+        self.samples = np.zeros((history, len(self.section_names) + 1), dtype=np.float32)
+        self.cursor = 0
+        self.count = 0
+        self.frames_recorded = 0
+        self._frame_start = None
+
+        # Cópias do buffer a cada volta completa, para o CSV ter o histórico;
+        # só as últimas `max_blocks` voltas ficam na memória
+        self.blocks = collections.deque(maxlen=max_blocks)
+
+        self.counters = {}  # Último valor de cada contador publicado pelos estados
+
+        self._font = None
+
+    def _index(self, name):
+        index = self._indices.get(name)
+        if index is None:
+            # Seção nova: aumenta o buffer com uma coluna
+            index = len(self.section_names)
+            self.section_names.append(name)
+            self._indices[name] = index
+            self.current.append(0.0)
+            self.samples = np.hstack([self.samples, np.zeros((self.history, 1), dtype=np.float32)])
+        return index
+
+    def section(self, name):
+        if not self.enabled:
+            return _NULL_SECTION
+        context = self._sections.get(name)
+        if context is None:
+            context = _Section(self, self._index(name))
+            self._sections[name] = context
+        return context
+
+    def set_counter(self, name, value):
+        if self.enabled:
+            self.counters[name] = value
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._frame_start = None
+        print(f"Profiler {'ligado' if self.enabled else 'desligado'}")
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        for i in range(len(self.current)):
+            self.current[i] = 0.0
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self._frame_start is None:
+            return
+        frame_ms = (time.perf_counter() - self._frame_start) * 1000
+        row = self.samples[self.cursor]
+        row[0] = frame_ms
+        row[1:] = self.current
+        row[1:] *= 1000
+        self.cursor = (self.cursor + 1) % self.history
+        if self.cursor == 0:
+            self.blocks.append(self.samples.copy())
+        self.count = min(self.count + 1, self.history)
+        self.frames_recorded += 1
+        self._frame_start = None
+
+    def recent(self):
+        """Retorna as amostras do buffer em ordem cronológica (frames x colunas)."""
+        if self.count < self.history:
+            return self.samples[:self.count]
+        return np.roll(self.samples, -self.cursor, axis=0)
+
+    def percentiles(self, column=0):
+        """Retorna (p50, p95, p99) em ms da coluna (0 = frame inteiro)."""
+        if self.count == 0:
+            return 0.0, 0.0, 0.0
+        values = self.samples[:self.count, column]
+        p50, p95, p99 = np.percentile(values, (50, 95, 99))
+        return float(p50), float(p95), float(p99)
+
+    def draw_overlay(self, screen, graph_width=300, graph_height=80):
+        if not self.enabled or self.count == 0:
+            return
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+
+        x, y = 10, screen.get_height() - graph_height - 10
+        text_lines = len(self.section_names) + len(self.counters) + 2
+        panel = pygame.Rect(x - 5, y - 18 * text_lines, graph_width + 10,
+                            graph_height + 18 * text_lines + 5)
+        pygame.draw.rect(screen, (0, 0, 0), panel)
+
+        # Gráfico dos últimos frames; a linha amarela marca o orçamento de 60 FPS
+        frames = self.recent()[-graph_width:, 0]
+        scale = graph_height / (FRAME_BUDGET_MS * 2)
+        budget_y = y + graph_height - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(screen, (255, 255, 0), (x, budget_y), (x + graph_width, budget_y))
+        if len(frames) > 1:
+            heights = np.minimum(frames * scale, graph_height).astype(np.int32)
+            points = [(x + i, y + graph_height - h) for i, h in enumerate(heights.tolist())]
+            pygame.draw.lines(screen, (0, 255, 0), False, points)
+
+        p50, p95, p99 = self.percentiles()
+        lines = [f"frame  p50 {p50:5.2f}  p95 {p95:5.2f}  p99 {p99:5.2f} ms"]
+        for i, name in enumerate(self.section_names):
+            s50, s95, s99 = self.percentiles(i + 1)
+            lines.append(f"{name:<15} {s50:5.2f} {s95:5.2f} {s99:5.2f}")
+        for name, value in self.counters.items():
+            lines.append(f"{name:<15} {value}")
+        text_y = panel.top + 4
+        for line in lines:
+            screen.blit(self._font.render(line, True, (255, 255, 255)), (x, text_y))
+            text_y += 18
+
+    def dump_csv(self, path):
+        """Salva os frames guardados em CSV (uma linha por frame, tempos em ms).
+
+        A coluna `frame` conta desde o início da medição; se as voltas mais antigas
+        já saíram da memória, o arquivo começa no primeiro frame ainda guardado.
+        """
+        if self.frames_recorded == 0:
+            return None
+        columns = len(self.section_names) + 1
+        blocks = list(self.blocks) + [self.samples[:self.cursor]]
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'frame_ms'] + [f"{name}_ms" for name in self.section_names])
+            frame = self.frames_recorded - sum(len(block) for block in blocks)
+            for block in blocks:
+                for row in block.tolist():
+                    row += [0.0] * (columns - len(row))  # Seções criadas depois deste bloco
+                    writer.writerow([frame] + [f"{value:.4f}" for value in row])
+                    frame += 1
+        print(f"Perfil de frames salvo em: {path}")
+        return path
+
+
+# Instância compartilhada pelo loop principal e pelos estados
+profiler = FrameProfiler()
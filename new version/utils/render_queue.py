@@ -0,0 +1,187 @@
+# utils/render_queue.py
+import math
+import numpy as np
+import pygame
+
+from utils.pools import ProjectilePool
+
+_solid_surfaces = {}
+
+
+def solid_surface(size, color):
+    """Retângulo de uma cor só (textura reserva quando uma imagem não carregou), criado uma vez."""
+    key = (size[0], size[1], tuple(color))
+    surface = _solid_surfaces.get(key)
+    if surface is None:
+        surface = pygame.Surface((size[0], size[1]))
+        surface.fill(color)
+        _solid_surfaces[key] = surface
+    return surface
+
+
+class ProjectileSprites:
+    """Visual dos projéteis pré-renderizado por estilo e ângulo.
+
+    Um estilo é uma tupla:
+    - ('laser', cor_brilho, cor_núcleo, largura_brilho, largura_núcleo, comprimento):
+      a linha vai da posição do projétil para trás, contra a direção;
+    - ('bullet', tamanho, tamanho_da_trilha, núcleo): trilha de círculos atrás
+      do projétil e, se `núcleo`, a bolinha principal (senão o projétil usa
+      uma imagem própria).
+    A direção é arredondada para ANGLE_STEPS ângulos (menos de 1 px de erro
+    na ponta de um laser de 20 px), então cada combinação é desenhada com
+    pygame.draw uma única vez e depois só copiada.
+    """
+
+    ANGLE_STEPS = 64
+    MARGIN = 40  # Folga do corte pela câmera (maior que qualquer sprite a partir da posição)
+
+    def __init__(self):
+        self.sprites = {}
+        self.tables = {}  # Estilos por tipo -> (surfaces, deslocamentos) indexados por tipo * ANGLE_STEPS + ângulo
+
+    def get(self, style, angle_step):
+        """Retorna (surface, (dx, dy)): o canto do sprite fica em posição + (dx, dy)."""
+        key = (style, angle_step)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            angle = angle_step * 2 * math.pi / self.ANGLE_STEPS
+            sprite = self._build(style, math.cos(angle), math.sin(angle))
+            self.sprites[key] = sprite
+        return sprite
+
+    def _build(self, style, dx, dy):
+        if style[0] == 'laser':
+            _, glow_color, core_color, glow_width, core_width, length = style
+            end = (-dx * length, -dy * length)
+            margin = glow_width + 1
+            left = math.floor(min(0, end[0])) - margin
+            top = math.floor(min(0, end[1])) - margin
+            width = math.ceil(max(0, end[0])) + margin - left + 1
+            height = math.ceil(max(0, end[1])) + margin - top + 1
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            start_pos = (-left, -top)
+            end_pos = (int(end[0] - left), int(end[1] - top))
+            pygame.draw.line(surface, glow_color, start_pos, end_pos, glow_width)
+            pygame.draw.line(surface, core_color, start_pos, end_pos, core_width)
+            return surface, (left, top)
+
+        _, size, trail_length, core = style
+        extent = (trail_length - 1) * 4 + size + 3
+        surface = pygame.Surface((extent * 2 + 1, extent * 2 + 1), pygame.SRCALPHA)
+        center = (extent, extent)
+        # Trilha: círculos menores e mais alaranjados atrás do projétil
+        for i in range(trail_length):
+            trail_size = size - (i * 2)
+            if trail_size > 0:
+                trail_pos = (int(center[0] - dx * (i * 4)), int(center[1] - dy * (i * 4)))
+                pygame.draw.circle(surface, (255, 255 - (i * 60), 0), trail_pos, trail_size)
+        # Projétil principal
+        if core:
+            pygame.draw.circle(surface, (255, 255, 200), center, size + 2)
+            pygame.draw.circle(surface, (255, 255, 0), center, size)
+        return surface, (-extent, -extent)
+
+    def table(self, kind_styles, keys):
+        """Tabela de sprites para os estilos de cada tipo, garantindo as entradas de `keys`.
+
+        Retorna (lista de surfaces, array de deslocamentos), com índice
+        tipo * ANGLE_STEPS + ângulo, para montar o lote sem consultar o dict por projétil.
+        """
+        table = self.tables.get(kind_styles)
+        if table is None:
+            size = len(kind_styles) * self.ANGLE_STEPS
+            table = ([None] * size, np.zeros((size, 2), dtype=np.int32))
+            self.tables[kind_styles] = table
+        surfaces, offsets = table
+        for key in np.unique(keys).tolist():
+            if surfaces[key] is None:
+                kind, step = divmod(key, self.ANGLE_STEPS)
+                surfaces[key], offsets[key] = self.get(kind_styles[kind], step)
+        return table
+
+    def angle_steps(self, directions):
+        """Índice de ângulo de cada direção (array N x 2)."""
+        angles = np.arctan2(directions[:, 1], directions[:, 0])
+        return np.rint(angles * (self.ANGLE_STEPS / (2 * math.pi))).astype(np.int32) % self.ANGLE_STEPS
+
+    def clear(self):
+        self.sprites.clear()
+        self.tables.clear()
+
+
+# Compartilhado por todos os estados do jogo
+projectile_sprites = ProjectileSprites()
+
+
+class RenderQueue:
+    """Fila de desenho em camadas, cortada pela câmera e enviada com screen.blits.
+
+    A cada frame: begin(área visível do mundo), os objetos enviam pares
+    (surface, posição no mundo) com submit() e os projéteis de um
+    ProjectilePool vão de uma vez com submit_projectiles(). O que está fora
+    da área visível é descartado no envio. flush() desenha cada camada, na
+    ordem em que foram declaradas, com uma única chamada screen.blits(...).
+    """
+
+    def __init__(self, layers):
+        self.order = list(layers)
+        self.layers = {name: [] for name in self.order}
+        self.view = pygame.Rect(0, 0, 0, 0)
+        self.offset_x = 0
+        self.offset_y = 0
+        self.submitted = 0  # Sprites aceitos no último frame
+        self.culled = 0  # Sprites fora da câmera no último frame
+
+    def begin(self, view):
+        """Começa um frame; `view` é a área do mundo que aparece na tela."""
+        for batch in self.layers.values():
+            batch.clear()
+        self.view = pygame.Rect(view)
+        self.offset_x = -self.view.x
+        self.offset_y = -self.view.y
+        self.submitted = 0
+        self.culled = 0
+
+    def submit(self, layer, surface, x, y):
+        """Envia um sprite com o canto superior esquerdo em (x, y) do mundo."""
+        width, height = surface.get_size()
+        view = self.view
+        if x < view.right and x + width > view.left and y < view.bottom and y + height > view.top:
+            self.layers[layer].append((surface, (int(x + self.offset_x), int(y + self.offset_y))))
+            self.submitted += 1
+        else:
+            self.culled += 1
+
+    def submit_projectiles(self, layer, pool, styles, sprites=projectile_sprites, alpha=1.0):
+        """Envia os projéteis visíveis do pool; `styles` mapeia o tipo do projétil (KINDS) num estilo.
+
+        `alpha` interpola entre o passo anterior e o atual (interpolation_alpha do GameManager).
+        """
+        n = len(pool)
+        if n == 0:
+            return
+        positions = pool.interpolated_positions(alpha)
+        margin = sprites.MARGIN
+        view = self.view
+        x, y = positions[:, 0], positions[:, 1]
+        visible = ((x > view.left - margin) & (x < view.right + margin) &
+                   (y > view.top - margin) & (y < view.bottom + margin))
+        indices = np.flatnonzero(visible)
+        self.culled += n - len(indices)
+        if len(indices) == 0:
+            return
+        keys = pool.kinds[indices].astype(np.int32) * sprites.ANGLE_STEPS + sprites.angle_steps(pool.directions[indices])
+        kind_styles = tuple(styles.get(kind) for kind in ProjectilePool.KINDS)
+        surfaces, offsets = sprites.table(kind_styles, keys)
+        offset = np.array((self.offset_x, self.offset_y))
+        screen_positions = (positions[indices] + offset).astype(np.int32) + offsets[keys]
+        self.layers[layer].extend(zip(map(surfaces.__getitem__, keys.tolist()), screen_positions.tolist()))
+        self.submitted += len(indices)
+
+    def flush(self, screen):
+        """Desenha as camadas na ordem, uma chamada blits por camada."""
+        for name in self.order:
+            batch = self.layers[name]
+            if batch:
+                screen.blits(batch, doreturn=False)
@@ -0,0 +1,199 @@
+# utils/replay.py
+"""Gravação e reprodução determinística de partidas do GameplayState.
+
+Uma partida é reproduzível bit a bit quando:
+- a simulação roda em passos fixos (mesmo dt em todos os passos);
+- toda a aleatoriedade vem das RandomStreams criadas a partir da semente da partida;
+- o tempo vem do relógio virtual do estado (não de pygame.time);
+- a entrada de cada passo é gravada (teclas seguradas + pedido de pulo).
+
+Formato do arquivo (.gxr), tudo little-endian:
+    cabeçalho: b'GXRP', versão (u8), arena do chefe (u8), semente (u32),
+               dt (f64), largura (u16), altura (u16)
+    corpo:     pares (repetições u16, máscara de teclas u16), run-length encoded
+"""
+import hashlib
+import random
+import struct
+import pygame
+
+from utils.headless import KeyState
+
+REPLAY_MAGIC = b'GXRP'
+REPLAY_VERSION = 1
+_HEADER = struct.Struct('<4sBBIdHH')
+_RUN = struct.Struct('<HH')
+SEED_MODULUS = 2 ** 32  # A semente vai no cabeçalho como inteiro de 32 bits sem sinal
+
+# Teclas lidas por GameplayState.update, na ordem dos bits da máscara
+RECORDED_KEYS = (
+    pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d,
+    pygame.K_UP, pygame.K_w, pygame.K_DOWN, pygame.K_s, pygame.K_x,
+)
+JUMP_BIT = 1 << len(RECORDED_KEYS)
+
+
+class RandomStreams:
+    """Geradores aleatórios independentes por assunto, derivados de uma única semente.
+
+    Cada assunto ('layout', 'drops', 'boss'...) tem o seu próprio random.Random,
+    então consumir números em um deles não muda a sequência dos outros.
+    """
+
+    def __init__(self, seed):
+        self.seed = seed
+        self._streams = {}
+
+    def get(self, name):
+        stream = self._streams.get(name)
+        if stream is None:
+            # Semente em texto: o hash usado pelo random é estável entre execuções
+            stream = random.Random(f"{self.seed}:{name}")
+            self._streams[name] = stream
+        return stream
+
+
+def encode_input(keys, jump_requested):
+    """Converte o estado das teclas (+ pulo) deste passo em uma máscara de bits."""
+    mask = JUMP_BIT if jump_requested else 0
+    for bit, key in enumerate(RECORDED_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+def decode_input(mask):
+    """Retorna (KeyState, pedido de pulo) a partir de uma máscara gravada."""
+    pressed = frozenset(key for bit, key in enumerate(RECORDED_KEYS) if mask & (1 << bit))
+    return KeyState(pressed), bool(mask & JUMP_BIT)
+
+
+class InputRecorder:
+    """Acumula a máscara de entrada de cada passo de uma partida."""
+
+    def __init__(self, seed, screen_size, is_boss_fight=False):
+        if not 0 <= seed < SEED_MODULUS:
+            # Falha já aqui, e não só ao salvar a gravação no fim da partida
+            raise ValueError(f"Semente {seed} fora do intervalo [0, 2**32) do formato de replay")
+        self.seed = seed
+        self.dt = None  # Definido no primeiro passo gravado
+        self.screen_size = screen_size
+        self.is_boss_fight = is_boss_fight
+        self.masks = []
+
+    def __len__(self):
+        return len(self.masks)
+
+    def record(self, keys, jump_requested, dt):
+        if self.dt is None:
+            self.dt = dt
+        elif dt != self.dt:
+            raise ValueError("Replays exigem passos de simulação fixos (dt constante)")
+        self.masks.append(encode_input(keys, jump_requested))
+
+    def to_bytes(self):
+        data = bytearray(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, int(self.is_boss_fight),
+                                      self.seed, self.dt or 0.0, self.screen_size[0], self.screen_size[1]))
+        run_mask = None
+        run_length = 0
+        for mask in self.masks:
+            if mask == run_mask and run_length < 0xFFFF:
+                run_length += 1
+                continue
+            if run_length:
+                data += _RUN.pack(run_length, run_mask)
+            run_mask, run_length = mask, 1
+        if run_length:
+            data += _RUN.pack(run_length, run_mask)
+        return bytes(data)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+
+class Replay:
+    """Partida gravada, carregada de um arquivo .gxr."""
+
+    def __init__(self, seed, dt, screen_size, is_boss_fight, masks):
+        self.seed = seed
+        self.dt = dt
+        self.screen_size = screen_size
+        self.is_boss_fight = is_boss_fight
+        self.masks = masks
+
+    def __len__(self):
+        return len(self.masks)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, is_boss_fight, seed, dt, width, height = _HEADER.unpack_from(data, 0)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("Arquivo não é um replay do jogo")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"Versão de replay não suportada: {version}")
+        masks = []
+        for offset in range(_HEADER.size, len(data), _RUN.size):
+            run_length, mask = _RUN.unpack_from(data, offset)
+            masks.extend([mask] * run_length)
+        return cls(seed, dt, (width, height), bool(is_boss_fight), masks)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayInput:
+    """Fonte de entrada que devolve, passo a passo, as teclas gravadas no replay."""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.tick = 0
+        self._keys = KeyState(frozenset())
+
+    def advance(self, state):
+        """Prepara a entrada do próximo passo; retorna False quando o replay acabou."""
+        if self.tick >= len(self.replay.masks):
+            return False
+        self._keys, jump_requested = decode_input(self.replay.masks[self.tick])
+        if jump_requested:
+            state.request_jump()
+        self.tick += 1
+        return True
+
+    def get_pressed(self):
+        return self._keys
+
+
+def simulation_fingerprint(state):
+    """Resumo (hash) do estado da simulação, para comparar duas execuções."""
+    parts = [
+        repr(state.player_pos), repr(state.player_velocity_x), repr(state.player_velocity_y),
+        repr(state.player_hit_points), repr(state.current_ammo), repr(state.camera_x),
+        repr([enemy.pos for enemy in state.enemies]),
+        repr(state.enemy_bullets.positions[:len(state.enemy_bullets)].tolist()),
+        repr(state.bullets.positions[:len(state.bullets)].tolist()),
+        repr([(c.type, c.pos) for c in state.collectibles]),
+    ]
+    if state.boss:
+        parts += [repr(state.boss.pos), repr(state.boss.health), repr(state.boss.current_pattern)]
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def play_replay(replay, game_manager=None):
+    """Reproduz um replay em um GameplayState headless e retorna o estado final.
+
+    Requer init_headless() antes (sem tela, sem conversão de texturas).
+    """
+    from utils.game_manager import GameManager
+    from game_states.gameplay_state import GameplayState
+
+    replay_input = ReplayInput(replay)
+    state = GameplayState(game_manager or GameManager(), *replay.screen_size,
+                          is_boss_fight=replay.is_boss_fight,
+                          input_source=replay_input, seed=replay.seed)
+    state.reset_player()
+    while replay_input.advance(state):
+        state.update(replay.dt)
+    return state
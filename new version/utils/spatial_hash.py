@@ -0,0 +1,82 @@
+# utils/spatial_hash.py
+import pygame
+
+
+class SpatialHashGrid:
+    """Grade uniforme para a fase ampla (broadphase) das colisões.
+
+    Cada objeto é registrado em todas as células que o seu retângulo toca.
+    Uma consulta devolve apenas os objetos das células vizinhas ao retângulo
+    consultado, então o teste exato (colliderect) só roda contra quem está perto
+    em vez de contra todos os objetos do nível.
+
+    Os objetos podem ser qualquer coisa (inimigos, dicts de plataforma...), já
+    que são indexados por id(); o retângulo é guardado junto do objeto.
+    """
+
+    def __init__(self, cell_size=256):
+        self.cell_size = cell_size
+        self.cells = {}
+        self._entries = {}  # id(objeto) -> (objeto, rect, células)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _cells_for(self, rect):
+        size = self.cell_size
+        x0 = int(rect.left // size)
+        x1 = int((rect.right - 1) // size)
+        y0 = int(rect.top // size)
+        y1 = int((rect.bottom - 1) // size)
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def clear(self):
+        self.cells.clear()
+        self._entries.clear()
+
+    def insert(self, item, rect):
+        """Registra o objeto com o retângulo dado (em coordenadas do mundo)."""
+        key = id(item)
+        if key in self._entries:
+            self.remove(item)
+        rect = pygame.Rect(rect)
+        cells = self._cells_for(rect)
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(key)
+        self._entries[key] = (item, rect, cells)
+
+    def remove(self, item):
+        entry = self._entries.pop(id(item), None)
+        if entry is None:
+            return
+        key = id(item)
+        for cell in entry[2]:
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                continue
+            bucket.remove(key)
+            if not bucket:
+                del self.cells[cell]
+
+    def update(self, item, rect):
+        """Atualiza o retângulo de um objeto que se moveu."""
+        self.insert(item, rect)
+
+    def query(self, rect):
+        """Retorna os objetos cujas células tocam o retângulo (candidatos, sem repetição)."""
+        found = []
+        seen = set()
+        entries = self._entries
+        for cell in self._cells_for(rect):
+            bucket = self.cells.get(cell)
+            if not bucket:
+                continue
+            for key in bucket:
+                if key not in seen:
+                    seen.add(key)
+                    found.append(entries[key][0])
+        return found
+
+    def query_colliding(self, rect):
+        """Retorna apenas os objetos cujo retângulo colide de fato com o retângulo dado."""
+        return [item for item in self.query(rect) if self._entries[id(item)][1].colliderect(rect)]
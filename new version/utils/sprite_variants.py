@@ -0,0 +1,50 @@
+# utils/sprite_variants.py
+import pygame
+
+from utils.asset_cache import asset_cache
+
+
+class SpriteVariantStore:
+    """Guarda as versões viradas para a esquerda e para a direita de cada textura.
+
+    As texturas do jogo são desenhadas viradas para a direita. Em vez de chamar
+    pygame.transform.flip a cada frame (uma Surface nova por objeto desenhado),
+    a versão espelhada é criada uma única vez e compartilhada.
+
+    get() retorna a tupla (esquerda, direita), então o desenho escolhe a
+    variante com `variants[self.facing_right]`.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.variants = {}
+
+    def get(self, path, size=None, alpha=True):
+        """Retorna (esquerda, direita) da imagem; lança o mesmo erro que asset_cache.get_image."""
+        key = (path, size if size is None else (size[0], size[1]), alpha)
+        variants = self.variants.get(key)
+        if variants is None:
+            right = self.cache.get_image(path, size, alpha)
+            variants = (pygame.transform.flip(right, True, False), right)
+            self.variants[key] = variants
+        return variants
+
+    def preload(self, specs):
+        """Cria antecipadamente as variantes de uma lista de (caminho, tamanho, alpha)."""
+        for path, size, alpha in specs:
+            try:
+                self.get(path, size, alpha)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"AVISO: Não foi possível pré-carregar '{path}': {e}")
+
+    def discard(self, specs):
+        """Esquece as variantes de (caminho, tamanho, alpha) que não são mais usadas."""
+        for path, size, alpha in specs:
+            self.variants.pop((path, size if size is None else (size[0], size[1]), alpha), None)
+
+    def clear(self):
+        self.variants.clear()
+
+
+# Instância compartilhada, construída sobre o cache de assets
+sprite_variants = SpriteVariantStore(asset_cache)
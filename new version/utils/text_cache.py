@@ -0,0 +1,71 @@
+# utils/text_cache.py
+from collections import OrderedDict
+import pygame
+
+
+class TextCache:
+    """Registro de fontes e cache LRU de textos já renderizados.
+
+    Cada fonte (arquivo + tamanho) é criada uma única vez e compartilhada. Os
+    textos renderizados ficam guardados por (texto, fonte, cor, antialias), então
+    um HUD que mostra o mesmo valor por vários frames não renderiza de novo. Os
+    mais antigos são descartados quando o cache passa de `max_entries`.
+
+    As Surfaces retornadas são compartilhadas: não as modifique.
+    """
+
+    def __init__(self, max_entries=256):
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, size, path=None):
+        """Retorna a fonte do arquivo `path` (None = fonte padrão do pygame) no tamanho pedido.
+
+        Se o arquivo não puder ser carregado (ou não renderizar), avisa uma vez e
+        usa a fonte padrão.
+        """
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            try:
+                font = pygame.font.Font(path, size)
+                font.render(" ", True, (0, 0, 0)) # Arquivos corrompidos só falham ao renderizar
+            except (pygame.error, FileNotFoundError, OSError) as e:
+                if path is None:
+                    raise # A própria fonte padrão falhou: não há outra para usar
+                print(f"AVISO: Fonte '{path}' não encontrada ou inválida. Usando fonte padrão. Erro: {e}")
+                font = self.get_font(size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, path=None, antialias=True):
+        """Retorna a Surface do texto, renderizando-a apenas na primeira vez."""
+        key = (text, path, size, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(size, path).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def invalidate(self):
+        """Descarta os textos renderizados (ex: ao trocar o idioma); as fontes continuam."""
+        self.surfaces.clear()
+
+    def stats(self):
+        """Retorna os contadores do cache (acertos, faltas, textos e fontes)."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'entries': len(self.surfaces), 'fonts': len(self.fonts)}
+
+
+# Instância compartilhada por todos os estados do jogo
+text_cache = TextCache()
@@ -0,0 +1,51 @@
+# utils/tint_cache.py
+import weakref
+import numpy as np
+import pygame
+
+
+class TintCache:
+    """Versões tingidas das texturas (ex: o flash vermelho de dano), criadas uma única vez.
+
+    get(surface, (r, g, b, a)) mistura a cor nos pixels da textura com
+    intensidade a/255, mantendo o canal alpha original: só a silhueta do
+    sprite é tingida, não o retângulo inteiro. O efeito custa um blit da
+    variante no lugar do sprite, sem criar Surfaces por frame.
+
+    As variantes ficam presas à textura original (WeakKeyDictionary): quando a
+    textura sai do cache de assets e é liberada, as variantes vão junto.
+    """
+
+    def __init__(self):
+        self.variants = weakref.WeakKeyDictionary()  # Surface -> {cor: Surface tingida}
+
+    def get(self, surface, color):
+        tints = self.variants.get(surface)
+        if tints is None:
+            tints = {}
+            self.variants[surface] = tints
+        tinted = tints.get(color)
+        if tinted is None:
+            tinted = self._tint(surface, color)
+            tints[color] = tinted
+        return tinted
+
+    def preload(self, surfaces, color):
+        """Cria antecipadamente a variante `color` de cada textura (evita o custo no primeiro acerto)."""
+        for surface in surfaces:
+            self.get(surface, color)
+
+    def _tint(self, surface, color):
+        strength = color[3] / 255 if len(color) > 3 else 1.0
+        tinted = surface.copy()
+        rgb = pygame.surfarray.pixels3d(tinted)
+        rgb[:] = (rgb * (1.0 - strength) + np.array(color[:3]) * strength).astype(np.uint8)
+        del rgb  # Libera o lock dos pixels
+        return tinted
+
+    def clear(self):
+        self.variants.clear()
+
+
+# Instância compartilhada por todos os estados do jogo
+tint_cache = TintCache()
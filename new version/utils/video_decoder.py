@@ -0,0 +1,163 @@
+# utils/video_decoder.py
+import queue
+import threading
+import time
+import numpy as np
+import pygame
+
+
+class VideoDecoder:
+    """Decodifica um vídeo numa thread, à frente da reprodução.
+
+    A thread lê os frames do leitor do imageio (iter_data), converte cada um em
+    uma Surface já no tamanho da tela e os coloca numa fila limitada a
+    `queue_size` frames. A reprodução pede o frame do instante atual com
+    frame_for_time(): frames atrasados são descartados em vez de desacelerar o
+    vídeo, e se o próximo frame ainda não chegou o anterior continua na tela.
+    Quando a própria decodificação atrasa, a thread nem converte os frames que
+    já passaram da hora, mas entrega pelo menos um por intervalo de frame para
+    a tela não congelar.
+
+    Com `zero_copy` (e frames que já chegam no tamanho da tela, ex: escalados
+    pelo próprio ffmpeg), a thread entrega os arrays RGB e só o frame que vai
+    aparecer é copiado, com surfarray.blit_array, para uma única Surface
+    criada no início: a reprodução não aloca Surfaces por frame. Frames de
+    outro tamanho caem no caminho normal (Surface nova + scale).
+
+    stats() inclui a latência entre o fim da decodificação e a apresentação.
+    """
+
+    _END = object()  # Marca o fim do vídeo na fila
+    LATENCY_HISTORY = 120  # Amostras de latência guardadas para as estatísticas
+
+    def __init__(self, reader, size, fps, queue_size=8, zero_copy=False):
+        self.reader = reader
+        self.size = size
+        self.fps = fps
+        self.zero_copy = zero_copy
+        # Destino único dos frames no modo zero_copy (mesmo formato da tela, se houver uma)
+        self.target_surface = None
+        if zero_copy:
+            self.target_surface = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                self.target_surface = self.target_surface.convert()
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.finished = False  # O último frame já foi apresentado
+        self.error = None
+
+        self.target_index = 0  # Frame que o relógio de apresentação pede agora (lido pela thread)
+        self.current_index = -1  # Índice do frame apresentado
+        self.current_surface = None
+        self._next = None  # Frame tirado da fila, mas ainda adiantado
+        self.decoded_count = 0
+        self.presented_count = 0
+        self.dropped_count = 0
+        self.latencies = np.zeros(self.LATENCY_HISTORY)  # ms, buffer circular
+        self.latency_cursor = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self._decode_loop, name='video-decoder', daemon=True)
+        self.thread.start()
+
+    def _decode_loop(self):
+        frame_interval = 1.0 / self.fps
+        last_put = time.perf_counter()
+        try:
+            for index, frame in enumerate(self.reader.iter_data()):
+                if self.stop_event.is_set():
+                    return
+                if index < self.target_index and time.perf_counter() - last_put < frame_interval:
+                    self.dropped_count += 1  # Já atrasado: não vale converter
+                    continue
+                if not self._put((index, self._prepare(frame), time.perf_counter())):
+                    return
+                last_put = time.perf_counter()
+                self.decoded_count += 1
+        except Exception as e:
+            self.error = e
+            print(f"Aviso: erro ao decodificar o vídeo: {e}")
+        self._put(self._END)
+
+    def _put(self, item):
+        """Espera espaço na fila; retorna False se a reprodução foi interrompida."""
+        while not self.stop_event.is_set():
+            try:
+                self.frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _prepare(self, frame):
+        """Converte o frame do leitor no que vai para a fila (array no modo zero_copy, senão Surface)."""
+        arr = np.asarray(frame)
+        if arr.dtype != np.uint8:
+            arr = arr.astype(np.uint8)
+        if self.zero_copy and arr.shape[1::-1] == self.size:
+            return arr
+        surf = pygame.surfarray.make_surface(arr.swapaxes(0, 1))
+        if surf.get_size() != self.size:
+            surf = pygame.transform.scale(surf, self.size)
+        return surf
+
+    def frame_for_time(self, elapsed_ms):
+        """Retorna a Surface que deve estar na tela `elapsed_ms` após o início do vídeo."""
+        target = int(elapsed_ms * self.fps / 1000.0)
+        self.target_index = target
+        taken = 0  # Frames tirados da fila nesta chamada; só o último chega à tela
+        payload = decoded_at = None
+        while not self.finished:
+            if self._next is None:
+                try:
+                    self._next = self.frames.get_nowait()
+                except queue.Empty:
+                    break  # O decodificador está atrasado: mantém o frame atual
+            if self._next is self._END:
+                if target > self.current_index:
+                    self.finished = True
+                break
+            index, next_payload, next_decoded_at = self._next
+            if index > target:
+                break  # Ainda é cedo para este frame
+            taken += 1
+            self.current_index = index
+            payload, decoded_at = next_payload, next_decoded_at
+            self._next = None
+        if taken:
+            if isinstance(payload, np.ndarray):
+                # swapaxes é só uma vista: a cópia é feita direto nos pixels da Surface
+                pygame.surfarray.blit_array(self.target_surface, payload.swapaxes(0, 1))
+                self.current_surface = self.target_surface
+            else:
+                self.current_surface = payload
+            self.presented_count += 1
+            self.dropped_count += taken - 1
+            self.latencies[self.latency_cursor] = (time.perf_counter() - decoded_at) * 1000
+            self.latency_cursor = (self.latency_cursor + 1) % self.LATENCY_HISTORY
+        return self.current_surface
+
+    def latency_ms(self):
+        """Retorna (média, p95, máximo) da latência decodificação -> apresentação, em ms."""
+        samples = self.latencies[:min(self.presented_count, self.LATENCY_HISTORY)]
+        if len(samples) == 0:
+            return 0.0, 0.0, 0.0
+        return float(samples.mean()), float(np.percentile(samples, 95)), float(samples.max())
+
+    def stop(self):
+        """Interrompe a thread e fecha o leitor."""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        try:
+            self.reader.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        mean, p95, worst = self.latency_ms()
+        return {'decoded': self.decoded_count, 'presented': self.presented_count,
+                'dropped': self.dropped_count, 'queued': self.frames.qsize(),
+                'latency_ms': round(mean, 2), 'latency_p95_ms': round(p95, 2), 'latency_max_ms': round(worst, 2)}